@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the streaming Markdown to HTML renderer.
+Renders a large multi-student report both to a string and streamed from a
+Markdown file into an HTML file, reporting throughput and peak memory.
+"""
+
+import sys
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from dotenv import load_dotenv
+
+# Importing rag reads RAG_CORPUS from .env
+load_dotenv()
+
+# Make the project packages importable when run from benchmarks/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from rag.shared_libraries.markdown_html import render_markdown_html, write_markdown_html
+
+SUBJECTS = ["Literacy", "Math", "Science", "Social Studies"]
+
+
+def student_report(number):
+    """One student's section, shaped like the formatter's comprehensive report."""
+    lines = [
+        f"# Educational Analysis Report: Student {number:05d}",
+        f"**Generated:** 2025-03-21  **Grade:** 01  **School:** Clovercroft Elementary",
+        "",
+        "## Identified Weaknesses",
+    ]
+    for subject in SUBJECTS:
+        lines += [
+            f"### {subject}",
+            f"Mean latest rating **2.{number % 10}** with *3 declining* standards and `2` stuck low.",
+            "Ratings have dropped since Q1, mostly in foundational skills.",
+            "",
+            f"- Read words with double-letter spellings (Q1: 3, Q2: 2, Q3: 2)",
+            f"- Add and subtract within 20, demonstrating fluency",
+            f"  - Practice fact families with **10 minutes** a day",
+            f"- Retell stories and understand their central message",
+            "",
+        ]
+    lines += ["## Personalized Study Plan"]
+    for week in range(1, 5):
+        lines += [f"1. Week {week}: Khan Academy Math Videos, Starfall Reading Games"]
+    lines += ["", "> Short, frequent sessions work better than long ones for K-2 students.", "---", ""]
+    return "\n".join(lines) + "\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the streaming Markdown to HTML renderer"
+    )
+    parser.add_argument(
+        "--students",
+        type=int,
+        default=5000,
+        help="Students in the synthetic report"
+    )
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("📝 Markdown to HTML Renderer Benchmark")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        markdown_path = os.path.join(temp_dir, "report.md")
+        html_path = os.path.join(temp_dir, "report.html")
+        with open(markdown_path, "w", encoding="utf-8") as file:
+            for number in range(args.students):
+                file.write(student_report(number))
+        size_mb = os.path.getsize(markdown_path) / 1e6
+        print(f"   Report: {args.students} students, {size_mb:.1f} MB of Markdown\n")
+
+        def to_string():
+            with open(markdown_path, encoding="utf-8") as file:
+                return len(render_markdown_html(file.read()))
+
+        def streamed():
+            with open(markdown_path, encoding="utf-8") as source, open(html_path, "w", encoding="utf-8") as output:
+                return write_markdown_html(source, output)
+
+        for label, run in (("🧵 To string:", to_string), ("🌊 Streamed: ", streamed)):
+            started = time.perf_counter()
+            written = run()
+            elapsed = time.perf_counter() - started
+            # Memory is traced in a separate pass; tracing slows rendering down
+            tracemalloc.start()
+            run()
+            peak = tracemalloc.get_traced_memory()[1] / 1e6
+            tracemalloc.stop()
+            print(f"   {label} {elapsed:.2f}s  {size_mb / elapsed:6.1f} MB/s  peak {peak:8.2f} MB")
+        print(f"   📄 HTML: {written / 1e6:.1f} MB")
+
+    print("=" * 60)
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
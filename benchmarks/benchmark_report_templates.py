@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Benchmark for compiled report templates.
+Compares the compiled HTML shell with the f-string it replaced, then times
+full report rendering in every registered output format.
+"""
+
+import sys
+import argparse
+import html
+import io
+import time
+from datetime import datetime
+from pathlib import Path
+from dotenv import load_dotenv
+
+# Importing rag reads RAG_CORPUS from .env
+load_dotenv()
+
+# Make the project packages importable when run from benchmarks/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from rag.shared_libraries.analysis_store import put_analysis
+from rag.shared_libraries.report_templates import (
+    FORMATS,
+    HTML_HEAD,
+    ReportContext,
+    compile_template,
+    write_report,
+)
+
+
+def fstring_head(report_title):
+    """The HTML shell as export_to_pdf used to build it, with an f-string per call."""
+    title = html.escape(report_title)
+    return f"""
+        <!DOCTYPE html>
+        <html>
+        <head>
+            <meta charset="UTF-8">
+            <title>{title}</title>
+            <style>
+                body {{ font-family: Arial, sans-serif; margin: 40px; line-height: 1.6; }}
+                h1 {{ color: #2c3e50; border-bottom: 2px solid #3498db; padding-bottom: 10px; }}
+                h2 {{ color: #34495e; margin-top: 30px; }}
+                h3 {{ color: #7f8c8d; }}
+                strong {{ color: #2c3e50; }}
+                ul, ol {{ margin-left: 20px; }}
+                .header {{ text-align: center; margin-bottom: 30px; }}
+                .footer {{ text-align: center; margin-top: 30px; font-size: 0.9em; color: #7f8c8d; }}
+            </style>
+        </head>
+        <body>
+            <div class="header">
+                <h1>{title}</h1>
+                <p><strong>Generated:</strong> {datetime.now().strftime('%B %d, %Y at %I:%M %p')}</p>
+            </div>
+            <div class="content">
+        """
+
+
+def compiled_head(report_title):
+    """The same shell from the compiled template."""
+    return compile_template(HTML_HEAD, "html").render(
+        title=report_title,
+        exported_at=datetime.now().strftime("%B %d, %Y at %I:%M %p"),
+    )
+
+
+def make_state(weeks):
+    """Session state with every analysis a full report carries."""
+    state = {
+        "student_profile": {"name": "Jordan Lee", "grade": "01", "school": "Clovercroft Elementary"},
+        "analysis_timestamp": "2025-03-21 10:00:00",
+    }
+    weaknesses = "\n".join(
+        f"- **Standard {number}**: declining from 3 to {1 + number % 2} (*needs support*)"
+        for number in range(40)
+    )
+    plan = "\n".join(f"{week}. Week {week}: Khan Academy Math Videos, `20 min` reading practice" for week in range(1, weeks + 1))
+    research = "\n\n".join(f"Strategy {number}: short, frequent sessions with feedback." for number in range(60))
+    put_analysis(state, "weakness_analysis", content=weaknesses)
+    put_analysis(state, "solution_research", content=research)
+    put_analysis(state, "study_plan", content=plan)
+    put_analysis(state, "data_retrieval", data={"standards": [f"S{n}" for n in range(50)], "quarters": 4})
+    return state
+
+
+def time_calls(function, argument, iterations):
+    started = time.perf_counter()
+    for _ in range(iterations):
+        function(argument)
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark compiled report templates"
+    )
+    parser.add_argument(
+        "--iterations",
+        type=int,
+        default=20000,
+        help="Renders of the HTML shell per approach"
+    )
+    parser.add_argument(
+        "--reports",
+        type=int,
+        default=500,
+        help="Full reports rendered per output format"
+    )
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("🧩 Report Template Benchmark")
+    print("=" * 60)
+
+    title = "Educational Analysis Report: Jordan & Co."
+    assert fstring_head(title) == compiled_head(title)
+    fstring_us = time_calls(fstring_head, title, args.iterations)
+    compiled_us = time_calls(compiled_head, title, args.iterations)
+    print(f"   HTML shell ({args.iterations} renders)")
+    print(f"   🧵 f-string:  {fstring_us:8.2f} µs per render")
+    print(f"   ⚙️  compiled:  {compiled_us:8.2f} µs per render ({fstring_us / compiled_us:.2f}x)\n")
+
+    context = ReportContext.from_state(make_state(weeks=12), title)
+    print(f"   Full report ({args.reports} renders per format)")
+    for name in sorted(FORMATS):
+        output = io.StringIO()
+        started = time.perf_counter()
+        for _ in range(args.reports):
+            output.seek(0)
+            output.truncate()
+            written = write_report(context, name, output)
+        elapsed = (time.perf_counter() - started) / args.reports
+        print(f"   📄 {name:<9} {elapsed * 1000:7.3f} ms per report  {written / 1024:7.1f} KB")
+
+    print("=" * 60)
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
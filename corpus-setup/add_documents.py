@@ -13,9 +13,14 @@ from dotenv import load_dotenv
 from vertexai import rag
 import vertexai
 
+# Make the project packages importable when run from corpus-setup/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
 # Load environment variables
 load_dotenv()
 
+from corpus_manager.utils.corpus_resolver import get_corpus_resolver
+
 # Initialize Vertex AI
 PROJECT_ID = os.environ.get("GOOGLE_CLOUD_PROJECT")
 LOCATION = os.environ.get("GOOGLE_CLOUD_LOCATION")
@@ -29,13 +34,9 @@ vertexai.init(project=PROJECT_ID, location=LOCATION)
 SUPPORTED_EXTENSIONS = {'.pdf', '.docx', '.txt', '.doc'}
 
 def get_corpus_resource_name():
-    """Get the full resource name of the corpus."""
+    """Get the full resource name of the corpus (cached across runs)."""
     try:
-        corpora = rag.list_corpora()
-        for corpus in corpora:
-            if corpus.display_name == RAG_CORPUS_NAME:
-                return corpus.name
-        return None
+        return get_corpus_resolver().resolve(RAG_CORPUS_NAME)
     except Exception as e:
         print(f"   ❌ Error finding corpus: {str(e)}")
         return None
@@ -81,6 +82,95 @@ def add_local_files(file_paths):
     
     return gcs_paths
 
+def filter_valid_documents(file_paths, workers=None):
+    """
+    Validate documents in parallel and keep only those that look like report cards.
+    
+    Only PDF and text files can be validated; other uploadable types (Word
+    documents) are kept without validation.
+    """
+    # Imported lazily: only needed with --validate
+    from rag.shared_libraries.batch_validation import SUPPORTED_EXTENSIONS, validate_documents
+    
+    to_validate, unvalidated = [], []
+    for path in file_paths:
+        (to_validate if Path(path).suffix.lower() in SUPPORTED_EXTENSIONS else unvalidated).append(path)
+    for path in unvalidated:
+        print(f"   ℹ️  Not validated ({Path(path).suffix.lower()} files cannot be checked), uploading as is: {path}")
+    
+    print(f"\n🔍 Validating {len(to_validate)} documents before upload...")
+    valid_paths = []
+    for result in validate_documents(to_validate, max_workers=workers):
+        if result["is_valid"]:
+            valid_paths.append(result["path"])
+        else:
+            print(f"   ⚠️  Skipping invalid document: {result['path']} ({'; '.join(result['issues'])})")
+    
+    print(f"   ✅ {len(valid_paths)} of {len(to_validate)} documents passed validation")
+    return sorted(valid_paths + unvalidated)
+
+def index_documents(paths):
+    """Parse report cards into the local student records index for structured lookups."""
+    # Imported lazily: only needed with --index
+    from rag.shared_libraries.records_index import ingest_documents, DEFAULT_INDEX_PATH
+    from rag.shared_libraries.cohort_store import refresh_cohort_store, DEFAULT_COHORT_PATH
+    
+    print(f"\n🗂️  Indexing {len(paths)} documents into {DEFAULT_INDEX_PATH}...")
+    indexed = 0
+    for result in ingest_documents(paths):
+        if result.get("error"):
+            print(f"   ⚠️  Could not index {result['path']}: {result['error']}")
+        elif result["skipped"]:
+            print(f"   ⏭️  Unchanged: {result['path']}")
+        else:
+            indexed += 1
+            print(f"   ✅ Indexed {result['student']} ({result['rows']} ratings) from {result['path']}")
+    
+    print(f"   ✅ {indexed} documents indexed")
+    
+    # Keep the cohort analytics store in step with the index
+    if indexed:
+        rows = refresh_cohort_store()
+        print(f"   ✅ Cohort store rebuilt with {rows} ratings at {DEFAULT_COHORT_PATH}")
+    return indexed
+
+def add_row_chunks(file_paths, max_chars=1400):
+    """Upload row-aligned chunk files instead of the raw PDFs.
+    
+    Each standard and its Q1-Q4 ratings stay on one line, and each file holds
+    whole rows under the student header, so the corpus chunker never splits a
+    standard from its ratings.
+    """
+    # Imported lazily: only needed with --row-chunks
+    import tempfile
+    from rag.shared_libraries.grid_extractor import parse_report_card_grid, row_chunks
+    
+    print(f"\n🧾 Building row-aligned chunks for {len(file_paths)} documents...")
+    gcs_paths = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for file_path in file_paths:
+            file_path = Path(file_path)
+            try:
+                card = parse_report_card_grid(str(file_path))
+            except Exception as e:
+                print(f"   ⚠️  Could not parse {file_path}: {str(e)}")
+                continue
+            if not len(card.standards):
+                print(f"   ⚠️  No standards grid found in {file_path}")
+                continue
+            
+            chunks = row_chunks(card, max_chars=max_chars)
+            for number, chunk in enumerate(chunks, start=1):
+                chunk_name = f"{file_path.stem}-rows-{number:02d}.txt"
+                chunk_path = Path(temp_dir) / chunk_name
+                chunk_path.write_text(chunk, encoding="utf-8")
+                gcs_url = upload_to_gcs(str(chunk_path), f"processing/rows/{file_path.stem}/{chunk_name}")
+                if gcs_url:
+                    gcs_paths.append(gcs_url)
+            print(f"   ✅ {file_path.name}: {len(card.standards)} standards in {len(chunks)} chunks")
+    
+    return gcs_paths
+
 def add_gcs_paths(paths):
     """Process GCS paths for adding to corpus."""
     print(f"\n☁️  Processing {len(paths)} GCS paths...")
@@ -157,6 +247,27 @@ def main():
         "--pattern",
         help="Glob pattern for local files (e.g., '*.pdf')"
     )
+    parser.add_argument(
+        "--validate",
+        action="store_true",
+        help="Validate documents first and skip those that are not report cards"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes used for --validate (default: CPU count)"
+    )
+    parser.add_argument(
+        "--row-chunks",
+        action="store_true",
+        help="Upload one row per standard in whole-row chunk files instead of the raw PDFs (local only)"
+    )
+    parser.add_argument(
+        "--index",
+        action="store_true",
+        help="Also parse the documents into the local student records index"
+    )
     
     args = parser.parse_args()
     
@@ -172,10 +283,22 @@ def main():
             expanded_paths.extend(glob.glob(pattern_path))
         args.paths = expanded_paths
     
+    # Reject invalid documents before they consume embedding quota
+    if args.validate:
+        args.paths = filter_valid_documents(args.paths, args.workers)
+        if not args.paths:
+            print(f"\n❌ No valid documents to add")
+            return 1
+    
     # Process paths based on source type
     if args.source == "local":
-        gcs_paths = add_local_files(args.paths)
+        if args.row_chunks:
+            gcs_paths = add_row_chunks(args.paths)
+        else:
+            gcs_paths = add_local_files(args.paths)
         if gcs_paths and add_to_corpus(gcs_paths):
+            if args.index:
+                index_documents(args.paths)
             print(f"\n🎉 Successfully processed {len(gcs_paths)} local files!")
         else:
             print(f"\n❌ Failed to process local files")
@@ -184,6 +307,8 @@ def main():
     elif args.source == "gcs":
         gcs_paths = add_gcs_paths(args.paths)
         if gcs_paths and add_to_corpus(gcs_paths):
+            if args.index:
+                index_documents(gcs_paths)
             print(f"\n🎉 Successfully processed {len(gcs_paths)} GCS files!")
         else:
             print(f"\n❌ Failed to process GCS files")
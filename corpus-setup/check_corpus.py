@@ -4,13 +4,20 @@ Script to check for existing RAG corpora and create the student report card corp
 """
 
 import os
+import sys
 from dotenv import load_dotenv
+from pathlib import Path
 from vertexai import rag
 import vertexai
 
+# Make the project packages importable when run from corpus-setup/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
 # Load environment variables
 load_dotenv()
 
+from corpus_manager.utils.corpus_resolver import get_corpus_resolver
+
 # Initialize Vertex AI
 PROJECT_ID = os.environ.get("GOOGLE_CLOUD_PROJECT")
 LOCATION = os.environ.get("GOOGLE_CLOUD_LOCATION")
@@ -71,6 +78,7 @@ def create_student_corpus():
         print(f"   Resource Name: {rag_corpus.name}")
         print(f"   Embedding Model: text-embedding-005")
         
+        get_corpus_resolver().remember(RAG_CORPUS_NAME, rag_corpus.name)
         return True
         
     except Exception as e:
@@ -82,17 +90,19 @@ def main():
     print("🎓 Student Report Card RAG System - Corpus Setup")
     print("="*60)
     
-    # List existing corpora
-    existing_corpora = list_existing_corpora()
-    
-    # Check if our target corpus already exists
-    corpus_exists = any(
-        corpus['display_name'] == RAG_CORPUS_NAME 
-        for corpus in existing_corpora
-    )
+    # A cached resource name is checked with rag.get_corpus; a name cached as
+    # missing is checked against a fresh listing before creating anything
+    resolver = get_corpus_resolver()
+    resource_name = resolver.resolve(RAG_CORPUS_NAME)
+    if not resource_name:
+        existing = list_existing_corpora()
+        resource_name = next((corpus['name'] for corpus in existing if corpus['display_name'] == RAG_CORPUS_NAME), None)
+        if resource_name:
+            resolver.remember(RAG_CORPUS_NAME, resource_name)
     
-    if corpus_exists:
+    if resource_name:
         print(f"\n✅ Corpus '{RAG_CORPUS_NAME}' already exists!")
+        print(f"   Resource Name: {resource_name}")
         print("   Your RAG corpus is ready for use.")
     else:
         print(f"\n📝 Corpus '{RAG_CORPUS_NAME}' not found. Creating it now...")
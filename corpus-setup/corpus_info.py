@@ -5,14 +5,21 @@ Shows corpus statistics, document listings, and configuration details.
 """
 
 import os
+import sys
 import argparse
 from dotenv import load_dotenv
+from pathlib import Path
 from vertexai import rag
 import vertexai
 
+# Make the project packages importable when run from corpus-setup/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
 # Load environment variables
 load_dotenv()
 
+from corpus_manager.utils.corpus_resolver import get_corpus_resolver
+
 # Initialize Vertex AI
 PROJECT_ID = os.environ.get("GOOGLE_CLOUD_PROJECT")
 LOCATION = os.environ.get("GOOGLE_CLOUD_LOCATION")
@@ -199,25 +206,20 @@ def main():
     target_corpus_name = args.corpus or RAG_CORPUS_NAME
     
     try:
-        corpora = rag.list_corpora()
-        target_corpus = None
+        resource_name = get_corpus_resolver().resolve(target_corpus_name)
         
-        for corpus in corpora:
-            if corpus.display_name == target_corpus_name:
-                target_corpus = {
-                    'display_name': corpus.display_name,
-                    'name': corpus.name,
-                    'corpus': corpus
-                }
-                break
-        
-        if not target_corpus:
+        if not resource_name:
             print(f"\n❌ Corpus '{target_corpus_name}' not found!")
             print("   Available corpora:")
-            for corpus in corpora:
+            for corpus in rag.list_corpora():
                 print(f"     - {corpus.display_name}")
             return 1
         
+        target_corpus = {
+            'display_name': target_corpus_name,
+            'name': resource_name
+        }
+        
         print(f"\n🎯 Inspecting corpus: {target_corpus['display_name']}")
         
         # Get file details
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Script to export every student's report for a class as one ZIP download.
+Reports are rendered in parallel and streamed into the archive as they finish,
+so memory stays flat for any class size. An interrupted export resumes from
+its checkpoint, and progress is written next to the archive.
+"""
+
+import sys
+import argparse
+from pathlib import Path
+from dotenv import load_dotenv
+
+# Make the project packages importable when run from corpus-setup/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Load environment variables
+load_dotenv()
+
+from rag.shared_libraries.batch_planner import BatchPlanJob
+from rag.shared_libraries.class_export import ClassReportExport, read_progress
+from rag.shared_libraries.records_index import get_records_index
+from rag.shared_libraries.report_templates import FORMATS
+from rag.shared_libraries.resource_catalog import normalize_grade
+
+
+def select_students(args):
+    """Students named on the command line, or every indexed student matching the filters."""
+    if args.students:
+        return args.students
+
+    selected = []
+    for row in get_records_index().students():
+        if args.grade and normalize_grade(row["grade"]) != normalize_grade(args.grade):
+            continue
+        if args.teacher and args.teacher.lower() not in (row["teacher"] or "").lower():
+            continue
+        if args.school and args.school.lower() not in (row["school"] or "").lower():
+            continue
+        selected.append(row["student"])
+    return selected
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Export every student's report for a class into one ZIP archive"
+    )
+    parser.add_argument(
+        "--students",
+        nargs="+",
+        help="Student names to export (default: all indexed students matching the filters)"
+    )
+    parser.add_argument("--grade", help="Only students in this grade (e.g., 1 or 01)")
+    parser.add_argument("--teacher", help="Only students of this homeroom teacher")
+    parser.add_argument("--school", help="Only students at this school")
+    parser.add_argument(
+        "--output",
+        default="class_reports.zip",
+        help="ZIP archive to write, or - to stream it to stdout"
+    )
+    parser.add_argument(
+        "--format",
+        choices=sorted(FORMATS),
+        default="html",
+        help="Report format inside the archive"
+    )
+    parser.add_argument(
+        "--weeks",
+        type=int,
+        default=4,
+        help="Weeks per study plan"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Reports rendered concurrently"
+    )
+    parser.add_argument(
+        "--restart",
+        action="store_true",
+        help="Ignore the checkpoint and export every student again"
+    )
+    parser.add_argument(
+        "--status",
+        action="store_true",
+        help="Show the progress of an export to --output and exit"
+    )
+
+    args = parser.parse_args()
+
+    # Keep stdout clean for the archive when streaming
+    log = sys.stderr if args.output == "-" else sys.stdout
+
+    if args.status:
+        progress = read_progress(args.output)
+        if progress is None:
+            print(f"❌ No export found for {args.output}", file=log)
+            return 1
+        print(f"📦 {args.output}: {progress['state']}, {progress['percent']}% "
+              f"({progress['completed'] + progress['resumed']} of {progress['requested']} reports)", file=log)
+        return 0
+
+    print("="*60, file=log)
+    print("📚 Student Report Card RAG - Class Report Export", file=log)
+    print("="*60, file=log)
+
+    students = select_students(args)
+    if not students:
+        print("\n❌ No students to export. Index report cards with: python corpus-setup/add_documents.py --index ...", file=log)
+        return 1
+
+    exporter = ClassReportExport(
+        args.format,
+        max_workers=args.workers,
+        planner=BatchPlanJob(output_dir=".", weeks=args.weeks),
+    )
+
+    def report(entry):
+        if entry["status"] == "done":
+            print(f"   ✅ {entry['student']} → {entry['file']} ({entry['seconds'] * 1000:.0f} ms)", file=log)
+        elif entry["status"] == "not_found":
+            print(f"   ⚠️  No indexed ratings for {entry['student']}", file=log)
+        else:
+            print(f"   ❌ {entry['student']}: {entry['error']}", file=log)
+
+    print(f"\n📦 Exporting {len(students)} {args.format} reports with {args.workers} workers to {args.output}", file=log)
+    if args.output == "-":
+        counts = exporter.stream(sys.stdout.buffer, students, progress=report).to_dict()
+    else:
+        counts = exporter.export(args.output, students, resume=not args.restart, progress=report)
+
+    print(f"\n📊 Completed {counts['completed']}, resumed {counts['resumed']}, "
+          f"failed {counts['failed']}, not found {counts['not_found']}", file=log)
+    print(f"   ⏱️  {counts['seconds']:.2f}s ({counts['reports_per_second']} reports/s, "
+          f"{counts['bytes_written'] / 1024:.1f} KB compressed)", file=log)
+    print("="*60, file=log)
+
+    return 0 if not counts["failed"] else 1
+
+
+if __name__ == "__main__":
+    exit(main())
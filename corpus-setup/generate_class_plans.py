@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Script to generate study plans for a whole class at quarter end.
+Runs the analysis and planning pipeline for every student in the local student
+records index (or a given list), with bounded concurrency, shared lookups and a
+checkpoint file so an interrupted run resumes where it stopped.
+"""
+
+import sys
+import argparse
+from pathlib import Path
+from dotenv import load_dotenv
+
+# Make the project packages importable when run from corpus-setup/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Load environment variables
+load_dotenv()
+
+from rag.shared_libraries.batch_planner import BatchPlanJob, corpus_research
+from rag.shared_libraries.records_index import get_records_index
+from rag.shared_libraries.resource_catalog import normalize_grade
+
+
+def select_students(args):
+    """Students named on the command line, or every indexed student matching the filters."""
+    if args.students:
+        return args.students
+
+    selected = []
+    for row in get_records_index().students():
+        if args.grade and normalize_grade(row["grade"]) != normalize_grade(args.grade):
+            continue
+        if args.teacher and args.teacher.lower() not in (row["teacher"] or "").lower():
+            continue
+        if args.school and args.school.lower() not in (row["school"] or "").lower():
+            continue
+        selected.append(row["student"])
+    return selected
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Generate study plans for every student in a class"
+    )
+    parser.add_argument(
+        "--students",
+        nargs="+",
+        help="Student names to plan (default: all indexed students matching the filters)"
+    )
+    parser.add_argument("--grade", help="Only students in this grade (e.g., 1 or 01)")
+    parser.add_argument("--teacher", help="Only students of this homeroom teacher")
+    parser.add_argument("--school", help="Only students at this school")
+    parser.add_argument(
+        "--output",
+        default="class_plans",
+        help="Output directory for plans, checkpoint and metrics"
+    )
+    parser.add_argument(
+        "--weeks",
+        type=int,
+        default=4,
+        help="Weeks per study plan"
+    )
+    parser.add_argument(
+        "--weekly-minutes",
+        type=int,
+        default=90,
+        help="Study minutes available per week"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Students planned concurrently"
+    )
+    parser.add_argument(
+        "--research",
+        action="store_true",
+        help="Add teaching strategies retrieved from the RAG corpus (cached per subject and grade band)"
+    )
+    parser.add_argument(
+        "--restart",
+        action="store_true",
+        help="Ignore the checkpoint and plan every student again"
+    )
+
+    args = parser.parse_args()
+
+    print("="*60)
+    print("📚 Student Report Card RAG - Class Study Plans")
+    print("="*60)
+
+    students = select_students(args)
+    if not students:
+        print("\n❌ No students to plan. Index report cards with: python corpus-setup/add_documents.py --index ...")
+        return 1
+
+    job = BatchPlanJob(
+        args.output,
+        weeks=args.weeks,
+        weekly_minutes=args.weekly_minutes,
+        max_workers=args.workers,
+        research=corpus_research() if args.research else None,
+    )
+
+    def report(entry):
+        if entry["status"] == "done":
+            print(f"   ✅ {entry['student']} → {entry['file']} ({entry['seconds'] * 1000:.0f} ms)")
+        elif entry["status"] == "not_found":
+            print(f"   ⚠️  No indexed ratings for {entry['student']}")
+        else:
+            print(f"   ❌ {entry['student']}: {entry['error']}")
+
+    print(f"\n🗓️  Planning {len(students)} students with {args.workers} workers into {args.output}/")
+    metrics = job.run(students, resume=not args.restart, progress=report)
+
+    print(f"\n📊 Completed {metrics['completed']}, resumed {metrics['resumed']}, "
+          f"failed {metrics['failed']}, not found {metrics['not_found']}")
+    print(f"   ⏱️  {metrics['seconds']:.2f}s ({metrics['plans_per_second']} plans/s, "
+          f"p50 {metrics['plan_ms_p50']} ms)")
+    for name, stats in metrics["caches"].items():
+        print(f"   🗃️  {name} cache hit rate: {stats['hit_rate']:.0%}")
+    print("="*60)
+
+    return 0 if not metrics["failed"] else 1
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -9,12 +9,20 @@ import argparse
 import sys
 from typing import List, Dict, Optional
 from dotenv import load_dotenv
+from pathlib import Path
 from vertexai import rag
 import vertexai
 
+# Make the project packages importable when run from corpus-setup/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
 # Load environment variables
 load_dotenv()
 
+from corpus_manager.utils.bulk_delete import BulkDeleteJob, select_documents
+from corpus_manager.utils.corpus_resolver import get_corpus_resolver
+from corpus_manager.utils.document_search import indexed_students
+
 # Initialize Vertex AI
 PROJECT_ID = os.environ.get("GOOGLE_CLOUD_PROJECT")
 LOCATION = os.environ.get("GOOGLE_CLOUD_LOCATION")
@@ -26,14 +34,12 @@ def initialize_vertex_ai():
     vertexai.init(project=PROJECT_ID, location=LOCATION)
 
 def find_corpus(corpus_name: str = None) -> Optional[str]:
-    """Find the corpus resource name."""
+    """Find the corpus resource name (cached across runs)."""
     try:
         target_name = corpus_name or RAG_CORPUS_NAME
-        corpora = rag.list_corpora()
-        
-        for corpus in corpora:
-            if corpus.display_name == target_name:
-                return corpus.name
+        resource_name = get_corpus_resolver().resolve(target_name)
+        if resource_name:
+            return resource_name
         
         print(f"❌ Corpus '{target_name}' not found")
         return None
@@ -126,48 +132,77 @@ def delete_document(corpus_resource_name: str, document: Dict) -> bool:
         print(f"❌ Error deleting document: {str(e)}")
         return False
 
-def delete_all_documents(corpus_resource_name: str, documents: List[Dict]) -> bool:
-    """Delete all documents from the corpus."""
+def delete_all_documents(
+    corpus_resource_name: str,
+    documents: List[Dict],
+    dry_run: bool = False,
+    workers: int = 8,
+    rate: float = 5.0,
+    selection: str = ""
+) -> bool:
+    """
+    Delete all given documents concurrently within a rate limit.
+    
+    ``selection`` describes the filters that picked the documents (e.g.,
+    'matching "*_2024*.pdf"'); without it they are the whole corpus.
+    """
     try:
         if not documents:
             print("   No documents to delete.")
             return True
         
-        print(f"\n🗑️  Preparing to delete ALL {len(documents)} documents from corpus")
+        # Name what is being deleted: the whole corpus or a filtered selection
+        described = f"the {len(documents)} documents {selection}" if selection else f"ALL {len(documents)} documents"
+        phrase = f"DELETE {len(documents)}" if selection else "DELETE ALL"
+        if dry_run:
+            print(f"\n🔎 Dry run: {len(documents)} documents would be deleted")
+        elif selection:
+            print(f"\n🗑️  Preparing to delete {described} from corpus")
+        else:
+            print(f"\n🗑️  Preparing to delete ALL {len(documents)} documents from corpus")
         print("   Documents to be deleted:")
         for doc in documents:
             print(f"   - {doc['display_name']}")
         
+        if dry_run:
+            print("\n   Nothing was deleted (dry run).")
+            return True
+        
         # Double confirmation for bulk delete
-        confirm1 = input(f"\n⚠️  Are you sure you want to delete ALL {len(documents)} documents? (y/N): ")
+        confirm1 = input(f"\n⚠️  Are you sure you want to delete {described}? (y/N): ")
         if confirm1.lower() != 'y':
             print("   Bulk deletion cancelled.")
             return False
         
-        confirm2 = input("⚠️  This action cannot be undone. Type 'DELETE ALL' to confirm: ")
-        if confirm2 != 'DELETE ALL':
+        confirm2 = input(f"⚠️  This action cannot be undone. Type '{phrase}' to confirm: ")
+        if confirm2 != phrase:
             print("   Bulk deletion cancelled.")
             return False
         
-        # Delete all documents
-        deleted_count = 0
-        failed_count = 0
+        # Delete concurrently; quota errors are retried with backoff
+        print(f"\n   Deleting with {workers} workers at up to {rate:g} deletes/s (Ctrl-C stops)...")
         
-        for doc in documents:
-            try:
-                rag.delete_file(name=doc['name'])
-                print(f"   ✅ Deleted: {doc['display_name']}")
-                deleted_count += 1
-            except Exception as e:
-                print(f"   ❌ Failed to delete {doc['display_name']}: {str(e)}")
-                failed_count += 1
+        def report(entry, summary):
+            prefix = f"   [{summary['done']}/{summary['total']}]"
+            if entry['status'] == 'deleted':
+                retries = f" after {entry['attempts'] - 1} retries" if entry['attempts'] > 1 else ""
+                print(f"{prefix} ✅ Deleted: {entry['display_name']}{retries}")
+            elif entry['status'] == 'not_found':
+                print(f"{prefix} ⚠️  Already gone: {entry['display_name']}")
+            elif entry['status'] == 'failed':
+                print(f"{prefix} ❌ Failed to delete {entry['display_name']}: {entry['error']}")
+        
+        summary = BulkDeleteJob(max_workers=workers, rate=rate).run(documents, progress=report)
         
         print(f"\n📊 Deletion Summary:")
-        print(f"   ✅ Successfully deleted: {deleted_count}")
-        if failed_count > 0:
-            print(f"   ❌ Failed to delete: {failed_count}")
+        print(f"   ✅ Successfully deleted: {summary['deleted'] + summary['not_found']}")
+        if summary['failed'] > 0:
+            print(f"   ❌ Failed to delete: {summary['failed']}")
+        if summary['cancelled'] > 0:
+            print(f"   ⏹️  Not deleted (stopped): {summary['cancelled']}")
+        print(f"   ⏱️  {summary['seconds']:.1f}s ({summary['deletes_per_second']} deletes/s, {summary['retries']} retries)")
         
-        return failed_count == 0
+        return summary['failed'] == 0 and summary['cancelled'] == 0
     
     except Exception as e:
         print(f"❌ Error during bulk deletion: {str(e)}")
@@ -255,7 +290,39 @@ def main():
     parser.add_argument(
         "--delete-all",
         action="store_true",
-        help="Delete all documents from corpus"
+        help="Delete all documents from corpus (or those matching --match, --older-than and --student)"
+    )
+    parser.add_argument(
+        "--match",
+        metavar="GLOB",
+        help="With --delete-all: only documents whose name matches this glob (e.g., '*_2024*.pdf')"
+    )
+    parser.add_argument(
+        "--older-than",
+        type=float,
+        metavar="DAYS",
+        help="With --delete-all: only documents created more than DAYS days ago"
+    )
+    parser.add_argument(
+        "--student",
+        help="With --delete-all: only report cards of this student (from the records index)"
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="With --delete-all: show what would be deleted without deleting"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=8,
+        help="Concurrent delete requests (default: 8)"
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=5.0,
+        help="Maximum deletes per second (default: 5)"
     )
     parser.add_argument(
         "--interactive",
@@ -293,7 +360,34 @@ def main():
     
     elif args.delete_all:
         documents = list_documents(corpus_resource_name)
-        success = delete_all_documents(corpus_resource_name, documents)
+        filters = []
+        if args.match:
+            filters.append(f'matching "{args.match}"')
+        if args.older_than is not None:
+            filters.append(f"older than {args.older_than:g} days")
+        if args.student:
+            filters.append(f'of student "{args.student}"')
+        if filters:
+            students = indexed_students() if args.student else None
+            if args.student and students is None:
+                print("❌ The records index is unavailable, so documents cannot be matched to students")
+                sys.exit(1)
+            documents = select_documents(
+                documents,
+                pattern=args.match,
+                older_than_days=args.older_than,
+                student=args.student,
+                students=students
+            )
+            print(f"\n🔎 {len(documents)} documents match the filters")
+        success = delete_all_documents(
+            corpus_resource_name,
+            documents,
+            dry_run=args.dry_run,
+            workers=args.workers,
+            rate=args.rate,
+            selection=", ".join(filters)
+        )
         sys.exit(0 if success else 1)
     
     else:
@@ -5,14 +5,21 @@ Useful for validating corpus content and testing query performance.
 """
 
 import os
+import sys
 import argparse
 from dotenv import load_dotenv
+from pathlib import Path
 from vertexai import rag
 import vertexai
 
+# Make the project packages importable when run from corpus-setup/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
 # Load environment variables
 load_dotenv()
 
+from corpus_manager.utils.corpus_resolver import get_corpus_resolver
+
 # Initialize Vertex AI
 PROJECT_ID = os.environ.get("GOOGLE_CLOUD_PROJECT")
 LOCATION = os.environ.get("GOOGLE_CLOUD_LOCATION")
@@ -22,13 +29,9 @@ print(f"Initializing Vertex AI with project={PROJECT_ID}, location={LOCATION}")
 vertexai.init(project=PROJECT_ID, location=LOCATION)
 
 def get_corpus_resource_name():
-    """Get the full resource name of the corpus."""
+    """Get the full resource name of the corpus (cached across runs)."""
     try:
-        corpora = rag.list_corpora()
-        for corpus in corpora:
-            if corpus.display_name == RAG_CORPUS_NAME:
-                return corpus.name
-        return None
+        return get_corpus_resolver().resolve(RAG_CORPUS_NAME)
     except Exception as e:
         print(f"   ❌ Error finding corpus: {str(e)}")
         return None
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Script to validate report card documents in bulk before adding them to the corpus.
+Extracts text and validates documents in parallel, and writes a JSONL or Parquet summary.
+"""
+
+import os
+import sys
+import argparse
+import time
+from pathlib import Path
+from dotenv import load_dotenv
+
+# Make the project packages importable when run from corpus-setup/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Load environment variables
+load_dotenv()
+
+from rag.shared_libraries.batch_validation import discover_documents, validate_documents, write_summary
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Validate report card documents before adding them to the corpus"
+    )
+    parser.add_argument(
+        "source",
+        help="Directory, single file, or gs://bucket/prefix containing report cards"
+    )
+    parser.add_argument(
+        "--pattern",
+        default="*",
+        help="Glob pattern for file names (e.g., '*.pdf')"
+    )
+    parser.add_argument(
+        "--output",
+        default="validation_summary.jsonl",
+        help="Summary file (.jsonl or .parquet)"
+    )
+    parser.add_argument(
+        "--valid-list",
+        help="Also write the paths of valid documents to this file, one per line"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of worker processes (default: CPU count)"
+    )
+
+    args = parser.parse_args()
+
+    print("="*60)
+    print("📚 Student Report Card RAG - Validate Documents")
+    print("="*60)
+
+    paths = discover_documents(args.source, args.pattern)
+    if not paths:
+        print(f"   ⚠️  No supported documents found in {args.source}")
+        return 1
+
+    print(f"\n🔍 Validating {len(paths)} documents...")
+    started = time.perf_counter()
+
+    results = []
+    for result in validate_documents(paths, max_workers=args.workers):
+        results.append(result)
+        status = "✅" if result["is_valid"] else "❌"
+        print(f"   {status} {os.path.basename(result['path'])} (confidence {result['confidence']:.2f})")
+
+    elapsed = time.perf_counter() - started
+    results.sort(key=lambda row: row["path"])
+    write_summary(results, args.output)
+
+    valid = [row["path"] for row in results if row["is_valid"]]
+    if args.valid_list:
+        with open(args.valid_list, "w", encoding="utf-8") as file:
+            file.writelines(f"{path}\n" for path in valid)
+
+    print(f"\n📊 Validation Summary:")
+    print(f"   ✅ Valid: {len(valid)}")
+    print(f"   ❌ Invalid: {len(results) - len(valid)}")
+    print(f"   ⏱️  {elapsed:.1f}s total ({len(results) / max(elapsed, 1e-9):.1f} documents/s)")
+    print(f"   Summary written to {args.output}")
+
+    print("\n" + "="*60)
+    print("📋 Next Steps:")
+    print("   Add only the valid documents with: python add_documents.py --source local --validate --paths ...")
+    print("="*60)
+
+    return 0 if len(valid) == len(results) else 2
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -4,6 +4,7 @@ Modern RAG Corpus Manager with Enhanced UI Components
 Built with the latest Streamlit components for a standout experience.
 """
 
+import os
 import streamlit as st
 import pandas as pd
 import plotly.express as px
@@ -18,23 +19,22 @@ from streamlit_lottie import st_lottie
 from streamlit_extras.metric_cards import style_metric_cards
 from streamlit_extras.colored_header import colored_header
 from streamlit_extras.add_vertical_space import add_vertical_space
-from streamlit_extras.stateful_button import button as stateful_button
 
 # Use absolute imports to avoid module loading issues
 from corpus_manager.config import PAGE_TITLE, PAGE_ICON, LAYOUT, validate_config, SUPPORTED_FILE_TYPES, MAX_FILE_SIZE_MB
 from corpus_manager.utils.vertex_ai import (
     initialize_vertex_ai, 
     find_corpus, 
-    get_corpus_documents,
-    get_corpus_stats,
-    upload_document,
-    delete_document
+    get_mirrored_corpus_stats,
+    refresh_corpus_documents,
+    upload_document
 )
 from corpus_manager.utils.formatters import (
     format_file_size, 
-    format_date, 
-    format_resource_id
+    format_date
 )
+from corpus_manager.pages.cohort_analytics import render_cohort_analytics
+from corpus_manager.pages.document_list import render_document_list
 
 
 def load_lottieurl(url: str):
@@ -99,7 +99,7 @@ def create_corpus_metrics_chart(stats):
     return fig
 
 
-def render_dashboard_page(corpus_resource_name, documents, stats):
+def render_dashboard_page(corpus_resource_name, stats):
     """Render the main dashboard page."""
     # Header with animation
     col1, col2 = st.columns([3, 1])
@@ -167,7 +167,7 @@ def render_dashboard_page(corpus_resource_name, documents, stats):
     add_vertical_space(2)
     
     # Charts section
-    if documents:
+    if stats['total_documents']:
         col1, col2 = st.columns(2)
         
         with col1:
@@ -229,6 +229,9 @@ def render_upload_page(corpus_resource_name):
             - Type: {uploaded_file.type}
             """)
             
+            # Text preview from the shared (content-hash cached) extractor
+            _render_text_preview(uploaded_file)
+            
             # Progress visualization
             size_percentage = min(100, (file_size / (MAX_FILE_SIZE_MB * 1024 * 1024)) * 100)
             st.progress(size_percentage / 100)
@@ -256,7 +259,28 @@ def render_upload_page(corpus_resource_name):
                             st.error("❌ Failed to upload document. Please try again.")
 
 
-def render_documents_page(documents):
+def _render_text_preview(uploaded_file, max_pages=2):
+    """Show the extracted text of the first pages of an uploaded PDF or text file."""
+    suffix = os.path.splitext(uploaded_file.name)[1].lower()
+    if suffix not in (".pdf", ".txt"):
+        return
+    
+    with st.expander("👀 Text preview"):
+        try:
+            from itertools import islice
+            from rag.shared_libraries.pdf_text import iter_pages
+            
+            pages = list(islice(iter_pages(uploaded_file.getvalue(), suffix=suffix, layout=True), max_pages))
+        except Exception as e:
+            st.warning(f"Could not extract text: {e}")
+            return
+        
+        for number, text in enumerate(pages, start=1):
+            st.caption(f"Page {number}")
+            st.code(text.strip() or "(no text on this page)", language=None)
+
+
+def render_documents_page(corpus_resource_name, stats):
     """Render the documents management page."""
     colored_header(
         label="📄 Document Management",
@@ -264,7 +288,7 @@ def render_documents_page(documents):
         color_name="violet-70"
     )
     
-    if not documents:
+    if not stats['total_documents']:
         # Empty state with animation
         col1, col2, col3 = st.columns([1, 2, 1])
         with col2:
@@ -276,52 +300,8 @@ def render_documents_page(documents):
             st.info("Upload your first document using the Upload tab.")
         return
     
-    # Documents table with enhanced styling
-    for i, doc in enumerate(documents):
-        with st.container():
-            col1, col2, col3, col4, col5 = st.columns([3, 1, 2, 2, 1])
-            
-            with col1:
-                st.markdown(f"📄 **{doc['display_name']}**")
-            
-            with col2:
-                st.markdown(f"`{format_file_size(doc['size_bytes'])}`")
-            
-            with col3:
-                st.markdown(f"📅 {format_date(doc['create_time']) if doc['create_time'] else 'Unknown'}")
-            
-            with col4:
-                st.markdown(f"🔗 `{format_resource_id(doc['name'])}`")
-            
-            with col5:
-                if stateful_button("🗑️", key=f"delete_{i}", help=f"Delete {doc['display_name']}"):
-                    st.session_state[f'confirm_delete_{i}'] = True
-                    st.rerun()
-            
-            # Confirmation dialog
-            if st.session_state.get(f'confirm_delete_{i}', False):
-                st.warning(f"⚠️ Delete **{doc['display_name']}**? This action cannot be undone.")
-                
-                col_yes, col_no = st.columns(2)
-                with col_yes:
-                    if st.button("✅ Confirm Delete", key=f"confirm_yes_{i}", type="primary"):
-                        with st.spinner(f"Deleting {doc['display_name']}..."):
-                            if delete_document(doc['name'], doc['display_name']):
-                                st.success(f"✅ Successfully deleted '{doc['display_name']}'")
-                                st.session_state[f'confirm_delete_{i}'] = False
-                                st.cache_data.clear()
-                                st.rerun()
-                            else:
-                                st.error(f"❌ Failed to delete '{doc['display_name']}'")
-                
-                with col_no:
-                    if st.button("❌ Cancel", key=f"confirm_no_{i}"):
-                        st.session_state[f'confirm_delete_{i}'] = False
-                        st.rerun()
-                
-                break
-            
-            st.divider()
+    # One page at a time from the metadata mirror, in a virtualized grid
+    render_document_list(corpus_resource_name)
 
 
 def main():
@@ -395,15 +375,14 @@ def main():
         st.error("Could not find the RAG corpus. Please check your configuration.")
         st.stop()
     
-    # Get documents and stats
-    documents = get_corpus_documents(corpus_resource_name)
-    stats = get_corpus_stats(documents)
+    # Stats come from the metadata mirror; documents are paged where they are shown
+    stats = get_mirrored_corpus_stats(corpus_resource_name)
     
     # Enhanced navigation menu
     selected = option_menu(
         menu_title=None,
-        options=["📊 Dashboard", "📤 Upload", "📄 Documents", "⚙️ Settings"],
-        icons=["graph-up", "upload", "files", "gear"],
+        options=["📊 Dashboard", "📤 Upload", "📄 Documents", "🎓 Cohorts", "⚙️ Settings"],
+        icons=["graph-up", "upload", "files", "people", "gear"],
         menu_icon="cast",
         default_index=0,
         orientation="horizontal",
@@ -424,13 +403,21 @@ def main():
     
     # Render selected page
     if selected == "📊 Dashboard":
-        render_dashboard_page(corpus_resource_name, documents, stats)
+        render_dashboard_page(corpus_resource_name, stats)
     
     elif selected == "📤 Upload":
         render_upload_page(corpus_resource_name)
     
     elif selected == "📄 Documents":
-        render_documents_page(documents)
+        render_documents_page(corpus_resource_name, stats)
+    
+    elif selected == "🎓 Cohorts":
+        colored_header(
+            label="🎓 Cohort Analytics",
+            description="Class- and school-level views of standards ratings",
+            color_name="blue-70"
+        )
+        render_cohort_analytics()
     
     elif selected == "⚙️ Settings":
         colored_header(
@@ -448,6 +435,8 @@ def main():
         
         with col1:
             if st.button("🔄 Refresh Data", use_container_width=True):
+                with st.spinner("Syncing document metadata..."):
+                    refresh_corpus_documents(corpus_resource_name)
                 st.cache_data.clear()
                 st.rerun()
         
@@ -25,7 +25,15 @@ LAYOUT = "wide"
 UPLOAD_CHUNK_SIZE = 512
 UPLOAD_CHUNK_OVERLAP = 100
 CACHE_TTL = 60  # seconds
+# Local SQLite mirror of corpus document metadata
+CORPUS_MIRROR_DB = os.environ.get(
+    "CORPUS_MIRROR_DB",
+    os.path.join(os.path.expanduser("~"), ".cache", "report-card-rag", "corpus_metadata.db"),
+)
 MAX_FILE_SIZE_MB = 50
+# Bulk deletes: concurrent requests and deletes per second
+BULK_DELETE_WORKERS = int(os.environ.get("BULK_DELETE_WORKERS", "8"))
+BULK_DELETE_RATE = float(os.environ.get("BULK_DELETE_RATE", "5"))
 
 # Supported file types
 SUPPORTED_FILE_TYPES = ['pdf', 'docx', 'txt']
@@ -97,37 +97,46 @@ def _render_bulk_delete_modal(documents: List[Dict], selected_indices: List[int]
     </div>
     """, unsafe_allow_html=True)
     
-    # Show documents to be deleted
-    with st.expander("📋 Documents to be deleted"):
-        for i in selected_indices:
-            doc = documents[i]
-            st.write(f"• {doc['display_name']}")
+    # Dry run: show exactly what would be deleted before anything is
+    with st.expander(f"📋 {len(selected_indices)} documents would be deleted"):
+        for i in selected_indices[:50]:
+            st.write(f"• {documents[i]['display_name']}")
+        if len(selected_indices) > 50:
+            st.write(f"... and {len(selected_indices) - 50} more")
     
     # Confirmation buttons
     col1, col2 = st.columns(2)
     
     with col1:
         if st.button("🗑️ Yes, Delete Selected", type="primary", key="confirm_bulk_delete"):
-            with st.spinner("Deleting selected documents..."):
-                # Prepare document info for deletion
-                doc_names = [documents[i]['name'] for i in selected_indices]
-                display_names = [documents[i]['display_name'] for i in selected_indices]
-                
-                # Perform bulk deletion
-                result = bulk_delete_documents(doc_names, display_names)
-                
-                # Show results
-                if result['deleted'] == result['total']:
-                    st.success(f"✅ Successfully deleted all {result['deleted']} documents!")
-                elif result['deleted'] > 0:
-                    st.warning(f"⚠️ Deleted {result['deleted']} of {result['total']} documents. {result['failed']} failed.")
-                else:
-                    st.error(f"❌ Failed to delete any documents. {result['failed']} failed.")
-                
-                # Clear the modal and cache
-                st.session_state.show_bulk_delete_modal = False
-                st.cache_data.clear()
-                st.rerun()
+            progress_bar = st.progress(0.0, text="Deleting documents...")
+            
+            def report(entry, summary):
+                progress_bar.progress(
+                    summary['done'] / summary['total'],
+                    text=f"Deleted {summary['deleted']} of {summary['total']} "
+                         f"({summary['deletes_per_second']}/s, {summary['retries']} retries)"
+                )
+            
+            # Prepare document info for deletion
+            doc_names = [documents[i]['name'] for i in selected_indices]
+            display_names = [documents[i]['display_name'] for i in selected_indices]
+            
+            # Perform bulk deletion
+            result = bulk_delete_documents(doc_names, display_names, progress=report)
+            
+            # Show results
+            if result['deleted'] == result['total']:
+                st.success(f"✅ Successfully deleted all {result['deleted']} documents!")
+            elif result['deleted'] > 0:
+                st.warning(f"⚠️ Deleted {result['deleted']} of {result['total']} documents. {result['failed']} failed.")
+            else:
+                st.error(f"❌ Failed to delete any documents. {result['failed']} failed.")
+            
+            # Clear the modal and cache
+            st.session_state.show_bulk_delete_modal = False
+            st.cache_data.clear()
+            st.rerun()
     
     with col2:
         if st.button("❌ Cancel", key="cancel_bulk_delete"):
@@ -0,0 +1,130 @@
+"""
+Cohort analytics page for the RAG Corpus Manager.
+Shows class- and school-level views of the parsed standards ratings, such as
+which standards most students are rated 1 on in a given quarter.
+"""
+
+import time
+import streamlit as st
+import pandas as pd
+
+QUARTER_OPTIONS = ["All", "Q1", "Q2", "Q3", "Q4"]
+RATING_OPTIONS = ["1", "2", "3", "P", "S"]
+
+
+def _load_store():
+    """Import the cohort store lazily so the rest of the app works without it."""
+    try:
+        from rag.shared_libraries.cohort_store import get_cohort_store, refresh_cohort_store
+    except Exception as e:
+        st.error(f"Cohort analytics are unavailable: {e}")
+        return None, None
+    return get_cohort_store(), refresh_cohort_store
+
+
+def render_cohort_analytics():
+    """Render the cohort analytics page with filters, rankings and distributions."""
+    store, refresh = _load_store()
+    if store is None:
+        return
+
+    overview = store.overview()
+
+    header_col, button_col = st.columns([4, 1])
+    with button_col:
+        if st.button("🔄 Rebuild from index", use_container_width=True):
+            with st.spinner("Rebuilding cohort store..."):
+                rows = refresh()
+            st.success(f"Cohort store rebuilt with {rows:,} ratings")
+            overview = store.overview()
+
+    if not overview["ratings"]:
+        st.info("No parsed ratings yet. Index report cards with: python corpus-setup/add_documents.py --index ...")
+        return
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Students", f"{overview['students']:,}")
+    with col2:
+        st.metric("Schools", f"{overview['schools']:,}")
+    with col3:
+        st.metric("Standards", f"{overview['standards']:,}")
+    with col4:
+        st.metric("Ratings", f"{overview['ratings']:,}")
+
+    st.markdown("---")
+
+    # Filters shared by every view
+    grade_col, school_col, subject_col, quarter_col = st.columns(4)
+    with grade_col:
+        grade = st.selectbox("Grade", ["All"] + overview["grades"])
+    with school_col:
+        school = st.text_input("School", placeholder="Any school")
+    with subject_col:
+        subject = st.text_input("Subject", placeholder="e.g., math, literacy")
+    with quarter_col:
+        quarter = st.selectbox("Quarter", QUARTER_OPTIONS, index=2)
+
+    filters = {
+        "grade": "" if grade == "All" else grade,
+        "school": school,
+        "subject": subject,
+        "quarter": "" if quarter == "All" else quarter,
+    }
+
+    # Standards ranking
+    st.markdown("### 🎯 Standards by Rating")
+    rating = st.radio("Rating", RATING_OPTIONS, horizontal=True)
+    started = time.perf_counter()
+    top = store.top_standards(rating, top=20, **filters)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    if top:
+        df_top = pd.DataFrame(top)
+        df_top["share"] = (df_top["share"] * 100).round(1).astype(str) + "%"
+        df_top.columns = ["Subject", "Standard", "Students", "Students Assessed", "Share"]
+        st.dataframe(df_top, use_container_width=True, hide_index=True)
+    else:
+        st.info(f"No standards rated {rating} for these filters")
+    st.caption(f"Query time: {elapsed_ms:.1f} ms")
+
+    st.markdown("---")
+
+    # Rating distribution per subject
+    st.markdown("### 📊 Rating Distribution by Subject")
+    distribution = store.distribution(["subject"], **filters)
+    if distribution:
+        df_dist = pd.DataFrame({
+            subject_name: entry["shares"] for subject_name, entry in distribution.items()
+        }).T.fillna(0) * 100
+        st.bar_chart(df_dist)
+
+        with st.expander("📋 View counts"):
+            df_counts = pd.DataFrame({
+                subject_name: entry["ratings"] for subject_name, entry in distribution.items()
+            }).T.fillna(0).astype(int)
+            st.dataframe(df_counts, use_container_width=True)
+    else:
+        st.info("No ratings for these filters")
+
+    st.markdown("---")
+
+    # Spread of student mean scores
+    st.markdown("### 📈 Student Score Percentiles")
+    spread = store.percentiles("student", **filters)
+    if spread["groups"]:
+        columns = st.columns(len(spread["percentiles"]) + 1)
+        with columns[0]:
+            st.metric("Students", f"{spread['groups']:,}")
+        for column, (label, value) in zip(columns[1:], spread["percentiles"].items()):
+            with column:
+                st.metric(label.upper(), f"{value:.2f}")
+        st.caption("Mean rating per student on the 1-3 scale (P counts as 2, S as 3)")
+
+    with st.expander("📅 Quarter-by-quarter summary"):
+        trend_filters = dict(filters, quarter="")
+        rows = store.group_by(["subject", "quarter"], **trend_filters)
+        if rows:
+            df_trend = pd.DataFrame(rows).pivot(index="subject", columns="quarter", values="mean_score")
+            df_trend.columns = [f"Q{column}" for column in df_trend.columns]
+            st.dataframe(df_trend, use_container_width=True)
@@ -1,95 +1,180 @@
 """
 Document list page for the RAG Corpus Manager.
-Displays all documents in the corpus with search and delete functionality.
+Pages through the corpus documents in a virtualized grid with search, type
+filter, sorting and delete. Pages are read from the local metadata mirror
+with cursors, so render cost stays the same whatever the corpus size.
 """
 
 import streamlit as st
-from typing import List, Dict
+import pandas as pd
+from typing import List, Dict, Optional
+from st_aggrid import AgGrid, GridOptionsBuilder, GridUpdateMode
+
+from corpus_manager.config import DOCUMENTS_PER_PAGE
 from corpus_manager.utils.formatters import format_file_size, format_date, format_resource_id
-from corpus_manager.utils.vertex_ai import delete_document
-
-
-def render_document_list(documents: List[Dict]):
-    """Render the document list page with search and filter functionality."""
-    if not documents:
-        st.markdown("""
-        <div class="info-card" style="text-align: center; padding: 3rem;">
-            <h3>📭 No Documents Found</h3>
-            <p>Upload your first document using the sidebar to get started.</p>
-        </div>
-        """, unsafe_allow_html=True)
-        return
-    
-    # Search and filter controls
-    search_col, filter_col = st.columns([3, 1])
-    
+from corpus_manager.utils.vertex_ai import (
+    bulk_delete_documents,
+    count_corpus_documents,
+    get_corpus_documents,
+    get_corpus_document_page,
+    get_corpus_file_types
+)
+
+SORT_OPTIONS = {
+    "Newest first": ("create_time", True),
+    "Oldest first": ("create_time", False),
+    "Recently updated": ("update_time", True),
+    "Name (A-Z)": ("display_name", False),
+    "Name (Z-A)": ("display_name", True),
+    "Largest first": ("size_bytes", True),
+    "Smallest first": ("size_bytes", False),
+}
+
+SEARCH_HELP = (
+    "Words match anywhere in the name. End a word with * to match the start of a word "
+    "or with ~ to allow typos. Filter with type:, date: (2025-03 or 2025-03-21) and student:; "
+    'quote names of several words, e.g. student:"em jo" for Emma Jones.'
+)
+
+PAGE_SIZE_OPTIONS = sorted({DOCUMENTS_PER_PAGE, 25, 50, 100})
+
+# Rows shown before the grid scrolls; the grid only draws visible rows
+GRID_VISIBLE_ROWS = 15
+GRID_ROW_HEIGHT = 35
+
+
+def render_document_list(corpus_resource_name: str, key: str = "documents"):
+    """Render one page of documents with search, filter, sort and delete controls."""
+    search_col, filter_col, sort_col, size_col = st.columns([3, 1, 1, 1])
+
     with search_col:
-        search_term = st.text_input("🔍 Search documents", placeholder="Enter document name...")
-    
+        search_term = st.text_input(
+            "🔍 Search documents",
+            placeholder="e.g. report, rpt*, standrds~, type:pdf date:2025-03 student:emma",
+            help=SEARCH_HELP,
+            key=f"{key}_search"
+        )
+
     with filter_col:
-        # Get unique file types
-        file_types = set()
-        for doc in documents:
-            if '.' in doc['display_name']:
-                ext = doc['display_name'].lower().split('.')[-1]
-                file_types.add(ext)
-        
         file_type_filter = st.selectbox(
             "Filter by type",
-            ["All"] + sorted(list(file_types))
+            ["All"] + get_corpus_file_types(corpus_resource_name),
+            key=f"{key}_type"
         )
-    
-    # Filter documents based on search and filter
-    filtered_docs = documents
-    if search_term:
-        filtered_docs = [
-            doc for doc in filtered_docs 
-            if search_term.lower() in doc['display_name'].lower()
-        ]
-    if file_type_filter != "All":
-        filtered_docs = [
-            doc for doc in filtered_docs 
-            if doc['display_name'].lower().endswith(f".{file_type_filter}")
-        ]
-    
-    # Show results count
-    st.markdown(f"**Showing {len(filtered_docs)} of {len(documents)} documents**")
-    
-    # Document list
-    for i, doc in enumerate(filtered_docs):
-        _render_document_item(doc, i)
-
-
-def _render_document_item(doc: Dict, index: int):
-    """Render an individual document item with actions."""
-    with st.container():
-        # Document info card
-        st.markdown(f"""
-        <div class="document-item">
-            <div class="document-title">📄 {doc['display_name']}</div>
-            <div class="document-meta">
-                <strong>Size:</strong> {format_file_size(doc['size_bytes'])} | 
-                <strong>Created:</strong> {format_date(doc['create_time'])}
-            </div>
-            <div class="document-meta">
-                <strong>Resource ID:</strong> <code>{format_resource_id(doc['name'])}</code>
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        # Action buttons
-        col_info, col_delete = st.columns([3, 1])
-        
-        with col_info:
-            if st.button(f"ℹ️ View Details", key=f"info_{index}"):
-                st.session_state[f"show_details_{index}"] = not st.session_state.get(f"show_details_{index}", False)
-        
-        with col_delete:
-            if st.button(f"🗑️ Delete", key=f"delete_{index}", type="secondary"):
-                st.session_state[f"confirm_delete_{index}"] = True
-        
-        # Show details if requested
-        if st.session_state.get(f"show_details_{index}", False):
+
+    with sort_col:
+        sort_label = st.selectbox("Sort by", list(SORT_OPTIONS), key=f"{key}_sort")
+
+    with size_col:
+        page_size = st.selectbox(
+            "Per page",
+            PAGE_SIZE_OPTIONS,
+            index=PAGE_SIZE_OPTIONS.index(DOCUMENTS_PER_PAGE),
+            key=f"{key}_page_size"
+        )
+
+    file_type = None if file_type_filter == "All" else file_type_filter
+    sort_by, descending = SORT_OPTIONS[sort_label]
+
+    # Cursors of the pages visited so far; any change to the query starts over
+    query = (search_term, file_type, sort_label, page_size)
+    if st.session_state.get(f"{key}_query") != query:
+        st.session_state[f"{key}_query"] = query
+        st.session_state[f"{key}_cursors"] = [None]
+    cursors = st.session_state[f"{key}_cursors"]
+    page_number = len(cursors)
+
+    documents, next_cursor = get_corpus_document_page(
+        corpus_resource_name,
+        cursor=cursors[-1],
+        page_size=page_size,
+        search=search_term,
+        file_type=file_type,
+        sort_by=sort_by,
+        descending=descending
+    )
+    total = count_corpus_documents(corpus_resource_name, search=search_term, file_type=file_type)
+    total_pages = max(1, -(-total // page_size))
+
+    if not documents and page_number > 1:
+        # The page emptied out (e.g., its documents were deleted): step back
+        cursors.pop()
+        st.rerun()
+
+    first = (page_number - 1) * page_size + 1 if documents else 0
+    st.markdown(f"**Showing {first}-{first + len(documents) - 1 if documents else 0} of {total} documents**")
+
+    selected = _render_grid(documents, key)
+
+    # Pagination controls
+    prev_col, page_col, next_col = st.columns([1, 2, 1])
+
+    with prev_col:
+        if st.button("⬅️ Previous", key=f"{key}_prev", disabled=page_number == 1, use_container_width=True):
+            cursors.pop()
+            st.rerun()
+
+    with page_col:
+        st.markdown(f"<div style='text-align: center;'>Page {page_number} of {total_pages}</div>", unsafe_allow_html=True)
+
+    with next_col:
+        if st.button("Next ➡️", key=f"{key}_next", disabled=next_cursor is None, use_container_width=True):
+            cursors.append(next_cursor)
+            st.rerun()
+
+    if selected:
+        _render_selection_actions(selected, key)
+    elif (search_term or file_type) and total:
+        _render_matching_actions(corpus_resource_name, search_term, file_type, total, key)
+
+
+def _render_grid(documents: List[Dict], key: str) -> List[Dict]:
+    """Show a page of documents in the grid and return the selected documents."""
+    frame = pd.DataFrame(
+        [
+            {
+                "Document": doc['display_name'],
+                "Size": format_file_size(doc['size_bytes']),
+                "Created": format_date(doc['create_time']),
+                "Updated": format_date(doc['update_time']),
+                "Resource ID": format_resource_id(doc['name']),
+                "name": doc['name'],
+            }
+            for doc in documents
+        ],
+        columns=["Document", "Size", "Created", "Updated", "Resource ID", "name"]
+    )
+
+    builder = GridOptionsBuilder.from_dataframe(frame)
+    # Sorting happens server-side across all pages, not within one page
+    builder.configure_default_column(sortable=False, resizable=True)
+    builder.configure_column("Document", flex=3)
+    builder.configure_column("name", hide=True)
+    builder.configure_selection(selection_mode="multiple", use_checkbox=True, header_checkbox=True)
+    builder.configure_grid_options(rowHeight=GRID_ROW_HEIGHT, suppressCellFocus=True)
+
+    response = AgGrid(
+        frame,
+        gridOptions=builder.build(),
+        height=GRID_ROW_HEIGHT * (GRID_VISIBLE_ROWS + 1),
+        update_mode=GridUpdateMode.SELECTION_CHANGED,
+        show_download_button=False,
+        show_search=False,
+        key=f"{key}_grid"
+    )
+
+    selected_rows = response.selected_rows
+    if selected_rows is None:
+        return []
+    by_name = {doc['name']: doc for doc in documents}
+    return [by_name[name] for name in selected_rows["name"] if name in by_name]
+
+
+def _render_selection_actions(selected: List[Dict], key: str):
+    """Render details and delete actions for the selected documents."""
+    if len(selected) == 1:
+        doc = selected[0]
+        with st.expander(f"ℹ️ Details: {doc['display_name']}"):
             st.json({
                 "Display Name": doc['display_name'],
                 "Resource Name": doc['name'],
@@ -97,30 +182,65 @@ def _render_document_item(doc: Dict, index: int):
                 "Created": str(doc['create_time']),
                 "Updated": str(doc['update_time'])
             })
-        
-        # Confirmation dialog for delete
-        if st.session_state.get(f"confirm_delete_{index}", False):
-            _render_delete_confirmation(doc, index)
 
+    if st.button(f"🗑️ Delete {len(selected)} selected", key=f"{key}_delete", type="secondary"):
+        st.session_state[f"{key}_confirm_delete"] = [doc['name'] for doc in selected]
+
+    if st.session_state.get(f"{key}_confirm_delete") == [doc['name'] for doc in selected]:
+        _render_delete_confirmation(selected, key)
+
+
+def _render_matching_actions(corpus_resource_name: str, search_term: str, file_type: Optional[str], total: int, key: str):
+    """Offer to delete every document matching the current search, with a preview first."""
+    query = [search_term, file_type]
+    if st.button(f"🗑️ Delete all {total} matching documents", key=f"{key}_delete_matching", type="secondary"):
+        st.session_state[f"{key}_confirm_matching"] = query
+
+    if st.session_state.get(f"{key}_confirm_matching") == query:
+        matching = get_corpus_documents(corpus_resource_name, search=search_term, file_type=file_type)
+        # Dry run: show exactly what would be deleted before anything is
+        with st.expander(f"📋 {len(matching)} documents would be deleted"):
+            for doc in matching[:50]:
+                st.write(f"• {doc['display_name']}")
+            if len(matching) > 50:
+                st.write(f"... and {len(matching) - 50} more")
+        _render_delete_confirmation(matching, key, f"{key}_confirm_matching")
+
+
+def _render_delete_confirmation(selected: List[Dict], key: str, state_key: Optional[str] = None):
+    """Render delete confirmation dialog for the selected documents."""
+    state_key = state_key or f"{key}_confirm_delete"
+    names = ", ".join(f"'{doc['display_name']}'" for doc in selected[:3])
+    if len(selected) > 3:
+        names += f" and {len(selected) - 3} more"
+    st.warning(f"⚠️ Are you sure you want to delete {names}? This action cannot be undone.")
 
-def _render_delete_confirmation(doc: Dict, index: int):
-    """Render delete confirmation dialog for a document."""
-    st.warning(f"⚠️ Are you sure you want to delete '{doc['display_name']}'?")
-    
     confirm_col, cancel_col = st.columns(2)
-    
+
     with confirm_col:
-        if st.button(f"✅ Yes, Delete", key=f"confirm_yes_{index}", type="primary"):
-            with st.spinner("Deleting document..."):
-                if delete_document(doc['name'], doc['display_name']):
-                    st.success(f"Successfully deleted '{doc['display_name']}'!")
-                    # Clear cache and rerun
-                    st.cache_data.clear()
-                    # Clear the confirmation state
-                    st.session_state[f"confirm_delete_{index}"] = False
-                    st.rerun()
-    
+        if st.button(f"✅ Yes, Delete", key=f"{state_key}_yes", type="primary"):
+            progress_bar = st.progress(0.0, text="Deleting documents...")
+
+            def report(entry, summary):
+                progress_bar.progress(
+                    summary['done'] / summary['total'],
+                    text=f"Deleted {summary['deleted']} of {summary['total']} "
+                         f"({summary['deletes_per_second']}/s, {summary['retries']} retries)"
+                )
+
+            results = bulk_delete_documents(
+                [doc['name'] for doc in selected],
+                [doc['display_name'] for doc in selected],
+                progress=report
+            )
+            if results['deleted']:
+                st.success(f"Successfully deleted {results['deleted']} of {results['total']} documents!")
+            # Cursors stay valid after deletes, so the current page is kept
+            st.session_state[state_key] = None
+            st.cache_data.clear()
+            st.rerun()
+
     with cancel_col:
-        if st.button(f"❌ Cancel", key=f"confirm_no_{index}"):
-            st.session_state[f"confirm_delete_{index}"] = False
-            st.rerun() 
\ No newline at end of file
+        if st.button(f"❌ Cancel", key=f"{state_key}_no"):
+            st.session_state[state_key] = None
+            st.rerun()
@@ -0,0 +1,223 @@
+"""
+Bulk document deletion for the RAG Corpus Manager and the corpus-setup CLIs.
+Deletes run concurrently on a bounded thread pool behind a token-bucket rate
+limiter; quota and unavailable errors are retried with exponential backoff and
+jitter. Progress is reported per document on the calling thread (safe for
+Streamlit), and a dry run reports the selection without deleting anything.
+Documents can be selected by name glob, age or student.
+"""
+
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timedelta
+import fnmatch
+from itertools import islice
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+# HTTP status codes worth retrying: quota exceeded, unavailable, timed out
+RETRYABLE_CODES = {429, 503, 504}
+RETRYABLE_MARKERS = ("429", "quota", "resource_exhausted", "rate limit", "unavailable")
+
+Progress = Callable[[Dict[str, Any], Dict[str, Any]], None]
+
+
+def _default_delete_file(name: str) -> None:
+    from vertexai.preview import rag
+
+    rag.delete_file(name=name)
+
+
+def _status_code(error: Exception) -> Optional[int]:
+    # google.api_core exceptions carry the HTTP status as .code
+    code = getattr(error, "code", None)
+    return code if isinstance(code, int) else None
+
+
+def is_retryable(error: Exception) -> bool:
+    """True for quota, rate-limit and temporary availability errors."""
+    if _status_code(error) in RETRYABLE_CODES:
+        return True
+    message = str(error).lower()
+    return any(marker in message for marker in RETRYABLE_MARKERS)
+
+
+def is_not_found(error: Exception) -> bool:
+    """True if the document is already gone."""
+    return _status_code(error) == 404 or "not found" in str(error).lower()
+
+
+class TokenBucket:
+    """Thread-safe token bucket: ``rate`` tokens per second, bursts of up to ``capacity``."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, stop: Optional[threading.Event] = None) -> bool:
+        """Wait for a token; returns False if ``stop`` is set while waiting."""
+        if not self.rate:
+            return True
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                delay = (1 - self._tokens) / self.rate
+            if stop is None:
+                time.sleep(delay)
+            elif stop.wait(delay):
+                return False
+
+
+def select_documents(
+    documents: Iterable[Dict],
+    pattern: Optional[str] = None,
+    older_than_days: Optional[float] = None,
+    student: Optional[str] = None,
+    students: Optional[Dict[str, str]] = None,
+) -> List[Dict]:
+    """
+    Documents matching every given filter.
+
+    Args:
+        documents: Documents with display_name and create_time
+        pattern: Case-insensitive glob on the display name (e.g., "*_2024*.pdf")
+        older_than_days: Only documents created more than this many days ago
+        student: Case-insensitive part of a student's name
+        students: Display name -> student, needed for ``student``
+    """
+    selected = []
+    for doc in documents:
+        display_name = doc.get('display_name') or ''
+        if pattern and not fnmatch.fnmatch(display_name.lower(), pattern.lower()):
+            continue
+        if older_than_days is not None:
+            created = doc.get('create_time')
+            if not isinstance(created, datetime):
+                continue
+            if datetime.now(created.tzinfo) - created < timedelta(days=older_than_days):
+                continue
+        if student and student.lower() not in (students or {}).get(display_name, '').lower():
+            continue
+        selected.append(doc)
+    return selected
+
+
+class BulkDeleteJob:
+    """Delete many documents concurrently within a rate limit."""
+
+    def __init__(
+        self,
+        max_workers: int = 8,
+        rate: float = 5.0,
+        burst: Optional[float] = None,
+        max_retries: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+        delete_file: Optional[Callable[[str], None]] = None,
+    ):
+        self.max_workers = max(1, max_workers)
+        self.bucket = TokenBucket(rate, burst)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.delete_file = delete_file or _default_delete_file
+        self._stop = threading.Event()
+
+    def cancel(self) -> None:
+        """Stop starting new deletes; deletes already sent still finish."""
+        self._stop.set()
+
+    def _backoff(self, attempt: int) -> float:
+        # Full exponential delay, with jitter so workers do not retry in lockstep
+        return min(self.max_delay, self.base_delay * 2 ** attempt) * random.uniform(0.5, 1.0)
+
+    def _delete_one(self, doc: Dict) -> Dict[str, Any]:
+        entry = {"name": doc['name'], "display_name": doc.get('display_name', doc['name']), "attempts": 0}
+        started = time.perf_counter()
+        while True:
+            if not self.bucket.acquire(self._stop):
+                entry["status"] = "cancelled"
+                break
+            entry["attempts"] += 1
+            try:
+                self.delete_file(doc['name'])
+                entry["status"] = "deleted"
+                break
+            except Exception as e:
+                if is_not_found(e):
+                    entry["status"] = "not_found"
+                    break
+                if not is_retryable(e) or entry["attempts"] > self.max_retries:
+                    entry["status"], entry["error"] = "failed", str(e)
+                    break
+                if self._stop.wait(self._backoff(entry["attempts"] - 1)):
+                    entry["status"], entry["error"] = "cancelled", str(e)
+                    break
+        entry["seconds"] = round(time.perf_counter() - started, 3)
+        return entry
+
+    def run(self, documents: Iterable[Dict], dry_run: bool = False, progress: Optional[Progress] = None) -> Dict[str, Any]:
+        """
+        Delete documents, calling ``progress(entry, summary)`` on this thread as each one finishes.
+
+        Args:
+            documents: Documents with name and display_name
+            dry_run: Report what would be deleted without deleting
+            progress: Called with the document's outcome and the running summary
+
+        Returns:
+            Counts by outcome (deleted, not_found, failed, cancelled), retries, timing,
+            and removed_names: documents no longer in the corpus
+        """
+        documents = list(documents)
+        summary: Dict[str, Any] = {
+            "total": len(documents), "done": 0, "deleted": 0, "not_found": 0, "failed": 0, "cancelled": 0, "would_delete": 0,
+            "retries": 0, "dry_run": dry_run, "seconds": 0.0, "deletes_per_second": 0.0, "removed_names": [],
+        }
+        started = time.perf_counter()
+
+        def record(entry: Dict[str, Any]) -> None:
+            summary["done"] += 1
+            if entry["status"] in summary:
+                summary[entry["status"]] += 1
+            summary["retries"] += max(0, entry.get("attempts", 0) - 1)
+            if entry["status"] in ("deleted", "not_found"):
+                summary["removed_names"].append(entry["name"])
+            summary["seconds"] = round(time.perf_counter() - started, 3)
+            if summary["seconds"]:
+                summary["deletes_per_second"] = round(summary["deleted"] / summary["seconds"], 2)
+            if progress:
+                progress(entry, summary)
+
+        if dry_run:
+            for doc in documents:
+                record({"name": doc['name'], "display_name": doc.get('display_name', doc['name']), "status": "would_delete"})
+            return summary
+
+        self._stop.clear()
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="bulk-delete") as executor:
+            # Only a bounded number of deletes are queued at a time
+            remaining = iter(documents)
+            futures = {executor.submit(self._delete_one, doc) for doc in islice(remaining, 2 * self.max_workers)}
+            try:
+                while futures:
+                    finished, futures = wait(futures, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        record(future.result())
+                    if not self._stop.is_set():
+                        futures |= {executor.submit(self._delete_one, doc) for doc in islice(remaining, len(finished))}
+            except KeyboardInterrupt:
+                self.cancel()
+                for future in futures:
+                    record(future.result())
+        summary["cancelled"] += summary["total"] - summary["done"]
+        return summary
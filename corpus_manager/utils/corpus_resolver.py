@@ -0,0 +1,192 @@
+"""
+Corpus name resolution shared by the RAG Corpus Manager and the corpus-setup CLIs.
+Maps a corpus display name to its resource name with an in-process and an on-disk
+cache, so tools stop walking rag.list_corpora() on every start or Streamlit rerun.
+One scan caches every corpus in the project; names that are not found are cached
+for a short time (negative caching), and entries can be invalidated explicitly.
+A cached corpus is checked with one rag.get_corpus() call before it is handed
+out (at most once a minute per process); if it is gone, the name is resolved
+again with a fresh scan.
+"""
+
+import json
+import os
+from pathlib import Path
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from corpus_manager.utils.bulk_delete import is_not_found
+
+DEFAULT_CACHE_PATH = os.environ.get(
+    "CORPUS_RESOLVER_CACHE",
+    str(Path.home() / ".cache" / "report-card-rag" / "corpus_names.json"),
+)
+
+# Resource names rarely change; a corpus that is missing may be created soon
+POSITIVE_TTL = 24 * 3600  # seconds
+NEGATIVE_TTL = 300  # seconds
+# How long a check that a cached corpus still exists is trusted in one process
+VERIFY_TTL = 60  # seconds
+
+
+def _default_list_corpora() -> Iterable[Any]:
+    from vertexai import rag
+
+    return rag.list_corpora()
+
+
+def _default_get_corpus(name: str) -> Any:
+    from vertexai import rag
+
+    return rag.get_corpus(name=name)
+
+
+class CorpusResolver:
+    """Cached display name -> corpus resource name lookups."""
+
+    def __init__(
+        self,
+        cache_path: str = DEFAULT_CACHE_PATH,
+        positive_ttl: float = POSITIVE_TTL,
+        negative_ttl: float = NEGATIVE_TTL,
+        verify_ttl: float = VERIFY_TTL,
+        list_corpora: Optional[Callable[[], Iterable[Any]]] = None,
+        get_corpus: Optional[Callable[[str], Any]] = None,
+    ):
+        self.cache_path = Path(cache_path)
+        self.positive_ttl = positive_ttl
+        self.negative_ttl = negative_ttl
+        self.verify_ttl = verify_ttl
+        self.list_corpora = list_corpora or _default_list_corpora
+        self.get_corpus = get_corpus or _default_get_corpus
+        self.scans = 0
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None
+        # When each cached resource name was last confirmed to exist (monotonic)
+        self._verified: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(display_name: str, project: Optional[str], location: Optional[str]) -> str:
+        project = project or os.environ.get("GOOGLE_CLOUD_PROJECT", "")
+        location = location or os.environ.get("GOOGLE_CLOUD_LOCATION", "")
+        return f"{project}/{location}/{display_name}"
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if self._entries is None:
+            try:
+                self._entries = json.loads(self.cache_path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                self._entries = {}
+        return self._entries
+
+    def _save(self) -> None:
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            temporary = self.cache_path.with_name(f".{self.cache_path.name}.{os.getpid()}.tmp")
+            temporary.write_text(json.dumps(self._entries, indent=2), encoding="utf-8")
+            os.replace(temporary, self.cache_path)
+        except OSError:
+            pass  # the in-process cache still works
+
+    def _fresh(self, entry: Dict[str, Any]) -> bool:
+        ttl = self.positive_ttl if entry.get("name") else self.negative_ttl
+        return time.time() - entry.get("cached_at", 0) < ttl
+
+    def _exists(self, key: str, name: str) -> bool:
+        if time.monotonic() - self._verified.get(key, float("-inf")) < self.verify_ttl:
+            return True
+        try:
+            self.get_corpus(name)
+        except Exception as e:
+            if is_not_found(e):
+                return False
+            raise
+        self._verified[key] = time.monotonic()
+        return True
+
+    def resolve(
+        self,
+        display_name: str,
+        project: Optional[str] = None,
+        location: Optional[str] = None,
+        verify: bool = True,
+    ) -> Optional[str]:
+        """
+        Return the resource name for a corpus display name (or resource name), or None.
+
+        Args:
+            display_name: Corpus display name; resource names are returned as is
+            project: Project ID (defaults to GOOGLE_CLOUD_PROJECT)
+            location: Location (defaults to GOOGLE_CLOUD_LOCATION)
+            verify: Check that a cached corpus still exists, and resolve it
+                again if it was deleted
+        """
+        if not display_name:
+            return None
+        if display_name.startswith("projects/"):
+            return display_name
+
+        key = self._key(display_name, project, location)
+        with self._lock:
+            entry = self._load().get(key)
+            if entry is not None and self._fresh(entry):
+                if not (verify and entry["name"]) or self._exists(key, entry["name"]):
+                    return entry["name"]
+                # The cached corpus was deleted; fall through to a fresh scan
+
+            # One scan caches every corpus in the project
+            self.scans += 1
+            now = time.time()
+            prefix = key[: -len(display_name)]
+            scanned = {key: {"name": None, "cached_at": now}}
+            for corpus in self.list_corpora():
+                scanned[prefix + corpus.display_name] = {"name": corpus.name, "cached_at": now}
+                self._verified[prefix + corpus.display_name] = time.monotonic()
+            self._entries.update(scanned)
+            self._save()
+            return self._entries[key]["name"]
+
+    def remember(self, display_name: str, resource_name: str, project: Optional[str] = None, location: Optional[str] = None) -> None:
+        """Record a resource name, e.g., right after creating the corpus."""
+        with self._lock:
+            key = self._key(display_name, project, location)
+            self._load()[key] = {"name": resource_name, "cached_at": time.time()}
+            self._verified[key] = time.monotonic()
+            self._save()
+
+    def invalidate(self, display_name: Optional[str] = None, project: Optional[str] = None, location: Optional[str] = None) -> None:
+        """Forget one display name, or every cached name when none is given."""
+        with self._lock:
+            entries = self._load()
+            if display_name is None:
+                entries.clear()
+                self._verified.clear()
+            else:
+                key = self._key(display_name, project, location)
+                entries.pop(key, None)
+                self._verified.pop(key, None)
+            self._save()
+
+    def forget_if_missing(self, display_name: str, error: Exception, project: Optional[str] = None, location: Optional[str] = None) -> bool:
+        """Invalidate a name after a call failed because its corpus is gone; True if it was."""
+        if not is_not_found(error):
+            return False
+        self.invalidate(display_name, project, location)
+        return True
+
+
+_default_resolver: Optional[CorpusResolver] = None
+
+
+def get_corpus_resolver() -> CorpusResolver:
+    """Return the process-wide resolver using DEFAULT_CACHE_PATH."""
+    global _default_resolver
+    if _default_resolver is None:
+        _default_resolver = CorpusResolver()
+    return _default_resolver
+
+
+def resolve_corpus(display_name: str) -> Optional[str]:
+    """Resolve a corpus display name with the process-wide resolver."""
+    return get_corpus_resolver().resolve(display_name)
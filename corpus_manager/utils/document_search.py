@@ -0,0 +1,164 @@
+"""
+Search query parsing and name tokenizing for the RAG Corpus Manager.
+The indexes live in the metadata mirror: a trigram full-text index over
+document names, a term table for prefix and fuzzy matches, and indexed
+type, date and student columns, all updated as the mirror syncs.
+
+Query syntax (terms combine with AND):
+    report          names containing "report"
+    rpt*            names (or a word in them) starting with "rpt"
+    standrds~       names with a term within one or two typos of "standrds"
+    type:pdf        file type (also ext:)
+    date:2025-03    created in a month or on a day (also month:, created:)
+    student:emma    documents of an indexed student (partial names work)
+    student:"em jo" quote names of several words; each word is a prefix
+"""
+
+from dataclasses import dataclass, field
+import os
+import re
+import shlex
+from typing import Dict, Iterable, List, Optional, Set
+
+FIELD_ALIASES = {
+    "type": "file_types",
+    "ext": "file_types",
+    "date": "dates",
+    "month": "dates",
+    "created": "dates",
+    "student": "students",
+}
+
+# Terms for a document's student are stored with this prefix
+STUDENT_TERM_PREFIX = "student:"
+
+_WORD = re.compile(r"[^\W_]+")
+# Split "StandardsRptCard369401" into Standards, Rpt, Card, 369401
+_SUBWORD = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+")
+
+
+@dataclass
+class SearchQuery:
+    """A parsed search box query."""
+
+    substrings: List[str] = field(default_factory=list)
+    prefixes: List[str] = field(default_factory=list)
+    fuzzy: List[str] = field(default_factory=list)
+    file_types: List[str] = field(default_factory=list)
+    dates: List[str] = field(default_factory=list)
+    students: List[str] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return any((self.substrings, self.prefixes, self.fuzzy, self.file_types, self.dates, self.students))
+
+
+def parse_query(text: str) -> SearchQuery:
+    """Parse a search box query; quoted phrases stay together."""
+    query = SearchQuery()
+    if not text or not text.strip():
+        return query
+    try:
+        tokens = shlex.split(text)
+    except ValueError:
+        tokens = text.split()
+
+    for token in tokens:
+        name, _, value = token.partition(":")
+        if value and name.lower() in FIELD_ALIASES:
+            target = FIELD_ALIASES[name.lower()]
+            getattr(query, target).append(value.lower().lstrip(".") if target == "file_types" else value)
+        elif token.endswith("*") and token.rstrip("*"):
+            query.prefixes.append(token.rstrip("*").lower())
+        elif token.endswith("~") and token.rstrip("~"):
+            query.fuzzy.append(token.rstrip("~").lower())
+        else:
+            query.substrings.append(token)
+    return query
+
+
+def words(text: str) -> List[str]:
+    """Lowercase words and sub-words (camel case, digit runs) of a name."""
+    terms = []
+    for word in _WORD.findall(text or ""):
+        terms.append(word.lower())
+        parts = _SUBWORD.findall(word)
+        if len(parts) > 1:
+            terms.extend(part.lower() for part in parts)
+    return terms
+
+
+def name_terms(display_name: str, student: str = "") -> Set[str]:
+    """Index terms for a document: its whole name, its words and its student's name."""
+    # The whole name lets "report_1*" match names that start with it
+    terms = {display_name.lower()} | set(words(display_name))
+    terms.update(STUDENT_TERM_PREFIX + word for word in words(student))
+    return terms
+
+
+def indexed_students() -> Optional[Dict[str, str]]:
+    """Map report card file names to students from the records index, or None if it is unavailable."""
+    try:
+        from rag.shared_libraries.records_index import get_records_index
+
+        return {os.path.basename(row['source']): row['student'] for row in get_records_index().students()}
+    except Exception:
+        return None
+
+
+def max_typos(term: str) -> int:
+    """Edits allowed for a fuzzy term: none below 3 characters, one up to 5, then two."""
+    if len(term) < 3:
+        return 0
+    return 1 if len(term) <= 5 else 2
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Edit distance counting a swap of neighbours as one edit; ``limit + 1`` once past ``limit``."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2, previous = None, list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return min(previous[-1], limit + 1)
+
+
+def _grams(term: str) -> Set[str]:
+    padded = f"^{term}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class FuzzyVocabulary:
+    """Trigram index over the distinct terms, for typo-tolerant term lookups."""
+
+    def __init__(self, terms: Iterable[str]):
+        self._postings: Dict[str, List[str]] = {}
+        for term in terms:
+            for gram in _grams(term):
+                self._postings.setdefault(gram, []).append(term)
+
+    def expand(self, term: str) -> List[str]:
+        """Indexed terms within max_typos(term) edits of ``term``, closest first."""
+        limit = max_typos(term)
+        grams = _grams(term)
+        # Each edit changes at most three of the term's trigrams
+        needed = max(1, len(grams) - 3 * limit)
+        shared: Dict[str, int] = {}
+        for gram in grams:
+            for candidate in self._postings.get(gram, ()):
+                shared[candidate] = shared.get(candidate, 0) + 1
+
+        matches = []
+        for candidate, count in shared.items():
+            if count >= needed:
+                distance = edit_distance(term, candidate, limit)
+                if distance <= limit:
+                    matches.append((distance, candidate))
+        return [candidate for _, candidate in sorted(matches)]
@@ -0,0 +1,556 @@
+"""
+Local SQLite mirror of corpus document metadata for the RAG Corpus Manager.
+Pages read documents, counts and stats from the mirror with indexed sorts and
+filters instead of listing the corpus on every rerun; page() walks the sorted
+documents with opaque cursors, so a page costs the same however deep it is
+and however large the corpus grows. Searches run on a trigram full-text
+index of names and a term table (see document_search for the query syntax),
+which triggers and the sync keep in step with the documents. The mirror syncs
+page by page with list page tokens: rows are only rewritten when a file's
+update_time changed, files missing from a completed pass are removed, and an
+interrupted pass resumes from its saved page token.
+"""
+
+import base64
+from datetime import datetime
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from corpus_manager.utils.document_search import (
+    STUDENT_TERM_PREFIX, FuzzyVocabulary, name_terms, parse_query, words
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    name TEXT PRIMARY KEY,
+    corpus TEXT NOT NULL,
+    display_name TEXT NOT NULL,
+    file_type TEXT NOT NULL,
+    size_bytes INTEGER NOT NULL DEFAULT 0,
+    create_time TEXT,
+    update_time TEXT,
+    generation INTEGER NOT NULL DEFAULT 0,
+    student TEXT COLLATE NOCASE
+);
+CREATE INDEX IF NOT EXISTS documents_by_create_time ON documents (corpus, create_time);
+CREATE INDEX IF NOT EXISTS documents_by_update_time ON documents (corpus, update_time);
+CREATE INDEX IF NOT EXISTS documents_by_name ON documents (corpus, display_name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS documents_by_size ON documents (corpus, size_bytes);
+CREATE INDEX IF NOT EXISTS documents_by_type ON documents (corpus, file_type, create_time);
+CREATE TABLE IF NOT EXISTS sync_state (
+    corpus TEXT PRIMARY KEY,
+    generation INTEGER NOT NULL DEFAULT 0,
+    page_token TEXT,
+    completed_at REAL
+);
+"""
+
+# Bump to rebuild the search indexes of existing mirrors on open
+SEARCH_SCHEMA_VERSION = 2
+
+SEARCH_SCHEMA = """
+CREATE INDEX IF NOT EXISTS documents_by_student ON documents (corpus, student);
+CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5(
+    display_name, content='documents', content_rowid='rowid', tokenize='trigram'
+);
+CREATE TABLE IF NOT EXISTS document_terms (
+    term TEXT NOT NULL,
+    document INTEGER NOT NULL,
+    PRIMARY KEY (term, document)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS document_terms_by_document ON document_terms (document);
+CREATE TRIGGER IF NOT EXISTS documents_fts_insert AFTER INSERT ON documents BEGIN
+    INSERT INTO documents_fts (rowid, display_name) VALUES (new.rowid, new.display_name);
+END;
+CREATE TRIGGER IF NOT EXISTS documents_fts_delete AFTER DELETE ON documents BEGIN
+    INSERT INTO documents_fts (documents_fts, rowid, display_name) VALUES ('delete', old.rowid, old.display_name);
+    DELETE FROM document_terms WHERE document = old.rowid;
+END;
+CREATE TRIGGER IF NOT EXISTS documents_fts_update AFTER UPDATE OF display_name ON documents BEGIN
+    INSERT INTO documents_fts (documents_fts, rowid, display_name) VALUES ('delete', old.rowid, old.display_name);
+    INSERT INTO documents_fts (rowid, display_name) VALUES (new.rowid, new.display_name);
+END;
+"""
+
+SORT_COLUMNS = {
+    "create_time": "create_time",
+    "update_time": "update_time",
+    "display_name": "display_name COLLATE NOCASE",
+    "size_bytes": "size_bytes",
+}
+
+DEFAULT_PAGE_SIZE = 100
+
+ListFiles = Callable[..., Any]
+# Returns display name -> student for indexed report cards, or None if unknown
+StudentLookup = Callable[[], Optional[Dict[str, str]]]
+
+
+def _file_type(display_name: str) -> str:
+    return display_name.lower().split('.')[-1] if '.' in display_name else 'unknown'
+
+
+def _timestamp(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    # Fixed precision keeps the text sortable in time order
+    return value.isoformat(timespec='microseconds') if hasattr(value, 'isoformat') else str(value)
+
+
+def _parse_timestamp(value: Optional[str]) -> Any:
+    if value is None:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return value
+
+
+def _encode_cursor(value: Any, name: str) -> str:
+    return base64.urlsafe_b64encode(json.dumps([value, name]).encode("utf-8")).decode("ascii")
+
+
+def _decode_cursor(cursor: str) -> Tuple[Any, str]:
+    try:
+        value, name = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (ValueError, TypeError):
+        raise ValueError("Invalid page cursor") from None
+    return value, name
+
+
+def _after(column: str, descending: bool, value: Any) -> Tuple[str, List[Any]]:
+    """Condition for rows after (value, name) in ORDER BY column [DESC], name; SQLite sorts NULLs first."""
+    if value is None:
+        if descending:
+            return f"({column} IS NULL AND name > ?)", []
+        return f"({column} IS NOT NULL OR name > ?)", []
+    if descending:
+        return f"({column} < ? OR {column} IS NULL OR ({column} = ? AND name > ?))", [value, value]
+    return f"({column} > ? OR ({column} = ? AND name > ?))", [value, value]
+
+
+def _default_list_files(corpus_name: str, page_size: int, page_token: Optional[str]):
+    from vertexai.preview import rag
+
+    return rag.list_files(corpus_name=corpus_name, page_size=page_size, page_token=page_token)
+
+
+class CorpusMirror:
+    """SQLite copy of each corpus's file metadata, synced incrementally."""
+
+    def __init__(self, path: str, list_files: Optional[ListFiles] = None, students: Optional[StudentLookup] = None):
+        self.path = path
+        self.list_files = list_files or _default_list_files
+        self.students = students
+        self._local = threading.local()
+        # Reentrant: a sync restarts itself when a saved page token has expired
+        self._sync_lock = threading.RLock()
+        self._background: Optional[threading.Thread] = None
+        self.last_error: Optional[Exception] = None
+        # Bumped on every write; the fuzzy vocabulary is rebuilt when it moves
+        self._changes = 0
+        self._vocabulary: Optional[Tuple[int, FuzzyVocabulary]] = None
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connection() as connection:
+            connection.executescript(SCHEMA)
+            self._migrate(connection)
+
+    def _migrate(self, connection: sqlite3.Connection) -> None:
+        columns = {row["name"] for row in connection.execute("PRAGMA table_info(documents)")}
+        if "student" not in columns:
+            connection.execute("ALTER TABLE documents ADD COLUMN student TEXT COLLATE NOCASE")
+        connection.executescript(SEARCH_SCHEMA)
+        if connection.execute("PRAGMA user_version").fetchone()[0] < SEARCH_SCHEMA_VERSION:
+            # Index documents mirrored before search existed
+            connection.execute("INSERT INTO documents_fts (documents_fts) VALUES ('rebuild')")
+            connection.execute("DELETE FROM document_terms")
+            self._index_terms(connection, connection.execute("SELECT rowid, display_name, student FROM documents"))
+            connection.execute(f"PRAGMA user_version = {SEARCH_SCHEMA_VERSION}")
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite3 connections are not shareable across threads
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30)
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA journal_mode = WAL")
+            self._local.connection = connection
+        return connection
+
+    def _state(self, corpus: str) -> sqlite3.Row:
+        connection = self._connection()
+        with connection:
+            connection.execute("INSERT OR IGNORE INTO sync_state (corpus) VALUES (?)", (corpus,))
+        return connection.execute("SELECT * FROM sync_state WHERE corpus = ?", (corpus,)).fetchone()
+
+    def last_synced(self, corpus: str) -> Optional[float]:
+        """Time (epoch seconds) of the last completed sync, or None."""
+        return self._state(corpus)["completed_at"]
+
+    def is_due(self, corpus: str, ttl: float) -> bool:
+        """True if the last completed sync is older than ``ttl`` seconds or a pass is unfinished."""
+        state = self._state(corpus)
+        if state["page_token"]:
+            return True
+        return state["completed_at"] is None or time.time() - state["completed_at"] >= ttl
+
+    def _index_terms(self, connection: sqlite3.Connection, rows: Iterable[Tuple[int, str, Optional[str]]]) -> None:
+        """Replace the search terms of (rowid, display_name, student) rows."""
+        rows = list(rows)
+        connection.executemany("DELETE FROM document_terms WHERE document = ?", [(row[0],) for row in rows])
+        connection.executemany(
+            "INSERT OR IGNORE INTO document_terms (term, document) VALUES (?, ?)",
+            [(term, row[0]) for row in rows for term in name_terms(row[1], row[2] or "")],
+        )
+        self._changes += 1
+
+    @staticmethod
+    def _select_by_name(connection: sqlite3.Connection, columns: str, names: List[str]) -> List[tuple]:
+        rows = []
+        # Stay under SQLite's bound-parameter limit
+        for start in range(0, len(names), 500):
+            chunk = names[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows.extend(tuple(row) for row in connection.execute(
+                f"SELECT {columns} FROM documents WHERE name IN ({placeholders})", chunk
+            ))
+        return rows
+
+    def _apply_page(self, corpus: str, generation: int, files: List[Any]) -> Dict[str, int]:
+        rows = {}
+        for file in files:
+            display_name = getattr(file, 'display_name', None) or 'Unknown'
+            name = getattr(file, 'name', None) or display_name
+            rows[name] = (
+                name,
+                corpus,
+                display_name,
+                _file_type(display_name),
+                int(getattr(file, 'size_bytes', 0) or 0),
+                _timestamp(getattr(file, 'create_time', None)),
+                _timestamp(getattr(file, 'update_time', None)),
+                generation,
+            )
+        connection = self._connection()
+        names = list(rows)
+        known = dict(self._select_by_name(connection, "name, update_time", names))
+
+        changed = [row for name, row in rows.items() if name not in known or known[name] != row[6]]
+        unchanged = [(generation, name) for name in names if name in known and known[name] == rows[name][6]]
+        with connection:
+            # An upsert (not REPLACE) so the full-text triggers see updates
+            connection.executemany(
+                "INSERT INTO documents"
+                " (name, corpus, display_name, file_type, size_bytes, create_time, update_time, generation)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT (name) DO UPDATE SET corpus = excluded.corpus, display_name = excluded.display_name,"
+                " file_type = excluded.file_type, size_bytes = excluded.size_bytes, create_time = excluded.create_time,"
+                " update_time = excluded.update_time, generation = excluded.generation",
+                changed,
+            )
+            connection.executemany("UPDATE documents SET generation = ? WHERE name = ?", unchanged)
+            if changed:
+                self._index_terms(connection, self._select_by_name(
+                    connection, "rowid, display_name, student", [row[0] for row in changed]
+                ))
+        return {"upserted": len(changed), "unchanged": len(unchanged)}
+
+    def sync(self, corpus: str, page_size: int = DEFAULT_PAGE_SIZE, max_pages: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Sync the mirror with the corpus, page by page.
+
+        Args:
+            corpus: Corpus resource name
+            page_size: Files requested per list page
+            max_pages: Stop after this many pages; the next call resumes from the saved token
+
+        Returns:
+            Pages read, rows upserted, unchanged and removed, and whether the pass completed
+        """
+        with self._sync_lock:
+            state = self._state(corpus)
+            connection = self._connection()
+            generation, token = state["generation"], state["page_token"]
+            if not token:
+                # A new pass: files not seen in it are removed at the end
+                generation += 1
+                with connection:
+                    connection.execute("UPDATE sync_state SET generation = ? WHERE corpus = ?", (generation, corpus))
+
+            result = {"pages": 0, "upserted": 0, "unchanged": 0, "removed": 0, "complete": False}
+            try:
+                pages = self.list_files(corpus, page_size, token).pages
+                page = next(pages, None)
+            except Exception:
+                if not token:
+                    raise
+                # An expired page token: start the pass over
+                with connection:
+                    connection.execute("UPDATE sync_state SET page_token = NULL WHERE corpus = ?", (corpus,))
+                return self.sync(corpus, page_size, max_pages)
+
+            while page is not None:
+                counts = self._apply_page(corpus, generation, list(page.rag_files))
+                result["pages"] += 1
+                result["upserted"] += counts["upserted"]
+                result["unchanged"] += counts["unchanged"]
+                token = page.next_page_token or None
+                with connection:
+                    connection.execute("UPDATE sync_state SET page_token = ? WHERE corpus = ?", (token, corpus))
+                if not token or (max_pages and result["pages"] >= max_pages):
+                    break
+                page = next(pages, None)
+
+            if not token:
+                with connection:
+                    cursor = connection.execute(
+                        "DELETE FROM documents WHERE corpus = ? AND generation < ?", (corpus, generation)
+                    )
+                    connection.execute(
+                        "UPDATE sync_state SET completed_at = ? WHERE corpus = ?", (time.time(), corpus)
+                    )
+                result["removed"] = cursor.rowcount
+                result["complete"] = True
+                self._changes += 1
+                students = self.students() if self.students else None
+                if students is not None:
+                    result["students_tagged"] = self.tag_students(corpus, students)
+                if result["upserted"] or result["removed"] or result.get("students_tagged"):
+                    # Fresh statistics let searches start from the most selective index
+                    with connection:
+                        connection.execute("PRAGMA analysis_limit = 1000")
+                        connection.execute("ANALYZE")
+            return result
+
+    def sync_in_background(self, corpus: str, ttl: float) -> bool:
+        """
+        Start a sync on a background thread if one is due and none is running.
+
+        Returns:
+            True if a sync was started
+        """
+        if not self.is_due(corpus, ttl) or (self._background and self._background.is_alive()):
+            return False
+
+        def run():
+            try:
+                self.sync(corpus)
+                self.last_error = None
+            except Exception as e:
+                self.last_error = e
+
+        self._background = threading.Thread(target=run, name="corpus-mirror-sync", daemon=True)
+        self._background.start()
+        return True
+
+    def remove(self, names: List[str]) -> int:
+        """Drop documents (e.g., right after deleting them from the corpus)."""
+        with self._connection() as connection:
+            cursor = connection.executemany("DELETE FROM documents WHERE name = ?", [(name,) for name in names])
+        self._changes += 1
+        return cursor.rowcount
+
+    def tag_students(self, corpus: str, students: Dict[str, str]) -> int:
+        """
+        Record which student each document belongs to, for student: searches.
+
+        Args:
+            corpus: Corpus resource name
+            students: Display name -> student; documents not listed lose their tag
+
+        Returns:
+            Number of documents whose student changed
+        """
+        connection = self._connection()
+        retag = [
+            (students.get(display_name), rowid, display_name)
+            for rowid, display_name, student in connection.execute(
+                "SELECT rowid, display_name, student FROM documents WHERE corpus = ?", (corpus,)
+            )
+            if students.get(display_name) != student
+        ]
+        if retag:
+            with connection:
+                connection.executemany("UPDATE documents SET student = ? WHERE rowid = ?", [row[:2] for row in retag])
+                self._index_terms(connection, [(rowid, display_name, student) for student, rowid, display_name in retag])
+        return len(retag)
+
+    def mark_stale(self, corpus: str) -> None:
+        """Make the next sync check run, e.g., after an upload."""
+        self._state(corpus)
+        with self._connection() as connection:
+            connection.execute("UPDATE sync_state SET completed_at = NULL WHERE corpus = ?", (corpus,))
+
+    def _where(self, corpus: str, search: str, file_type: Optional[str]):
+        clauses, parameters = ["corpus = ?"], [corpus]
+        query = parse_query(search)
+        for text in query.substrings:
+            if len(text) >= 3:
+                # Trigram index: any substring of three or more characters
+                clauses.append("rowid IN (SELECT rowid FROM documents_fts WHERE documents_fts MATCH ?)")
+                parameters.append('"' + text.replace('"', '""') + '"')
+            else:
+                clauses.append("display_name LIKE ? ESCAPE '\\'")
+                escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+                parameters.append(f"%{escaped}%")
+        for prefix in query.prefixes:
+            clauses.append("rowid IN (SELECT document FROM document_terms WHERE term >= ? AND term < ?)")
+            parameters += [prefix, prefix + "\uffff"]
+        for term in query.fuzzy:
+            matches = self._fuzzy_vocabulary().expand(term) or [term]
+            clauses.append(f"rowid IN (SELECT document FROM document_terms WHERE term IN ({','.join('?' * len(matches))}))")
+            parameters += matches
+        for student in query.students:
+            # Every word of the name, each as a prefix. The name must be quoted to
+            # hold several words: student:"em jo" finds Emma Jones, while
+            # student:em jo is student:em plus a separate name search for "jo"
+            for word in words(student):
+                clauses.append("rowid IN (SELECT document FROM document_terms WHERE term >= ? AND term < ?)")
+                parameters += [STUDENT_TERM_PREFIX + word, STUDENT_TERM_PREFIX + word + "\uffff"]
+        if query.file_types:
+            # type:pdf type:txt means either
+            clauses.append(f"file_type IN ({','.join('?' * len(query.file_types))})")
+            parameters += query.file_types
+        if file_type:
+            clauses.append("file_type = ?")
+            parameters.append(file_type.lower())
+        for value in query.dates:
+            # ISO timestamps sort as text, so a day or month is a range on the index
+            clauses.append("create_time >= ? AND create_time < ?")
+            parameters += [value, value + "~"]
+        return " AND ".join(clauses), parameters
+
+    def _fuzzy_vocabulary(self) -> FuzzyVocabulary:
+        cached = self._vocabulary
+        if cached is None or cached[0] != self._changes:
+            changes = self._changes
+            terms = [row[0] for row in self._connection().execute("SELECT DISTINCT term FROM document_terms")]
+            cached = self._vocabulary = (changes, FuzzyVocabulary(
+                # Words only: not student terms or whole names
+                term for term in terms if term.isalnum()
+            ))
+        return cached[1]
+
+    def documents(
+        self,
+        corpus: str,
+        search: str = "",
+        file_type: Optional[str] = None,
+        sort_by: str = "create_time",
+        descending: bool = True,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> List[Dict[str, Any]]:
+        """
+        Documents in the mirror, in the same shape the corpus listing used.
+
+        Args:
+            corpus: Corpus resource name
+            search: Case-insensitive substring of the display name
+            file_type: Only files with this extension (e.g., "pdf")
+            sort_by: create_time, update_time, display_name or size_bytes
+            descending: Sort order
+            limit: Maximum rows (all by default)
+            offset: Rows to skip, for paging
+        """
+        where, parameters = self._where(corpus, search, file_type)
+        query = f"SELECT * FROM documents WHERE {where} ORDER BY {self._order(sort_by, descending)}"
+        if limit is not None:
+            query += " LIMIT ? OFFSET ?"
+            parameters += [limit, offset]
+        return [self._document(row) for row in self._connection().execute(query, parameters)]
+
+    def page(
+        self,
+        corpus: str,
+        cursor: Optional[str] = None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        search: str = "",
+        file_type: Optional[str] = None,
+        sort_by: str = "create_time",
+        descending: bool = True,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        One page of documents, continuing after ``cursor``.
+
+        Pages seek through the sort index from the cursor instead of skipping
+        rows, so every page costs the same.
+
+        Args:
+            corpus: Corpus resource name
+            cursor: Cursor returned with the previous page (None for the first page)
+            limit: Documents per page
+            search: Case-insensitive substring of the display name
+            file_type: Only files with this extension (e.g., "pdf")
+            sort_by: create_time, update_time, display_name or size_bytes
+            descending: Sort order; a cursor is only valid with the sort it came from
+
+        Returns:
+            The page's documents and the cursor of the next page (None on the last page)
+        """
+        where, parameters = self._where(corpus, search, file_type)
+        order = self._order(sort_by, descending)
+        if cursor:
+            value, name = _decode_cursor(cursor)
+            condition, values = _after(SORT_COLUMNS[sort_by], descending, value)
+            where += f" AND {condition}"
+            parameters += values + [name]
+        # One extra row tells whether another page follows
+        rows = self._connection().execute(
+            f"SELECT * FROM documents WHERE {where} ORDER BY {order} LIMIT ?", parameters + [limit + 1]
+        ).fetchall()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = _encode_cursor(rows[-1][sort_by], rows[-1]["name"])
+        return [self._document(row) for row in rows], next_cursor
+
+    @staticmethod
+    def _order(sort_by: str, descending: bool) -> str:
+        if sort_by not in SORT_COLUMNS:
+            raise ValueError(f"Cannot sort by '{sort_by}'. Choose from: {', '.join(SORT_COLUMNS)}")
+        return f"{SORT_COLUMNS[sort_by]} {'DESC' if descending else 'ASC'}, name"
+
+    @staticmethod
+    def _document(row: sqlite3.Row) -> Dict[str, Any]:
+        return {
+            'name': row['name'],
+            'display_name': row['display_name'],
+            'size_bytes': row['size_bytes'],
+            'create_time': _parse_timestamp(row['create_time']),
+            'update_time': _parse_timestamp(row['update_time']),
+        }
+
+    def file_types(self, corpus: str) -> List[str]:
+        """Distinct file extensions in the corpus."""
+        return [row[0] for row in self._connection().execute(
+            "SELECT DISTINCT file_type FROM documents WHERE corpus = ? ORDER BY file_type", (corpus,)
+        )]
+
+    def count(self, corpus: str, search: str = "", file_type: Optional[str] = None) -> int:
+        """Number of documents matching the filters."""
+        where, parameters = self._where(corpus, search, file_type)
+        return self._connection().execute(f"SELECT COUNT(*) FROM documents WHERE {where}", parameters).fetchone()[0]
+
+    def stats(self, corpus: str) -> Dict[str, Any]:
+        """Corpus statistics in the shape of get_corpus_stats, computed in SQL."""
+        connection = self._connection()
+        total, size, latest = connection.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0), MAX(create_time) FROM documents WHERE corpus = ?",
+            (corpus,),
+        ).fetchone()
+        file_types = dict(connection.execute(
+            "SELECT file_type, COUNT(*) FROM documents WHERE corpus = ? GROUP BY file_type ORDER BY COUNT(*) DESC",
+            (corpus,),
+        ).fetchall())
+        return {
+            'total_documents': total,
+            'total_size': size,
+            'file_types': file_types,
+            'latest_upload': _parse_timestamp(latest),
+        }
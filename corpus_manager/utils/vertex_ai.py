@@ -5,7 +5,7 @@ Handles corpus operations and document management.
 
 import os
 import streamlit as st
-from typing import List, Dict, Optional, Tuple
+from typing import Callable, List, Dict, Optional, Tuple
 import json
 import time
 import tempfile
@@ -16,7 +16,14 @@ import vertexai
 from vertexai.preview import rag
 from google.cloud import aiplatform
 
-from corpus_manager.config import PROJECT_ID, LOCATION, RAG_CORPUS_NAME, UPLOAD_CHUNK_SIZE, UPLOAD_CHUNK_OVERLAP
+from corpus_manager.config import (
+    PROJECT_ID, LOCATION, RAG_CORPUS_NAME, UPLOAD_CHUNK_SIZE, UPLOAD_CHUNK_OVERLAP, CACHE_TTL, CORPUS_MIRROR_DB,
+    DOCUMENTS_PER_PAGE, BULK_DELETE_WORKERS, BULK_DELETE_RATE
+)
+from corpus_manager.utils.bulk_delete import BulkDeleteJob
+from corpus_manager.utils.corpus_resolver import get_corpus_resolver
+from corpus_manager.utils.document_search import indexed_students
+from corpus_manager.utils.metadata_mirror import CorpusMirror
 
 
 @st.cache_resource
@@ -31,53 +38,113 @@ def initialize_vertex_ai():
 
 
 def find_corpus() -> Optional[str]:
-    """Find the corpus resource name."""
+    """Find the corpus resource name (cached and checked to exist; see corpus_resolver)."""
     try:
-        # If RAG_CORPUS_NAME is already a full path (starts with 'projects/'), use it directly
-        if RAG_CORPUS_NAME and RAG_CORPUS_NAME.startswith('projects/'):
-            return RAG_CORPUS_NAME
-        
-        # Otherwise, try to find by display name
-        corpora = rag.list_corpora()
-        for corpus in corpora:
-            if corpus.display_name == RAG_CORPUS_NAME:
-                return corpus.name
-        return None
+        return get_corpus_resolver().resolve(RAG_CORPUS_NAME)
     except Exception as e:
         st.error(f"Error finding corpus: {str(e)}")
         return None
 
 
-@st.cache_data(ttl=60)
-def get_corpus_documents(corpus_resource_name: str) -> List[Dict]:
-    """Get list of documents in the corpus with caching."""
+@st.cache_resource
+def get_corpus_mirror() -> CorpusMirror:
+    """Shared local metadata mirror for all sessions."""
+    return CorpusMirror(CORPUS_MIRROR_DB, students=indexed_students)
+
+
+def get_corpus_documents(
+    corpus_resource_name: str,
+    search: str = "",
+    file_type: Optional[str] = None,
+    sort_by: str = "create_time",
+    descending: bool = True,
+    limit: Optional[int] = None,
+    offset: int = 0,
+) -> List[Dict]:
+    """Get documents in the corpus from the local metadata mirror (newest first by default)."""
+    return _synced_mirror(corpus_resource_name).documents(
+        corpus_resource_name,
+        search=search,
+        file_type=file_type,
+        sort_by=sort_by,
+        descending=descending,
+        limit=limit,
+        offset=offset,
+    )
+
+
+def get_corpus_document_page(
+    corpus_resource_name: str,
+    cursor: Optional[str] = None,
+    page_size: int = DOCUMENTS_PER_PAGE,
+    search: str = "",
+    file_type: Optional[str] = None,
+    sort_by: str = "create_time",
+    descending: bool = True,
+) -> Tuple[List[Dict], Optional[str]]:
+    """Get one page of documents and the cursor of the next page (None on the last page)."""
+    return _synced_mirror(corpus_resource_name).page(
+        corpus_resource_name,
+        cursor=cursor,
+        limit=page_size,
+        search=search,
+        file_type=file_type,
+        sort_by=sort_by,
+        descending=descending,
+    )
+
+
+def count_corpus_documents(corpus_resource_name: str, search: str = "", file_type: Optional[str] = None) -> int:
+    """Count the mirrored documents matching the filters."""
+    return get_corpus_mirror().count(corpus_resource_name, search=search, file_type=file_type)
+
+
+def get_corpus_file_types(corpus_resource_name: str) -> List[str]:
+    """File extensions present in the corpus."""
+    return get_corpus_mirror().file_types(corpus_resource_name)
+
+
+def get_mirrored_corpus_stats(corpus_resource_name: str) -> Dict:
+    """Corpus statistics computed from the metadata mirror without loading every document."""
+    return _synced_mirror(corpus_resource_name).stats(corpus_resource_name)
+
+
+def _synced_mirror(corpus_resource_name: str) -> CorpusMirror:
+    """Return the mirror, filling it on first use and refreshing it in the background after."""
+    mirror = get_corpus_mirror()
     try:
-        files = rag.list_files(corpus_name=corpus_resource_name)
-        documents = []
-        
-        for file in files:
-            doc_info = {
-                'name': getattr(file, 'name', 'Unknown'),
-                'display_name': getattr(file, 'display_name', 'Unknown'),
-                'size_bytes': getattr(file, 'size_bytes', 0),
-                'create_time': getattr(file, 'create_time', None),
-                'update_time': getattr(file, 'update_time', None),
-            }
-            documents.append(doc_info)
-        
-        # Sort by creation time (newest first)
-        documents.sort(key=lambda x: x['create_time'] or datetime.min, reverse=True)
-        return documents
-    
+        if mirror.last_synced(corpus_resource_name) is None and not mirror.count(corpus_resource_name):
+            # First run: fill the mirror before showing anything
+            mirror.sync(corpus_resource_name)
+        else:
+            # Serve the mirror now; refresh it off the render path
+            mirror.sync_in_background(corpus_resource_name, ttl=CACHE_TTL)
     except Exception as e:
+        _forget_missing_corpus(e)
         st.error(f"Error retrieving documents: {str(e)}")
-        return []
+    if mirror.last_error:
+        _forget_missing_corpus(mirror.last_error)
+        st.warning(f"Showing cached document list; last sync failed: {mirror.last_error}")
+    return mirror
+
+
+def _forget_missing_corpus(error: Exception) -> None:
+    """If the corpus was deleted, drop its cached name so the next rerun resolves it again."""
+    if get_corpus_resolver().forget_if_missing(RAG_CORPUS_NAME, error):
+        st.info("The corpus no longer exists under its cached name; reload the page to look it up again.")
+
+
+def refresh_corpus_documents(corpus_resource_name: str) -> Dict:
+    """Sync the metadata mirror with the corpus now and re-resolve the corpus name next time."""
+    get_corpus_resolver().invalidate(RAG_CORPUS_NAME)
+    return get_corpus_mirror().sync(corpus_resource_name)
 
 
 def delete_document(document_name: str, display_name: str) -> bool:
     """Delete a document from the corpus."""
     try:
         rag.delete_file(name=document_name)
+        get_corpus_mirror().remove([document_name])
         return True
     except Exception as e:
         st.error(f"Error deleting document '{display_name}': {str(e)}")
@@ -102,6 +169,10 @@ def upload_document(uploaded_file, corpus_resource_name: str) -> bool:
         
         # Clean up
         os.unlink(tmp_path)
+        
+        # Pick up the new file in the mirror
+        get_corpus_mirror().mark_stale(corpus_resource_name)
+        get_corpus_mirror().sync(corpus_resource_name)
         return True
         
     except Exception as e:
@@ -140,21 +211,35 @@ def get_corpus_stats(documents: List[Dict]) -> Dict:
     }
 
 
-def bulk_delete_documents(document_names: List[str], display_names: List[str]) -> Dict[str, int]:
-    """Delete multiple documents from the corpus."""
-    deleted_count = 0
-    failed_count = 0
+def bulk_delete_documents(
+    document_names: List[str],
+    display_names: List[str],
+    progress: Optional[Callable[[Dict, Dict], None]] = None,
+    dry_run: bool = False,
+) -> Dict[str, int]:
+    """Delete multiple documents concurrently within the configured rate limit."""
+    job = BulkDeleteJob(max_workers=BULK_DELETE_WORKERS, rate=BULK_DELETE_RATE)
+    documents = [{'name': name, 'display_name': display_name} for name, display_name in zip(document_names, display_names)]
+    failures = []
     
-    for doc_name, display_name in zip(document_names, display_names):
-        try:
-            rag.delete_file(name=doc_name)
-            deleted_count += 1
-        except Exception as e:
-            st.error(f"Failed to delete {display_name}: {str(e)}")
-            failed_count += 1
+    def report(entry, summary):
+        if entry['status'] == 'failed':
+            failures.append(entry)
+        if progress:
+            progress(entry, summary)
+    
+    summary = job.run(documents, dry_run=dry_run, progress=report)
+    
+    for entry in failures:
+        st.error(f"Failed to delete {entry['display_name']}: {entry['error']}")
+    if summary['removed_names']:
+        get_corpus_mirror().remove(summary['removed_names'])
     
     return {
-        'deleted': deleted_count,
-        'failed': failed_count,
-        'total': len(document_names)
-    } 
\ No newline at end of file
+        'deleted': summary['deleted'] + summary['not_found'],
+        'failed': summary['failed'] + summary['cancelled'],
+        'total': summary['total'],
+        'would_delete': summary['would_delete'],
+        'retries': summary['retries'],
+        'seconds': summary['seconds']
+    }
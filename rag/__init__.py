@@ -14,10 +14,18 @@
 
 """Initializes the RAG agent package following ADK best practices."""
 
-from .agent import root_agent
+import importlib
 
 # Ensure the root_agent is explicitly available for ADK discovery.
-# This is a common pattern, though ADK might also find it via introspection
-# into the 'rag.agent' module if this __init__.py were simpler or empty.
-# However, being explicit is often clearer.
-__all__ = ["root_agent"] 
\ No newline at end of file
+# The agent tree is built on first access (ADK reads ``rag.agent.root_agent``),
+# so offline libraries under rag.shared_libraries can be imported without
+# RAG_CORPUS or Vertex AI credentials.
+__all__ = ["root_agent"]
+
+
+def __getattr__(name):
+    if name == "agent":
+        return importlib.import_module(f"{__name__}.agent")
+    if name == "root_agent":
+        return importlib.import_module(f"{__name__}.agent").root_agent
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,292 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Versioned analysis store backed by session state.
+
+Every tool or agent that records an analysis goes through this module, so
+``state["analysis_results"]`` always holds records of one shape:
+
+    {"type", "content", "data", "version", "timestamp", "source", "digest"}
+
+Each write bumps a monotonic store version. Readers remember the version
+they last saw and call ``changed_since`` to rebuild only what changed;
+``subscribe`` registers in-process listeners for change notifications.
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime
+import hashlib
+import json
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.sessions.state import State
+
+logger = logging.getLogger(__name__)
+
+ANALYSIS_RESULTS_KEY = "analysis_results"
+ANALYSIS_VERSION_KEY = "analysis_results_version"
+
+# Agent output keys that carry an analysis, mapped to their analysis type
+OUTPUT_KEY_ANALYSIS_TYPES = {
+    "identified_weaknesses": "weakness_analysis",
+    "research_findings": "solution_research",
+    "personalized_plan": "study_plan",
+    "retrieved_data": "data_retrieval",
+}
+
+AnalysisListener = Callable[[str, Optional["AnalysisRecord"], Any], None]
+_listeners: List[AnalysisListener] = []
+
+
+@dataclass
+class AnalysisRecord:
+    """A single stored analysis."""
+
+    analysis_type: str
+    content: str
+    data: Dict[str, Any] = field(default_factory=dict)
+    version: int = 0
+    timestamp: str = ""
+    source: str = ""
+    digest: str = ""
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "type": self.analysis_type,
+            "content": self.content,
+            "data": self.data,
+            "version": self.version,
+            "timestamp": self.timestamp,
+            "source": self.source,
+            "digest": self.digest,
+        }
+
+    @classmethod
+    def from_dict(cls, analysis_type: str, raw: Any) -> "AnalysisRecord":
+        """Build a record from stored state, including pre-store record shapes."""
+        if not isinstance(raw, dict):
+            content = str(raw)
+            return cls(analysis_type, content, digest=_digest(content, {}))
+
+        if "version" in raw and "digest" in raw:
+            return cls(
+                analysis_type=raw.get("type", analysis_type),
+                content=raw.get("content", ""),
+                data=raw.get("data") or {},
+                version=raw.get("version", 0),
+                timestamp=raw.get("timestamp", ""),
+                source=raw.get("source", ""),
+                digest=raw["digest"],
+            )
+
+        data = {k: v for k, v in raw.items() if k not in ("content", "result", "timestamp", "type")}
+        content = raw.get("content") or raw.get("result") or render_data(data)
+        return cls(
+            analysis_type=analysis_type,
+            content=str(content),
+            data=data,
+            timestamp=raw.get("timestamp", ""),
+            digest=_digest(str(content), data),
+        )
+
+
+def _digest(content: str, data: Dict[str, Any]) -> str:
+    payload = json.dumps([content, data], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def render_data(data: Dict[str, Any]) -> str:
+    """Render structured analysis data as Markdown once, at write time."""
+    lines = []
+    for key, value in data.items():
+        label = str(key).replace("_", " ").title()
+        if isinstance(value, (list, tuple)):
+            lines.append(f"**{label}:**")
+            lines.extend(f"- {item}" for item in value)
+        elif isinstance(value, dict):
+            lines.append(f"**{label}:**")
+            lines.extend(f"- {str(k).replace('_', ' ').title()}: {v}" for k, v in value.items())
+        else:
+            lines.append(f"**{label}:** {value}")
+    return "\n".join(lines)
+
+
+def subscribe(listener: AnalysisListener) -> None:
+    """Register a listener called as ``listener(analysis_type, record, state)`` on every change.
+
+    ``record`` is None when the analysis was removed.
+    """
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+
+def unsubscribe(listener: AnalysisListener) -> None:
+    """Remove a previously registered listener."""
+    if listener in _listeners:
+        _listeners.remove(listener)
+
+
+def _notify(analysis_type: str, record: Optional[AnalysisRecord], state: Any) -> None:
+    for listener in list(_listeners):
+        try:
+            listener(analysis_type, record, state)
+        except Exception:
+            # A failing listener must not break the write, but should be visible in the server logs
+            logger.exception("Analysis listener failed for '%s'", analysis_type)
+
+
+def current_version(state: State | dict[str, Any]) -> int:
+    """Return the store version; it increases on every write or removal."""
+    return state.get(ANALYSIS_VERSION_KEY, 0)
+
+
+def _bump_version(state: State | dict[str, Any]) -> int:
+    version = current_version(state) + 1
+    state[ANALYSIS_VERSION_KEY] = version
+    return version
+
+
+def put_analysis(
+    state: State | dict[str, Any],
+    analysis_type: str,
+    content: str = "",
+    data: Optional[Dict[str, Any]] = None,
+    source: str = "",
+) -> AnalysisRecord:
+    """
+    Store or replace an analysis.
+
+    Writing identical content and data again is a no-op and keeps the
+    existing version, so readers do not rebuild anything.
+
+    Args:
+        state: The session state
+        analysis_type: Type of analysis (e.g., 'weakness_analysis', 'study_plan')
+        content: Markdown/text form of the analysis; rendered from ``data`` if empty
+        data: Optional structured payload
+        source: Name of the tool or agent writing the record
+
+    Returns:
+        The stored record
+    """
+    data = dict(data or {})
+    content = str(content) if content else render_data(data)
+    digest = _digest(content, data)
+
+    existing = get_analysis(state, analysis_type)
+    if existing is not None and existing.digest == digest and existing.version:
+        return existing
+
+    record = AnalysisRecord(
+        analysis_type=analysis_type,
+        content=content,
+        data=data,
+        version=_bump_version(state),
+        timestamp=str(datetime.now()),
+        source=source,
+        digest=digest,
+    )
+
+    # Reassign the top-level key so ADK records the change in the state delta
+    results = dict(state.get(ANALYSIS_RESULTS_KEY, {}))
+    results[analysis_type] = record.to_dict()
+    state[ANALYSIS_RESULTS_KEY] = results
+
+    _notify(analysis_type, record, state)
+    return record
+
+
+def get_analysis(state: State | dict[str, Any], analysis_type: str) -> Optional[AnalysisRecord]:
+    """Return the stored record for an analysis type, or None."""
+    raw = state.get(ANALYSIS_RESULTS_KEY, {}).get(analysis_type)
+    if raw is None:
+        return None
+    return AnalysisRecord.from_dict(analysis_type, raw)
+
+
+def list_analyses(state: State | dict[str, Any]) -> List[AnalysisRecord]:
+    """Return all stored records in the order they were stored."""
+    return [
+        AnalysisRecord.from_dict(analysis_type, raw)
+        for analysis_type, raw in state.get(ANALYSIS_RESULTS_KEY, {}).items()
+    ]
+
+
+def changed_since(state: State | dict[str, Any], version: int) -> List[AnalysisRecord]:
+    """Return the records written after the given store version."""
+    return [record for record in list_analyses(state) if record.version > version]
+
+
+def remove_analysis(state: State | dict[str, Any], analysis_type: str) -> bool:
+    """
+    Remove an analysis from the store.
+
+    Args:
+        state: The session state
+        analysis_type: Type of analysis to remove
+
+    Returns:
+        True if the analysis existed
+    """
+    results = state.get(ANALYSIS_RESULTS_KEY, {})
+    if analysis_type not in results:
+        return False
+
+    results = dict(results)
+    del results[analysis_type]
+    state[ANALYSIS_RESULTS_KEY] = results
+    _bump_version(state)
+
+    _notify(analysis_type, None, state)
+    return True
+
+
+def sync_output_key(state: State | dict[str, Any], output_key: str, analysis_type: str) -> Optional[AnalysisRecord]:
+    """
+    Copy an agent's output_key value into the store.
+
+    Records written explicitly by tools take precedence; the output is only
+    stored when no record exists or the existing one came from this output key.
+    """
+    value = state.get(output_key)
+    if not value:
+        return None
+
+    source = f"output_key:{output_key}"
+    existing = get_analysis(state, analysis_type)
+    if existing is not None and existing.source != source:
+        return existing
+
+    return put_analysis(state, analysis_type, content=str(value), source=source)
+
+
+def output_key_recorder(output_key: str) -> Callable[[CallbackContext], None]:
+    """
+    Build an after_agent_callback that records the agent's output in the store.
+
+    Args:
+        output_key: The agent's output_key (see OUTPUT_KEY_ANALYSIS_TYPES)
+
+    Returns:
+        A callback suitable for ``Agent(after_agent_callback=...)``
+    """
+    analysis_type = OUTPUT_KEY_ANALYSIS_TYPES[output_key]
+
+    def record_output(callback_context: CallbackContext):
+        sync_output_key(callback_context.state, output_key, analysis_type)
+        return None
+
+    return record_output
@@ -0,0 +1,266 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Content-addressed store for rendered artifacts (e.g., exported PDFs).
+
+Artifacts are keyed by a SHA-256 of everything that determines their bytes
+(report content, template version, ...), so an identical export is served
+from disk instead of being rendered again. Each artifact lives in
+``<root>/<key[:2]>/<key>/`` and its directory's modification time records
+the last access. Garbage collection evicts artifacts older than the maximum
+age, then the least recently used ones until the store fits its size
+budget; it runs automatically when a write takes the store over budget.
+Hit, write and eviction counters are kept in ``<root>/metrics.json`` so
+stats() covers every process that used the store, not just this one.
+"""
+
+import atexit
+from dataclasses import dataclass, fields
+import hashlib
+import json
+import os
+from pathlib import Path
+import shutil
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+DEFAULT_STORE_DIR = os.environ.get(
+    "ARTIFACT_STORE_DIR",
+    str(Path.home() / ".cache" / "report-card-rag" / "artifacts"),
+)
+DEFAULT_MAX_BYTES = int(os.environ.get("ARTIFACT_STORE_MAX_BYTES", str(512 * 1024 * 1024)))
+DEFAULT_MAX_AGE_SECONDS = float(os.environ.get("ARTIFACT_STORE_MAX_AGE_DAYS", "7")) * 24 * 3600
+
+# Counters shared by every process using a store, next to the shard directories
+METRICS_FILE = "metrics.json"
+
+
+def artifact_key(*parts: Any) -> str:
+    """SHA-256 over the parts that determine an artifact's content."""
+    digest = hashlib.sha256()
+    for part in parts:
+        data = part if isinstance(part, bytes) else str(part).encode("utf-8")
+        # Length-prefix each part so ("ab", "c") and ("a", "bc") differ
+        digest.update(len(data).to_bytes(8, "big"))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+@dataclass
+class StoreMetrics:
+    """Hit, write and eviction counters."""
+
+    hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    bytes_stored: int = 0
+    evictions: int = 0
+    bytes_evicted: int = 0
+
+    def add(self, **counts: int) -> None:
+        for name, count in counts.items():
+            setattr(self, name, getattr(self, name) + count)
+
+
+class ArtifactStore:
+    """Content-addressed artifact files with size- and age-based GC."""
+
+    def __init__(
+        self,
+        root: str = DEFAULT_STORE_DIR,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_age_seconds: float = DEFAULT_MAX_AGE_SECONDS,
+    ):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        # Counters of this process, and those not yet added to METRICS_FILE
+        self.metrics = StoreMetrics()
+        self._unsaved = StoreMetrics()
+        self._lock = threading.Lock()
+        # Bytes on disk, computed on first write
+        self._total_bytes: Optional[int] = None
+        atexit.register(self.save_metrics)
+
+    def _entry(self, key: str) -> Path:
+        return self.root / key[:2] / key
+
+    def get(self, key: str, name: str) -> Optional[Path]:
+        """
+        Return the stored artifact for a key, or None.
+
+        A hit refreshes the artifact's last-access time for LRU eviction.
+        """
+        path = self._entry(key) / name
+        if path.is_file():
+            try:
+                os.utime(path.parent)
+            except OSError:
+                pass
+            self._count(hits=1)
+            return path
+        self._count(misses=1)
+        return None
+
+    def put(self, key: str, source: str, name: str) -> Path:
+        """
+        Move a finished file into the store under ``key``.
+
+        Args:
+            key: Content key from artifact_key()
+            source: Path of the file to store (moved, not copied)
+            name: File name inside the entry (e.g., "report.pdf")
+
+        Returns:
+            Path of the stored artifact
+        """
+        entry = self._entry(key)
+        entry.mkdir(parents=True, exist_ok=True)
+        target = entry / name
+        size = os.path.getsize(source)
+        existed = target.exists()
+        # Same filesystem: an atomic rename, so readers never see a partial file
+        staged = entry / f".{name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        shutil.move(source, staged)
+        os.replace(staged, target)
+        os.utime(entry)
+
+        # Rewriting an existing artifact stores no new bytes
+        self._count(writes=1, bytes_stored=0 if existed else size)
+        with self._lock:
+            if self._total_bytes is not None and not existed:
+                self._total_bytes += size
+        if self._current_bytes() > self.max_bytes:
+            self.gc()
+        else:
+            self.save_metrics()
+        return target
+
+    def _entries(self) -> List[Tuple[float, int, Path]]:
+        """(last access, size, entry dir) for every stored artifact."""
+        entries = []
+        if not self.root.exists():
+            return entries
+        for shard in self.root.iterdir():
+            if not shard.is_dir():
+                continue
+            for entry in shard.iterdir():
+                try:
+                    size = sum(item.stat().st_size for item in entry.iterdir() if item.is_file())
+                    entries.append((entry.stat().st_mtime, size, entry))
+                except OSError:
+                    continue  # removed by a concurrent GC
+        return entries
+
+    def _current_bytes(self) -> int:
+        with self._lock:
+            total = self._total_bytes
+        if total is None:
+            total = sum(size for _, size, _ in self._entries())
+            with self._lock:
+                self._total_bytes = total
+        return total
+
+    def gc(self, max_bytes: Optional[int] = None, max_age_seconds: Optional[float] = None) -> Dict[str, int]:
+        """
+        Evict expired artifacts, then least recently used ones over the size budget.
+
+        Returns:
+            Number of artifacts and bytes evicted, and what remains
+        """
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        max_age_seconds = self.max_age_seconds if max_age_seconds is None else max_age_seconds
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        cutoff = time.time() - max_age_seconds
+        evicted = evicted_bytes = 0
+
+        for accessed, size, entry in entries:
+            if accessed >= cutoff and total <= max_bytes:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+            evicted += 1
+            evicted_bytes += size
+
+        self._count(evictions=evicted, bytes_evicted=evicted_bytes)
+        with self._lock:
+            self._total_bytes = total
+        self.save_metrics()
+        return {"evicted": evicted, "bytes_evicted": evicted_bytes, "entries": len(entries) - evicted, "bytes": total}
+
+    def _count(self, **counts: int) -> None:
+        with self._lock:
+            self.metrics.add(**counts)
+            self._unsaved.add(**counts)
+
+    def _read_metrics(self) -> StoreMetrics:
+        try:
+            data = json.loads((self.root / METRICS_FILE).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return StoreMetrics()
+        return StoreMetrics(**{f.name: int(data.get(f.name, 0)) for f in fields(StoreMetrics)})
+
+    def save_metrics(self) -> StoreMetrics:
+        """
+        Add this process's unsaved counters to METRICS_FILE.
+
+        Returns:
+            The counters of every process that used the store
+        """
+        with self._lock:
+            unsaved, self._unsaved = self._unsaved, StoreMetrics()
+            if unsaved == StoreMetrics():
+                return self._read_metrics()
+            totals = self._read_metrics()
+            totals.add(**unsaved.__dict__)
+            path = self.root / METRICS_FILE
+            try:
+                self.root.mkdir(parents=True, exist_ok=True)
+                temporary = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+                temporary.write_text(json.dumps(totals.__dict__), encoding="utf-8")
+                os.replace(temporary, path)
+            except OSError:
+                # Keep the counts for the next save
+                self._unsaved.add(**unsaved.__dict__)
+        return totals
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters of every process that used the store, this process's, and what is on disk now."""
+        entries = self._entries()
+        metrics = dict(self.save_metrics().__dict__)
+        with self._lock:
+            this_process = dict(self.metrics.__dict__)
+        lookups = metrics["hits"] + metrics["misses"]
+        return {
+            **metrics,
+            "hit_rate": round(metrics["hits"] / lookups, 3) if lookups else 0.0,
+            "this_process": this_process,
+            "entries": len(entries),
+            "bytes_on_disk": sum(size for _, size, _ in entries),
+            "max_bytes": self.max_bytes,
+            "max_age_days": round(self.max_age_seconds / 86400, 2),
+        }
+
+
+_default_store: Optional[ArtifactStore] = None
+
+
+def get_artifact_store() -> ArtifactStore:
+    """Return the process-wide store at DEFAULT_STORE_DIR."""
+    global _default_store
+    if _default_store is None:
+        _default_store = ArtifactStore()
+    return _default_store
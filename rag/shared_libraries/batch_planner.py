@@ -0,0 +1,443 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Class-wide batch generation of study plans.
+
+Runs the analysis -> plan pipeline for many students without a chat
+session: ratings come from the student records index, weaknesses from the
+trend engine, resources from the catalog and the timeline from the schedule
+optimizer. Students are processed by a bounded thread pool that shares one
+cache of resource lookups and (optional) corpus research across the whole
+class, since students in a class have the same grade and similar gaps.
+
+Progress is appended to a checkpoint file as each plan is written, so an
+interrupted job resumes where it stopped. Plans are written as Markdown
+and JSON under the output directory, with throughput metrics.
+"""
+
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+import json
+import os
+from pathlib import Path
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from rag.shared_libraries.records_index import StudentRecordsIndex, get_records_index, normalize_student
+from rag.shared_libraries.resource_catalog import ResourceCatalog, get_resource_catalog
+from rag.shared_libraries.schedule_optimizer import (
+    DEFAULT_ITEM_MINUTES,
+    DEFAULT_WEEKLY_MINUTES,
+    StudyItem,
+    optimize_schedule,
+    subject_severity,
+)
+from rag.shared_libraries.trend_engine import summarize_trends
+
+CHECKPOINT_FILE = "checkpoint.jsonl"
+METRICS_FILE = "metrics.json"
+
+MAX_FOCUS_SUBJECTS = 3
+MAX_FOCUS_STANDARDS = 5
+RESOURCE_TYPES = ("practice_worksheets", "video_tutorials", "interactive_games")
+
+Research = Callable[[str, str], List[str]]
+
+
+class SharedCache:
+    """Thread-safe memo shared by every worker of a job.
+
+    Concurrent requests for the same key wait for the first computation
+    instead of repeating it, and hits and misses are counted for metrics.
+    """
+
+    def __init__(self):
+        self._values: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        with self._lock:
+            future = self._values.get(key)
+            owner = future is None
+            if owner:
+                future = self._values[key] = Future()
+                self.misses += 1
+            else:
+                self.hits += 1
+        if owner:
+            try:
+                future.set_result(compute())
+            except Exception as e:
+                future.set_exception(e)
+        return future.result()
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": round(self.hits / total, 3) if total else 0.0}
+
+
+def corpus_research(
+    corpus: Optional[str] = None,
+    top_k: int = 3,
+    project: Optional[str] = None,
+    location: Optional[str] = None,
+) -> Research:
+    """
+    Build a research function that retrieves strategies from the RAG corpus.
+
+    Initializes Vertex AI for the corpus's project and location, so batch
+    runs outside the agent need no other setup.
+
+    Args:
+        corpus: RAG corpus resource name (defaults to the RAG_CORPUS env var)
+        top_k: Passages retrieved per query
+        project: Google Cloud project (defaults to GOOGLE_CLOUD_PROJECT)
+        location: Vertex AI region (defaults to GOOGLE_CLOUD_LOCATION)
+
+    Returns:
+        A function (subject, grade band) -> passages
+    """
+    import vertexai
+    from vertexai.preview import rag
+
+    corpus = corpus or os.environ["RAG_CORPUS"]
+    vertexai.init(
+        project=project or os.environ.get("GOOGLE_CLOUD_PROJECT"),
+        location=location or os.environ.get("GOOGLE_CLOUD_LOCATION"),
+    )
+
+    def research(subject: str, grade_band: str) -> List[str]:
+        response = rag.retrieval_query(
+            rag_resources=[rag.RagResource(rag_corpus=corpus)],
+            text=f"Teaching strategies and interventions for {grade_band} school {subject}",
+            similarity_top_k=top_k,
+        )
+        return [context.text for context in response.contexts.contexts]
+
+    return research
+
+
+def slug(name: str) -> str:
+    """File-name-safe form of a student's name."""
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-") or "student"
+
+
+def atomic_write(path: Path, text: str) -> None:
+    """Write a text file so readers see the old or the new contents, never part of either."""
+    temporary = path.with_name(f".{path.name}.{threading.get_ident()}.tmp")
+    temporary.write_text(text, encoding="utf-8")
+    os.replace(temporary, path)
+
+
+def take(iterator, count: int) -> List[Any]:
+    """The next ``count`` items (or fewer) of an iterator."""
+    return [item for _, item in zip(range(count), iterator)]
+
+
+class StudentFileNames:
+    """Thread-safe file names for students, unique within one output even when their slugs match."""
+
+    def __init__(self, suffix: str = ""):
+        self.suffix = suffix
+        self._names: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def claim(self, student: str, name: str) -> None:
+        """Keep a name given to a student earlier (e.g., by an interrupted run)."""
+        with self._lock:
+            self._names[student] = name
+
+    def name(self, student: str) -> str:
+        """The student's file name: their slug, numbered if another student has it."""
+        with self._lock:
+            if student not in self._names:
+                taken = set(self._names.values())
+                stem, number = slug(student), 1
+                name = f"{stem}{self.suffix}"
+                while name in taken:
+                    number += 1
+                    name = f"{stem}-{number}{self.suffix}"
+                self._names[student] = name
+            return self._names[student]
+
+
+@dataclass
+class JobMetrics:
+    """Throughput and cache metrics for a batch run."""
+
+    requested: int = 0
+    completed: int = 0
+    resumed: int = 0
+    failed: int = 0
+    not_found: int = 0
+    seconds: float = 0.0
+    plan_seconds: List[float] = field(default_factory=list)
+
+    def to_dict(self, caches: Dict[str, SharedCache]) -> Dict[str, Any]:
+        timings = sorted(self.plan_seconds)
+        return {
+            "requested": self.requested,
+            "completed": self.completed,
+            "resumed": self.resumed,
+            "failed": self.failed,
+            "not_found": self.not_found,
+            "seconds": round(self.seconds, 3),
+            "plans_per_second": round(self.completed / self.seconds, 2) if self.seconds else 0.0,
+            "plan_ms_p50": round(timings[len(timings) // 2] * 1000, 2) if timings else 0.0,
+            "plan_ms_max": round(timings[-1] * 1000, 2) if timings else 0.0,
+            "caches": {name: cache.stats() for name, cache in caches.items()},
+        }
+
+
+class BatchPlanJob:
+    """Generate study plans for a list of students with checkpointing."""
+
+    def __init__(
+        self,
+        output_dir: str,
+        weeks: int = 4,
+        weekly_minutes: int = DEFAULT_WEEKLY_MINUTES,
+        max_workers: int = 4,
+        research: Optional[Research] = None,
+        index: Optional[StudentRecordsIndex] = None,
+        catalog: Optional[ResourceCatalog] = None,
+    ):
+        self.output_dir = Path(output_dir)
+        self.plans_dir = self.output_dir / "plans"
+        self.weeks = weeks
+        self.weekly_minutes = weekly_minutes
+        self.max_workers = max(1, max_workers)
+        self.research = research
+        self.index = index or get_records_index()
+        self.catalog = catalog or get_resource_catalog()
+        self.caches = {"resources": SharedCache(), "research": SharedCache(), "students": SharedCache()}
+        self._checkpoint_lock = threading.Lock()
+        self.file_names = StudentFileNames()
+
+    @property
+    def checkpoint_path(self) -> Path:
+        return self.output_dir / CHECKPOINT_FILE
+
+    def completed_students(self) -> Dict[str, str]:
+        """Students already planned according to the checkpoint, with their plan file."""
+        done = {}
+        if not self.checkpoint_path.exists():
+            return done
+        with open(self.checkpoint_path, encoding="utf-8") as file:
+            for line in file:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # a line cut short by an interruption
+                if entry.get("status") == "done" and (self.output_dir / entry["file"]).exists():
+                    done[entry["student"]] = entry["file"]
+        return done
+
+    def _checkpoint(self, entry: Dict[str, Any]) -> None:
+        with self._checkpoint_lock, open(self.checkpoint_path, "a", encoding="utf-8") as file:
+            file.write(json.dumps(entry) + "\n")
+            file.flush()
+            os.fsync(file.fileno())
+
+    def _student_details(self, student: str) -> Dict[str, Any]:
+        def load():
+            return {normalize_student(row["student"]): row for row in self.index.students()}
+
+        details = self.caches["students"].get("all", load)
+        return details.get(self.index.resolve_student(student) or "", {})
+
+    def _resources(self, subject: str, grade: str, resource_type: str):
+        key = (self.catalog.canonical_subject(subject), self.catalog.grade_band(grade), resource_type)
+        return self.caches["resources"].get(key, lambda: self.catalog.find(subject, grade, resource_type))
+
+    def plan_student(self, student: str) -> Optional[Dict[str, Any]]:
+        """
+        Build one student's plan.
+
+        Returns:
+            The plan, or None if the student has no indexed ratings
+        """
+        table = self.index.standards_table(student)
+        if table is None or not len(table):
+            return None
+        details = self._student_details(student)
+        grade = details.get("grade", "")
+        trends = summarize_trends(table)
+        severity = subject_severity(trends)
+
+        # Subjects with low, declining or stuck standards, weakest first
+        focus = sorted(
+            (subject for subject, stats in trends["subjects"].items()
+             if stats["low_latest"] or stats["declining"] or stats["stuck_low"]),
+            key=lambda subject: -severity.get(subject.lower(), 1.0),
+        )[:MAX_FOCUS_SUBJECTS]
+
+        items: List[StudyItem] = []
+        focus_areas = []
+        for subject in focus:
+            weight = severity.get(subject.lower(), 1.0)
+            standards = [
+                entry for entry in trends["stuck_low"] + trends["declining"]
+                if entry["subject"] == subject
+            ]
+            unique = list({entry["standard"]: entry for entry in standards}.values())[:MAX_FOCUS_STANDARDS]
+            area = {"subject": subject, "severity": weight, "standards": unique}
+            if self.research:
+                band = self.catalog.grade_band(grade) or "elementary"
+                key = (self.catalog.canonical_subject(subject), band)
+                area["research"] = self.caches["research"].get(key, lambda: self.research(subject, band))
+            focus_areas.append(area)
+
+            for rank, resource_type in enumerate(RESOURCE_TYPES):
+                for resource in self._resources(subject, grade, resource_type):
+                    items.append(StudyItem(
+                        id=resource.id,
+                        title=resource.title,
+                        minutes=resource.minutes or DEFAULT_ITEM_MINUTES,
+                        # Practice first, then videos, then games
+                        priority=round(weight * (1.0 + 0.1 * (len(RESOURCE_TYPES) - rank)), 3),
+                        subject=subject,
+                        resource_type=resource_type,
+                    ))
+
+        schedule = optimize_schedule(items, self.weeks, self.weekly_minutes)
+        return {
+            "student": details.get("student", student),
+            "grade": grade,
+            "school": details.get("school", ""),
+            "teacher": details.get("teacher", ""),
+            "standards_rated": trends["standards_rated"],
+            "subjects": trends["subjects"],
+            "focus_areas": focus_areas,
+            "schedule": schedule.to_dict(),
+            "schedule_metrics": schedule.metrics(items),
+        }
+
+    def _write_plan(self, student: str, plan: Dict[str, Any]) -> str:
+        name = self.file_names.name(student)
+        atomic_write(self.plans_dir / f"{name}.json", json.dumps(plan, indent=2))
+        atomic_write(self.plans_dir / f"{name}.md", render_plan_markdown(plan))
+        return f"plans/{name}.md"
+
+    def _run_one(self, student: str) -> Tuple[str, str, float, str]:
+        started = time.perf_counter()
+        try:
+            plan = self.plan_student(student)
+            if plan is None:
+                return student, "not_found", time.perf_counter() - started, ""
+            path = self._write_plan(student, plan)
+            return student, "done", time.perf_counter() - started, path
+        except Exception as e:
+            return student, "failed", time.perf_counter() - started, str(e)
+
+    def run(self, students: Iterable[str], resume: bool = True, progress: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """
+        Plan every student, skipping those completed by an earlier run.
+
+        Args:
+            students: Student names
+            resume: Skip students recorded as done in the checkpoint
+            progress: Called with each checkpoint entry as students finish
+
+        Returns:
+            Throughput, outcome counts and cache hit rates
+        """
+        self.plans_dir.mkdir(parents=True, exist_ok=True)
+        students = list(dict.fromkeys(students))
+        done = self.completed_students() if resume else {}
+        if not resume and self.checkpoint_path.exists():
+            self.checkpoint_path.unlink()
+        # Students planned earlier keep their files, so new ones cannot overwrite them
+        for student, file in done.items():
+            self.file_names.claim(student, Path(file).stem)
+
+        metrics = JobMetrics(requested=len(students))
+        pending = [student for student in students if student not in done]
+        metrics.resumed = len(students) - len(pending)
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            # Keep a bounded number of students in flight
+            remaining = iter(pending)
+            futures = {executor.submit(self._run_one, student) for student in take(remaining, 2 * self.max_workers)}
+            while futures:
+                finished = next(as_completed(futures))
+                futures.remove(finished)
+                student, status, seconds, detail = finished.result()
+                entry = {"student": student, "status": status, "seconds": round(seconds, 4)}
+                if status == "done":
+                    entry["file"] = detail
+                    metrics.completed += 1
+                    metrics.plan_seconds.append(seconds)
+                elif status == "failed":
+                    entry["error"] = detail
+                    metrics.failed += 1
+                else:
+                    metrics.not_found += 1
+                self._checkpoint(entry)
+                if progress:
+                    progress(entry)
+                for student in take(remaining, 1):
+                    futures.add(executor.submit(self._run_one, student))
+        metrics.seconds = time.perf_counter() - started
+
+        result = metrics.to_dict(self.caches)
+        atomic_write(self.output_dir / METRICS_FILE, json.dumps(result, indent=2))
+        return result
+
+
+def render_plan_markdown(plan: Dict[str, Any]) -> str:
+    """Render a batch plan as a Markdown document."""
+    lines = [
+        f"# Study Plan: {plan['student']}",
+        "",
+        f"**Grade:** {plan['grade']}  **School:** {plan['school']}  **Teacher:** {plan['teacher']}",
+        "",
+        "## Focus Areas",
+        "",
+    ]
+    if not plan["focus_areas"]:
+        lines += ["No standards are currently below expectations. Keep up the great work!", ""]
+    for area in plan["focus_areas"]:
+        stats = plan["subjects"].get(area["subject"], {})
+        lines.append(f"### {area['subject'].title()}")
+        lines.append(
+            f"Mean latest rating {stats.get('mean_latest', '-')} across {stats.get('standards_rated', 0)} standards; "
+            f"{stats.get('low_latest', 0)} rated 2 or lower, {stats.get('declining', 0)} declining, "
+            f"{stats.get('stuck_low', 0)} stuck low."
+        )
+        lines.append("")
+        for entry in area["standards"]:
+            ratings = ", ".join(f"{quarter}: {rating}" for quarter, rating in entry["ratings"].items())
+            lines.append(f"- {entry['standard']} ({ratings})")
+        for passage in area.get("research", []):
+            lines.append(f"> {passage.strip()[:300]}")
+        lines.append("")
+
+    lines += ["## Weekly Schedule", ""]
+    for week in plan["schedule"]["weeks"]:
+        lines.append(f"### Week {week['week']} ({week['minutes_used']} of {week['minutes_budget']} minutes)")
+        for item in week["items"]:
+            lines.append(f"- {item['title']} ({item['subject'].title()}, {item['minutes']} min)")
+        lines.append("")
+    if plan["schedule"]["unscheduled"]:
+        lines.append("**Not scheduled (over the weekly time budget):** " + ", ".join(
+            entry["item"]["title"] for entry in plan["schedule"]["unscheduled"]
+        ))
+        lines.append("")
+    return "\n".join(lines)
@@ -0,0 +1,323 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Streaming ZIP export of every student's report for a class.
+
+Reports are built by the batch planner and rendered in any report template
+format on a bounded thread pool. The main thread writes each finished report
+into the archive as soon as it is ready, so at most a few reports are held
+in memory whatever the class size. The archive can be any binary stream (a
+file or a response body); ZIP files on disk can also resume.
+
+Resuming works from a checkpoint next to the archive
+(``<archive>.checkpoint.jsonl``) that records each entry's offset, CRC and
+sizes once its bytes are synced. An interrupted archive is cut back to the
+last checkpointed entry, its entries are restored into the archive's
+directory, and the export continues with the remaining students. Progress
+is mirrored to ``<archive>.progress.json`` for other processes to poll.
+"""
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
+from datetime import datetime
+import json
+import os
+from pathlib import Path
+import time
+from typing import Any, BinaryIO, Callable, Dict, Iterable, List, Optional, Tuple
+import zipfile
+
+from rag.shared_libraries.analysis_store import AnalysisRecord
+from rag.shared_libraries.batch_planner import BatchPlanJob, StudentFileNames, atomic_write, render_plan_markdown, take
+from rag.shared_libraries.report_templates import ReportContext, get_format, render_report
+
+Progress = Callable[[Dict[str, Any]], None]
+
+
+@dataclass
+class ExportProgress:
+    """Counts for a class export, mirrored to the progress file."""
+
+    requested: int = 0
+    completed: int = 0
+    resumed: int = 0
+    failed: int = 0
+    not_found: int = 0
+    bytes_written: int = 0
+    seconds: float = 0.0
+    state: str = "running"
+
+    def to_dict(self) -> Dict[str, Any]:
+        finished = self.completed + self.resumed + self.failed + self.not_found
+        return {
+            **asdict(self),
+            "percent": round(100 * finished / self.requested, 1) if self.requested else 100.0,
+            "reports_per_second": round(self.completed / self.seconds, 2) if self.seconds else 0.0,
+        }
+
+
+def read_progress(archive_path: str) -> Optional[Dict[str, Any]]:
+    """Return the latest progress of an export to ``archive_path``, or None."""
+    try:
+        return json.loads(Path(f"{archive_path}.progress.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+class ClassReportExport:
+    """Render a class's reports in parallel and stream them into a ZIP archive."""
+
+    def __init__(
+        self,
+        output_format: str = "html",
+        max_workers: int = 4,
+        planner: Optional[BatchPlanJob] = None,
+    ):
+        self.format = get_format(output_format)
+        self.max_workers = max(1, max_workers)
+        # Only plan_student() and its shared caches are used; nothing is written there
+        self.planner = planner or BatchPlanJob(output_dir=".")
+        self._names = StudentFileNames(f".{self.format.extension}")
+
+    def entry_name(self, student: str) -> str:
+        """Archive entry for a student, unique within the archive."""
+        return self._names.name(student)
+
+    def render_student(self, student: str) -> Optional[str]:
+        """
+        Render one student's report.
+
+        Returns:
+            The report in the export format, or None if the student has no indexed ratings
+        """
+        plan = self.planner.plan_student(student)
+        if plan is None:
+            return None
+        markdown = render_plan_markdown(plan)
+        context = ReportContext(
+            title=f"Study Plan: {plan['student']}",
+            generated=str(datetime.now()),
+            profile={"name": plan["student"], "grade": plan["grade"], "school": plan["school"]},
+            records=[AnalysisRecord("study_plan", markdown, data=plan, source="class_export")],
+            markdown=markdown,
+        )
+        return render_report(context, self.format.name)
+
+    def _render_one(self, student: str) -> Tuple[str, str, float, Optional[str]]:
+        started = time.perf_counter()
+        try:
+            report = self.render_student(student)
+            status = "done" if report is not None else "not_found"
+            return student, status, time.perf_counter() - started, report
+        except Exception as e:
+            return student, "failed", time.perf_counter() - started, str(e)
+
+    def stream(
+        self,
+        output: BinaryIO,
+        students: Iterable[str],
+        progress: Optional[Progress] = None,
+        archive: Optional[zipfile.ZipFile] = None,
+        on_entry: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> ExportProgress:
+        """
+        Write every student's report into a ZIP archive on ``output``.
+
+        Works with unseekable streams such as response bodies; reports are
+        written in completion order and never all held in memory.
+
+        Args:
+            output: Binary stream the archive is written to
+            students: Student names
+            progress: Called with an entry dict as each student finishes
+            archive: An open archive to add to instead of a new one on ``output``
+            on_entry: Called before ``progress`` while the entry's bytes are current
+
+        Returns:
+            Outcome counts, bytes written and throughput
+        """
+        students = list(dict.fromkeys(students))
+        counts = ExportProgress(requested=len(students))
+        owned = archive is None
+        archive = archive or zipfile.ZipFile(output, "w", compression=zipfile.ZIP_DEFLATED)
+        started = time.perf_counter()
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="class-export") as executor:
+                # Keep a bounded number of rendered reports in memory
+                remaining = iter(students)
+                futures = {executor.submit(self._render_one, student) for student in take(remaining, 2 * self.max_workers)}
+                while futures:
+                    finished = next(as_completed(futures))
+                    futures.remove(finished)
+                    student, status, seconds, detail = finished.result()
+                    entry: Dict[str, Any] = {"student": student, "status": status, "seconds": round(seconds, 4)}
+                    if status == "done":
+                        name = self.entry_name(student)
+                        archive.writestr(name, detail)
+                        info = archive.getinfo(name)
+                        entry["file"] = name
+                        entry["bytes"] = info.compress_size
+                        counts.completed += 1
+                        counts.bytes_written += info.compress_size
+                    elif status == "failed":
+                        entry["error"] = detail
+                        counts.failed += 1
+                    else:
+                        counts.not_found += 1
+                    counts.seconds = time.perf_counter() - started
+                    if on_entry:
+                        on_entry(entry)
+                    if progress:
+                        progress(entry)
+                    for student in take(remaining, 1):
+                        futures.add(executor.submit(self._render_one, student))
+        finally:
+            if owned:
+                archive.close()
+        counts.seconds = time.perf_counter() - started
+        counts.state = "done"
+        return counts
+
+    def export(
+        self,
+        archive_path: str,
+        students: Iterable[str],
+        resume: bool = True,
+        progress: Optional[Progress] = None,
+    ) -> Dict[str, Any]:
+        """
+        Export reports to a ZIP file, resuming an interrupted export.
+
+        Args:
+            archive_path: Path of the ZIP archive
+            students: Student names
+            resume: Keep reports already in the archive according to the checkpoint
+            progress: Called with an entry dict as each student finishes
+
+        Returns:
+            Outcome counts, bytes written and throughput (also in the progress file)
+        """
+        path = Path(archive_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        checkpoint = Path(f"{archive_path}.checkpoint.jsonl")
+        progress_path = Path(f"{archive_path}.progress.json")
+        students = list(dict.fromkeys(students))
+
+        entries = _read_checkpoint(checkpoint) if resume and path.exists() else []
+        if not entries:
+            for stale in (path, checkpoint):
+                if stale.exists():
+                    stale.unlink()
+        archive, entries = _reopen(path, entries)
+        for entry in entries:
+            self._names.claim(entry["student"], entry["file"])
+        done = {entry["student"] for entry in entries}
+        if entries:
+            # Rewrite the checkpoint with only the entries that survived
+            atomic_write(checkpoint, "".join(json.dumps(entry) + "\n" for entry in entries))
+
+        counts = ExportProgress(requested=len(students))
+        counts.resumed = sum(1 for student in students if student in done)
+        pending = [student for student in students if student not in done]
+
+        def save_progress(state: str = "running") -> None:
+            counts.state = state
+            atomic_write(progress_path, json.dumps(counts.to_dict(), indent=2))
+
+        def record(entry: Dict[str, Any]) -> None:
+            if entry["status"] == "done":
+                info = archive.getinfo(entry["file"])
+                archive.fp.flush()
+                os.fsync(archive.fp.fileno())
+                entry.update(_info_fields(info), end=archive.fp.tell())
+                with open(checkpoint, "a", encoding="utf-8") as file:
+                    file.write(json.dumps(entry) + "\n")
+                    file.flush()
+                    os.fsync(file.fileno())
+                counts.completed += 1
+                counts.bytes_written += info.compress_size
+            elif entry["status"] == "failed":
+                counts.failed += 1
+            else:
+                counts.not_found += 1
+            counts.seconds = time.perf_counter() - started
+            save_progress()
+
+        started = time.perf_counter()
+        save_progress()
+        try:
+            self.stream(archive.fp, pending, progress=progress, archive=archive, on_entry=record)
+        finally:
+            archive.close()
+        counts.seconds = time.perf_counter() - started
+        save_progress("done")
+        return counts.to_dict()
+
+
+_INFO_FIELDS = ("header_offset", "CRC", "compress_size", "file_size", "compress_type", "flag_bits", "external_attr")
+
+
+def _info_fields(info: zipfile.ZipInfo) -> Dict[str, Any]:
+    fields = {name: getattr(info, name) for name in _INFO_FIELDS}
+    fields["date_time"] = list(info.date_time)
+    return fields
+
+
+def _read_checkpoint(checkpoint: Path) -> List[Dict[str, Any]]:
+    entries = []
+    if not checkpoint.exists():
+        return entries
+    with open(checkpoint, encoding="utf-8") as file:
+        for line in file:
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                break  # a line cut short by an interruption
+    return entries
+
+
+def _reopen(path: Path, entries: List[Dict[str, Any]]) -> Tuple[zipfile.ZipFile, List[Dict[str, Any]]]:
+    """Open the archive for appending, keeping only checkpointed entries that are intact."""
+    if not entries:
+        return zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED), []
+
+    if zipfile.is_zipfile(path):
+        # A finished archive: its directory already lists every entry
+        archive = zipfile.ZipFile(path, "a", compression=zipfile.ZIP_DEFLATED)
+        names = set(archive.namelist())
+        return archive, [entry for entry in entries if entry.get("file") in names]
+
+    # An interrupted archive has no directory: cut it back to the last
+    # synced entry, then restore the entries into the new directory
+    size = path.stat().st_size
+    kept, end = [], 0
+    for entry in entries:
+        if entry.get("header_offset") != end or entry["end"] > size:
+            break
+        kept.append(entry)
+        end = entry["end"]
+    with open(path, "r+b") as file:
+        file.truncate(end)
+    if not kept:
+        return zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED), []
+
+    # Appending to data without a directory starts a new one at the end
+    archive = zipfile.ZipFile(path, "a", compression=zipfile.ZIP_DEFLATED)
+    for entry in kept:
+        info = zipfile.ZipInfo(entry["file"], date_time=tuple(entry["date_time"]))
+        for name in _INFO_FIELDS:
+            setattr(info, name, entry[name])
+        archive.filelist.append(info)
+        archive.NameToInfo[info.filename] = info
+    return archive, kept
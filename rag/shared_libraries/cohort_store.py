@@ -0,0 +1,323 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Columnar cohort analytics over every parsed rating in the corpus.
+
+The student records index is exported to a Parquet file with one row per
+student, standard and rated quarter. Student, school, grade, teacher,
+subject, standard and rating columns are dictionary-encoded, so the file
+and the in-memory Arrow table hold each distinct string once. Queries
+filter and aggregate with Arrow compute kernels (``Table.group_by``), which
+keeps class- and school-level questions in the millisecond range over
+thousands of students.
+"""
+
+import os
+from pathlib import Path
+import threading
+from typing import Any, Dict, List, Optional, Sequence
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from rag.shared_libraries.records_index import (
+    EXPORT_COLUMNS,
+    StudentRecordsIndex,
+    get_records_index,
+    normalize_quarter,
+    normalize_subject,
+)
+
+DEFAULT_COHORT_PATH = os.environ.get(
+    "COHORT_STORE_PATH",
+    str(Path.home() / ".cache" / "report-card-rag" / "cohort_ratings.parquet"),
+)
+
+# Numeric value of each rating; P/S share the 1-3 scale (see trend_engine)
+RATING_SCORES = {"1": 1.0, "2": 2.0, "3": 3.0, "P": 2.0, "S": 3.0}
+
+DICTIONARY_COLUMNS = ("student", "school", "grade", "teacher", "school_year", "subject", "standard", "rating")
+
+SCHEMA = pa.schema([
+    ("student", pa.dictionary(pa.int32(), pa.string())),
+    ("school", pa.dictionary(pa.int32(), pa.string())),
+    ("grade", pa.dictionary(pa.int32(), pa.string())),
+    ("teacher", pa.dictionary(pa.int32(), pa.string())),
+    ("school_year", pa.dictionary(pa.int32(), pa.string())),
+    ("subject", pa.dictionary(pa.int32(), pa.string())),
+    ("standard", pa.dictionary(pa.int32(), pa.string())),
+    ("quarter", pa.int8()),
+    ("rating", pa.dictionary(pa.int8(), pa.string())),
+    ("score", pa.float32()),
+])
+
+GROUP_COLUMNS = {"student", "school", "grade", "teacher", "school_year", "subject", "standard", "quarter", "rating"}
+PERCENTILES = (0.1, 0.25, 0.5, 0.75, 0.9)
+
+
+def build_cohort_table(index: Optional[StudentRecordsIndex] = None) -> pa.Table:
+    """
+    Export the ratings of each student's latest report card as a dictionary-encoded Arrow table.
+
+    Args:
+        index: Source records index (defaults to the shared one)
+
+    Returns:
+        One row per student, standard and rated quarter
+    """
+    index = index or get_records_index()
+    rows = list(index.export_ratings())
+    columns: Dict[str, List[Any]] = {
+        name: [value if value is not None else "" for value in values]
+        for name, values in zip(EXPORT_COLUMNS, zip(*rows) if rows else [()] * len(EXPORT_COLUMNS))
+    }
+
+    columns["score"] = [RATING_SCORES.get(rating) for rating in columns["rating"]]
+    arrays = [
+        pa.array(columns[field.name], type=field.type.value_type).dictionary_encode().cast(field.type)
+        if field.name in DICTIONARY_COLUMNS
+        else pa.array(columns[field.name], type=field.type)
+        for field in SCHEMA
+    ]
+    return pa.Table.from_arrays(arrays, schema=SCHEMA)
+
+
+def write_cohort_store(table: pa.Table, path: str = DEFAULT_COHORT_PATH) -> str:
+    """Write the cohort table to Parquet atomically and return the path."""
+    temporary = f"{path}.tmp"
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    pq.write_table(table, temporary, use_dictionary=list(DICTIONARY_COLUMNS), compression="zstd")
+    os.replace(temporary, path)
+    return path
+
+
+def refresh_cohort_store(path: str = DEFAULT_COHORT_PATH, index: Optional[StudentRecordsIndex] = None) -> int:
+    """Rebuild the Parquet cohort store from the records index; returns the row count."""
+    table = build_cohort_table(index)
+    write_cohort_store(table, path)
+    return table.num_rows
+
+
+class CohortStore:
+    """Query API over the Parquet cohort store, reloaded when the file changes."""
+
+    def __init__(self, path: str = DEFAULT_COHORT_PATH):
+        self.path = path
+        self._table: Optional[pa.Table] = None
+        self._mtime: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def table(self) -> pa.Table:
+        mtime = os.path.getmtime(self.path) if os.path.exists(self.path) else None
+        with self._lock:
+            if self._table is None or mtime != self._mtime:
+                if mtime is None:
+                    self._table = SCHEMA.empty_table()
+                else:
+                    # One shared dictionary per column lets filters run on the
+                    # (small) dictionaries instead of on every row.
+                    self._table = pq.read_table(self.path, schema=SCHEMA).unify_dictionaries().combine_chunks()
+                self._mtime = mtime
+            return self._table
+
+    def filter(
+        self,
+        grade: str = "",
+        school: str = "",
+        teacher: str = "",
+        subject: str = "",
+        quarter: Any = None,
+        rating: str = "",
+        student: str = "",
+        standard: str = "",
+    ) -> pa.Table:
+        """
+        Select rows matching the given filters (empty values match everything).
+
+        Grade is matched with leading zeros ignored ("1" matches "01"); subject
+        accepts everyday names ("math", "reading"); school, teacher, student and
+        standard are case-insensitive substring matches.
+        """
+        table = self.table
+        mask = None
+
+        def combine(condition):
+            nonlocal mask
+            mask = condition if mask is None else pc.and_(mask, condition)
+
+        if grade:
+            combine(_dictionary_mask(table["grade"], lambda values: pc.equal(
+                pc.utf8_ltrim(values, characters="0"), grade.lstrip("0"))))
+        if subject:
+            combine(_dictionary_mask(table["subject"], lambda values: pc.match_substring(
+                values, normalize_subject(subject), ignore_case=True)))
+        quarter_number = normalize_quarter(quarter)
+        if quarter_number is not None:
+            combine(pc.equal(table["quarter"], quarter_number))
+        if rating:
+            combine(_dictionary_mask(table["rating"], lambda values: pc.equal(values, rating.strip().upper())))
+        for column, value in (("school", school), ("teacher", teacher), ("student", student), ("standard", standard)):
+            if value:
+                combine(_dictionary_mask(table[column], lambda values, value=value: pc.match_substring(
+                    values, value.strip(), ignore_case=True)))
+
+        return table if mask is None else table.filter(mask)
+
+    def group_by(self, keys: Sequence[str], **filters: Any) -> List[Dict[str, Any]]:
+        """
+        Rating counts, student counts and mean score per group.
+
+        Args:
+            keys: Columns to group by (e.g., ["subject", "quarter"])
+            **filters: Passed to ``filter``
+
+        Returns:
+            One dict per group, largest groups first
+        """
+        _check_columns(keys)
+        table = self.filter(**filters)
+        if not table.num_rows:
+            return []
+        grouped = table.group_by(list(keys)).aggregate([
+            ("score", "count"),
+            ("score", "mean"),
+            ("student", "count_distinct"),
+        ])
+        rows = grouped.rename_columns(list(keys) + ["ratings", "mean_score", "students"]).to_pylist()
+        for row in rows:
+            row["mean_score"] = round(row["mean_score"], 2) if row["mean_score"] is not None else None
+        return sorted(rows, key=lambda row: -row["ratings"])
+
+    def distribution(self, keys: Sequence[str] = ("subject",), **filters: Any) -> Dict[str, Dict[str, Any]]:
+        """
+        Share of each rating per group.
+
+        Returns:
+            {group label: {"total": n, "ratings": {"1": n, ...}, "shares": {"1": 0.12, ...}}}
+        """
+        _check_columns(keys)
+        table = self.filter(**filters)
+        if not table.num_rows:
+            return {}
+        grouped = table.group_by(list(keys) + ["rating"]).aggregate([("score", "count")])
+
+        result: Dict[str, Dict[str, Any]] = {}
+        for row in grouped.to_pylist():
+            label = " / ".join(str(row[key]) for key in keys)
+            entry = result.setdefault(label, {"total": 0, "ratings": {}})
+            entry["ratings"][row["rating"]] = row["score_count"]
+            entry["total"] += row["score_count"]
+        for entry in result.values():
+            entry["ratings"] = dict(sorted(entry["ratings"].items()))
+            entry["shares"] = {rating: round(count / entry["total"], 3) for rating, count in entry["ratings"].items()}
+        return result
+
+    def top_standards(self, rating: str = "1", top: int = 10, **filters: Any) -> List[Dict[str, Any]]:
+        """
+        Standards with the most students at a given rating.
+
+        Answers questions like "which standards are most first graders rated 1
+        on in Q2" (``top_standards("1", grade="1", quarter=2)``).
+
+        Returns:
+            Standards ordered by the number of students with that rating, with
+            the share of the students rated on the standard
+        """
+        table = self.filter(**filters)
+        if not table.num_rows:
+            return []
+        keys = ["subject", "standard"]
+        assessed = table.group_by(keys).aggregate([("student", "count_distinct")])
+        matched = table.filter(_dictionary_mask(table["rating"], lambda values: pc.equal(values, rating.strip().upper())))
+        if not matched.num_rows:
+            return []
+        hits = matched.group_by(keys).aggregate([("student", "count_distinct")])
+
+        totals = {(row["subject"], row["standard"]): row["student_count_distinct"] for row in assessed.to_pylist()}
+        rows = [
+            {
+                "subject": row["subject"],
+                "standard": row["standard"],
+                "students": row["student_count_distinct"],
+                "students_assessed": totals[(row["subject"], row["standard"])],
+                "share": round(row["student_count_distinct"] / totals[(row["subject"], row["standard"])], 3),
+            }
+            for row in hits.to_pylist()
+        ]
+        rows.sort(key=lambda row: (-row["students"], -row["share"], row["standard"]))
+        return rows[:top]
+
+    def percentiles(self, by: str = "student", **filters: Any) -> Dict[str, Any]:
+        """
+        Percentiles of the mean score per ``by`` group (students by default).
+
+        Returns:
+            Group count and the 10th/25th/50th/75th/90th percentile of mean scores
+        """
+        _check_columns([by])
+        table = self.filter(**filters)
+        if not table.num_rows:
+            return {"groups": 0, "percentiles": {}}
+        means = table.group_by([by]).aggregate([("score", "mean")])["score_mean"]
+        values = pc.quantile(means, q=list(PERCENTILES), interpolation="linear").to_pylist()
+        return {
+            "groups": len(means),
+            "percentiles": {f"p{int(q * 100)}": round(value, 2) for q, value in zip(PERCENTILES, values)},
+        }
+
+    def overview(self) -> Dict[str, Any]:
+        """Row, student, school and standard counts for the whole store."""
+        table = self.table
+        if not table.num_rows:
+            return {"ratings": 0, "students": 0, "schools": 0, "standards": 0, "grades": []}
+        table = table.unify_dictionaries()
+        return {
+            "ratings": table.num_rows,
+            "students": _distinct(table["student"]),
+            "schools": _distinct(table["school"]),
+            "standards": _distinct(table["standard"]),
+            "grades": sorted(table["grade"].chunk(0).dictionary.to_pylist()),
+        }
+
+
+def _check_columns(columns: Sequence[str]) -> None:
+    unknown = [column for column in columns if column not in GROUP_COLUMNS]
+    if unknown:
+        raise ValueError(f"Unknown cohort columns: {', '.join(unknown)}")
+
+
+def _dictionary_mask(column: pa.ChunkedArray, predicate) -> pa.ChunkedArray:
+    """Evaluate a predicate once per distinct value and map it onto the rows."""
+    return pa.chunked_array(
+        [pc.take(predicate(chunk.dictionary), chunk.indices) for chunk in column.chunks],
+        type=pa.bool_(),
+    )
+
+
+def _distinct(column: pa.ChunkedArray) -> int:
+    """Count distinct values of a dictionary column with unified dictionaries."""
+    return pc.count_distinct(pa.chunked_array([chunk.indices for chunk in column.chunks])).as_py()
+
+
+_default_store: Optional[CohortStore] = None
+
+
+def get_cohort_store() -> CohortStore:
+    """Return the process-wide store at DEFAULT_COHORT_PATH."""
+    global _default_store
+    if _default_store is None:
+        _default_store = CohortStore()
+    return _default_store
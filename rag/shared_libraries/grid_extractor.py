@@ -0,0 +1,299 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Layout-aware extraction of the standards rating grid.
+
+Instead of reading extracted text line by line, the grid is rebuilt from
+the position of every text fragment on the page (pypdf's text visitor):
+
+- bold, upper-case fragments are section titles ("MATH", "SCIENCE");
+- "Q1".."Q4" fragments give each table's column positions;
+- fragments in the left column are standard text, and ratings on the same
+  baseline are assigned to the nearest quarter column;
+- a text line sitting closer than the row pitch under the previous one,
+  or reading as an unfinished sentence, continues the previous standard.
+
+The result is one normalized row per standard (a ``StandardsTable``), used
+by the records index and to build row-aligned RAG chunks that never split
+a standard from its ratings.
+"""
+
+from dataclasses import dataclass
+import json
+import statistics
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from pypdf import PdfReader
+
+from rag.shared_libraries.pdf_text import (
+    DocumentSource,
+    PageTextCache,
+    extract_pages,
+    file_digest,
+    local_copy,
+)
+from rag.shared_libraries.report_card_parser import (
+    CONTINUES_AFTER,
+    QUARTERS,
+    RATING_CODES,
+    ReportCard,
+    StandardsTable,
+    parse_report_card,
+)
+
+FRAGMENTS_MODE = "fragments"
+
+# Ratings sit in the right half of the page; standards start at the left margin
+RATING_MIN_X = 300.0
+BASELINE_TOLERANCE = 2.0
+MARGIN_TOLERANCE = 12.0
+
+
+@dataclass(frozen=True)
+class Fragment:
+    """A positioned piece of text on a page (PDF user space, origin bottom-left)."""
+
+    x: float
+    y: float
+    text: str
+    bold: bool = False
+
+
+def page_fragments(page) -> List[Fragment]:
+    """Collect the positioned text fragments of a pypdf page."""
+    fragments: List[Fragment] = []
+
+    def visit(text, cm, tm, font_dict, font_size):
+        text = text.strip()
+        if not text:
+            return
+        # Text space to user space: the text matrix translation under the CTM
+        x = tm[4] * cm[0] + tm[5] * cm[2] + cm[4]
+        y = tm[4] * cm[1] + tm[5] * cm[3] + cm[5]
+        font = str((font_dict or {}).get("/BaseFont", ""))
+        fragments.append(Fragment(round(x, 1), round(y, 1), text, "Bold" in font))
+
+    page.extract_text(visitor_text=visit)
+    return fragments
+
+
+def iter_page_fragments(path: str, use_cache: bool = True) -> Iterator[List[Fragment]]:
+    """Yield the fragments of each page of a local PDF, cached by content hash."""
+    cache = PageTextCache() if use_cache else None
+    digest = file_digest(path) if cache else ""
+    pages = cache.page_count(digest, FRAGMENTS_MODE) if cache else None
+    if pages is not None:
+        for page in range(pages):
+            yield [Fragment(*item) for item in json.loads(cache.read_page(digest, FRAGMENTS_MODE, page))]
+        return
+
+    reader = PdfReader(path)
+    for number, page in enumerate(reader.pages):
+        fragments = page_fragments(page)
+        if cache:
+            payload = json.dumps([[f.x, f.y, f.text, f.bold] for f in fragments])
+            cache.write_pages(digest, FRAGMENTS_MODE, number, [payload])
+        yield fragments
+    if cache:
+        cache.complete(digest, FRAGMENTS_MODE, len(reader.pages))
+
+
+def _is_section_title(fragment: Fragment) -> bool:
+    text = fragment.text
+    return fragment.bold and text.isupper() and not any(ch.isdigit() for ch in text) and len(text) > 2
+
+
+def _unfinished(text: str) -> bool:
+    text = text.rstrip()
+    return text.endswith((",", "-")) or text.rsplit(" ", 1)[-1].lower() in CONTINUES_AFTER
+
+
+@dataclass
+class _Line:
+    y: float
+    x: float
+    text: str
+    ratings: List[Tuple[float, str]]
+
+
+def _page_rows(fragments: List[Fragment], table: StandardsTable, section: str) -> str:
+    """Add the grid rows of one page to the table; returns the last section seen."""
+    titles = sorted(((f.y, f.text) for f in fragments if _is_section_title(f)), reverse=True)
+    headers: Dict[float, List[Fragment]] = {}
+    for fragment in fragments:
+        if fragment.text in QUARTERS:
+            headers.setdefault(fragment.y, []).append(fragment)
+    # Column centres per table, keyed by the header baseline
+    columns = {
+        y: [next(f.x for f in found if f.text == quarter) for quarter in QUARTERS]
+        for y, found in headers.items()
+        if {f.text for f in found} == set(QUARTERS)
+    }
+    if not columns:
+        return section
+
+    # Group the remaining fragments into baselines, top to bottom
+    lines: List[_Line] = []
+    for fragment in sorted(fragments, key=lambda f: (-f.y, f.x)):
+        if fragment.text in QUARTERS or _is_section_title(fragment):
+            continue
+        if lines and abs(lines[-1].y - fragment.y) <= BASELINE_TOLERANCE:
+            line = lines[-1]
+        else:
+            line = _Line(fragment.y, fragment.x, "", [])
+            lines.append(line)
+        if fragment.x >= RATING_MIN_X and fragment.text in RATING_CODES:
+            line.ratings.append((fragment.x, fragment.text))
+        elif fragment.x < RATING_MIN_X:
+            line.x = fragment.x if not line.text else min(line.x, fragment.x)
+            line.text = f"{line.text} {fragment.text}".strip()
+
+    header_ys = sorted(columns, reverse=True)
+    gaps = [
+        upper.y - lower.y
+        for upper, lower in zip(lines, lines[1:])
+        if upper.ratings and lower.ratings
+    ]
+    pitch = statistics.median(gaps) if gaps else 12.0
+    # Standards start at the left margin; centred notes under a title do not
+    margin = min((line.x for line in lines if line.ratings and line.text), default=0.0)
+
+    # A standard wrapped across a page break continues the last row
+    last_row: Optional[int] = len(table) - 1 if len(table) else None
+    previous_y: Optional[float] = None
+    for line in lines:
+        # Only lines under a quarter header belong to a grid
+        header_y = next((y for y in reversed(header_ys) if y > line.y), None)
+        if header_y is None or not line.text or line.x > margin + MARGIN_TOLERANCE:
+            continue
+        # The table's section is the nearest title above its header; a table
+        # continued from the previous page has none and keeps that section
+        above = [text for y, text in titles if y > header_y]
+        section = above[-1] if above else section
+
+        if not line.ratings and last_row is not None and table.subject(last_row) == section:
+            previous = table.texts[last_row].rstrip()
+            gap = previous_y - line.y if previous_y is not None else None
+            tight = gap is not None and gap < pitch - 0.5 and not previous.endswith(".")
+            if not line.text[0].isupper() or tight or _unfinished(previous):
+                table.extend_text(last_row, line.text)
+                previous_y = line.y
+                continue
+
+        codes = [0, 0, 0, 0]
+        centres = columns[header_y]
+        for x, label in line.ratings:
+            quarter = min(range(len(QUARTERS)), key=lambda q: abs(centres[q] - x))
+            codes[quarter] = RATING_CODES[label]
+        last_row = table.append(section, line.text, tuple(codes))
+        previous_y = line.y
+    return section
+
+
+def extract_standards_grid(path: str, use_cache: bool = True) -> StandardsTable:
+    """
+    Rebuild the standards rating grid of a report card PDF from text positions.
+
+    Args:
+        path: Local path of the PDF
+        use_cache: Read and fill the on-disk fragment cache
+
+    Returns:
+        One normalized row per standard with its Q1-Q4 ratings
+    """
+    table = StandardsTable()
+    section = ""
+    for fragments in iter_page_fragments(path, use_cache):
+        section = _page_rows(fragments, table, section)
+    return table
+
+
+def parse_report_card_grid(source: DocumentSource, suffix: str = ".pdf") -> ReportCard:
+    """
+    Parse a report card, taking the standards grid from text positions.
+
+    Header fields, attendance and comments come from the layout text parser;
+    the standards table is rebuilt from positions. Falls back to the text
+    parser's table when no grid is found (e.g., plain-text documents).
+
+    Args:
+        source: A file path, gs:// URI, raw bytes, or a binary stream
+        suffix: File extension used when ``source`` is not a path
+
+    Returns:
+        The parsed report card
+    """
+    with local_copy(source, suffix) as (path, suffix):
+        card = parse_report_card("\f".join(extract_pages(path, suffix, layout=True)))
+        if suffix.lower() == ".pdf":
+            grid = extract_standards_grid(path)
+            if len(grid):
+                card.standards = grid
+    return card
+
+
+def format_row(table: StandardsTable, row: int) -> str:
+    """Render one standard and its ratings as a single self-contained line."""
+    ratings = ", ".join(
+        f"{quarter}: {label or 'not yet assessed'}"
+        for quarter, label in zip(QUARTERS, table.quarter_ratings(row))
+    )
+    return f"{table.texts[row]} | {ratings}"
+
+
+def row_chunks(card: ReportCard, max_chars: int = 1400) -> List[str]:
+    """
+    Pack whole standards rows into RAG chunks.
+
+    Each chunk starts with the student header and the subject, then holds as
+    many complete rows of that subject as fit in ``max_chars``, so retrieval
+    never returns half a row.
+
+    Args:
+        card: The parsed report card
+        max_chars: Chunk size budget; keep it under the corpus chunk size
+
+    Returns:
+        Chunk texts in document order
+    """
+    header = (
+        f"Student: {card.student_name} | Grade: {card.grade} | School: {card.school} | "
+        f"Teacher: {card.teacher} | School Year: {card.school_year}"
+    )
+    table = card.standards
+    chunks: List[str] = []
+    for subject in table.subjects:
+        prefix = f"{header}\nSubject: {subject} (standards rating by quarter)\n"
+        lines: List[str] = []
+        size = len(prefix)
+        for row in table.rows(subject):
+            line = format_row(table, row)
+            if lines and size + len(line) + 1 > max_chars:
+                chunks.append(prefix + "\n".join(lines))
+                lines, size = [], len(prefix)
+            lines.append(line)
+            size += len(line) + 1
+        if lines:
+            chunks.append(prefix + "\n".join(lines))
+
+    details = [header]
+    if card.attendance:
+        details.append("Attendance by quarter: " + "; ".join(
+            f"{kind.title()} {', '.join(map(str, counts))}" for kind, counts in card.attendance.items()
+        ))
+    for quarter, comment in card.comments.items():
+        details.append(f"Teacher comment {quarter}: {comment}")
+    if len(details) > 1:
+        chunks.append("\n".join(details))
+    return chunks
@@ -0,0 +1,222 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Single-pass, line-streaming Markdown to HTML rendering for reports.
+
+Covers the Markdown the agents write: ATX headings, paragraphs (single
+newlines become line breaks), nested bullet and numbered lists, block
+quotes, fenced code, horizontal rules, and bold, italic and inline code.
+Each input line is read once; HTML is yielded block by block, so a report
+can be written straight to a file or response without building the whole
+document in memory. Text is HTML-escaped.
+"""
+
+import html
+import io
+import re
+from typing import Iterable, Iterator, List, Optional, TextIO, Tuple, Union
+
+_HEADING = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+_LIST_ITEM = re.compile(r"^(\s*)([-*+]|\d{1,9}[.)])\s+(.*)$")
+_RULE = re.compile(r"^\s{0,3}([-*_])(\s*\1){2,}\s*$")
+_QUOTE = re.compile(r"^\s{0,3}>\s?(.*)$")
+_FENCE = re.compile(r"^\s{0,3}(```|~~~)")
+_INLINE = re.compile(
+    r"`([^`]+)`"                                  # inline code
+    r"|\*\*(.+?)\*\*|__(.+?)__"                   # bold
+    r"|\*(?![\s*])(.+?)(?<![\s*])\*"              # italic *text*
+    r"|(?<![\w_])_(?![\s_])(.+?)(?<![\s_])_(?![\w_])"  # italic _text_
+)
+
+MarkdownSource = Union[str, Iterable[str]]
+
+
+def _inline_replace(match: "re.Match[str]") -> str:
+    code, bold_stars, bold_underscores, italic_stars, italic_underscores = match.groups()
+    if code is not None:
+        return f"<code>{code}</code>"
+    bold = bold_stars if bold_stars is not None else bold_underscores
+    if bold is not None:
+        return f"<strong>{render_inline(bold, escaped=True)}</strong>"
+    italic = italic_stars if italic_stars is not None else italic_underscores
+    return f"<em>{render_inline(italic, escaped=True)}</em>"
+
+
+def render_inline(text: str, escaped: bool = False) -> str:
+    """Escape text and render bold, italic and inline code."""
+    if not escaped:
+        text = html.escape(text, quote=False)
+    if "*" not in text and "_" not in text and "`" not in text:
+        return text
+    return _INLINE.sub(_inline_replace, text)
+
+
+def _lines(source: MarkdownSource) -> Iterable[str]:
+    if isinstance(source, str):
+        return io.StringIO(source)
+    return source
+
+
+def _indent_width(indent: str) -> int:
+    return len(indent.expandtabs(4))
+
+
+class _Renderer:
+    """Block state for one document: the open paragraph, quote, lists or fence.
+
+    Each method returns the HTML completed by that step ("" if none), which
+    is cheaper per line than nested generators.
+    """
+
+    def __init__(self):
+        self.paragraph: List[str] = []
+        self.quote: List[str] = []
+        # Open lists, outermost first: (indent, tag)
+        self.lists: List[Tuple[int, str]] = []
+        self.fence: Optional[str] = None
+
+    def close_paragraph(self) -> str:
+        out = ""
+        if self.paragraph:
+            out = "<p>" + "<br>\n".join(self.paragraph) + "</p>\n"
+            self.paragraph = []
+        if self.quote:
+            out += "<blockquote><p>" + "<br>\n".join(self.quote) + "</p></blockquote>\n"
+            self.quote = []
+        return out
+
+    def close_lists(self, indent: int = -1) -> str:
+        """Close lists nested deeper than ``indent`` (all lists by default)."""
+        out = ""
+        while self.lists and self.lists[-1][0] > indent:
+            _, tag = self.lists.pop()
+            out += f"</li>\n</{tag}>\n"
+        return out
+
+    def close_all(self) -> str:
+        return self.close_paragraph() + (self.close_lists() if self.lists else "")
+
+    def list_item(self, indent: int, tag: str, start: str, text: str) -> str:
+        out = self.close_paragraph() if self.paragraph or self.quote else ""
+        out += self.close_lists(indent)
+        if self.lists and self.lists[-1][0] == indent and self.lists[-1][1] != tag:
+            out += self.close_lists(indent - 1)
+
+        if self.lists and self.lists[-1][0] == indent:
+            out += "</li>\n"
+        else:
+            attributes = f' start="{start}"' if tag == "ol" and start not in ("", "1") else ""
+            out += f"<{tag}{attributes}>\n"
+            self.lists.append((indent, tag))
+        return out + f"<li>{render_inline(text)}"
+
+    def line(self, line: str) -> str:
+        line = line.rstrip("\r\n")
+
+        if self.fence is not None:
+            if line.strip().startswith(self.fence):
+                self.fence = None
+                return "</code></pre>\n"
+            return html.escape(line, quote=False) + "\n"
+
+        stripped = line.lstrip()
+        if not stripped:
+            return self.close_paragraph()
+
+        # Dispatch on the first character so most lines try at most one pattern
+        first = stripped[0]
+        if first == "#":
+            heading = _HEADING.match(line)
+            if heading:
+                level = len(heading.group(1))
+                return self.close_all() + f"<h{level}>{render_inline(heading.group(2))}</h{level}>\n"
+        elif first in "`~":
+            fence = _FENCE.match(line)
+            if fence:
+                out = self.close_all()
+                self.fence = fence.group(1)
+                return out + "<pre><code>"
+        elif first == ">":
+            quote = _QUOTE.match(line)
+            if quote:
+                out = self.close_paragraph() if self.paragraph else ""
+                out += self.close_lists() if self.lists else ""
+                self.quote.append(render_inline(quote.group(1)))
+                return out
+
+        if first in "-*_" and _RULE.match(line):
+            return self.close_all() + "<hr>\n"
+
+        if first in "-*+" or first.isdigit():
+            item = _LIST_ITEM.match(line)
+            if item:
+                indent, marker, text = item.groups()
+                tag = "ul" if marker in "-*+" else "ol"
+                return self.list_item(_indent_width(indent), tag, marker[:-1] if tag == "ol" else "", text)
+
+        # An indented line right after a list item continues that item
+        if self.lists and not self.paragraph and line[0] in " \t":
+            return " " + render_inline(stripped.rstrip())
+
+        out = self.close_lists() if self.lists else ""
+        if self.quote:
+            out += self.close_paragraph()
+        self.paragraph.append(render_inline(stripped.rstrip()))
+        return out
+
+    def finish(self) -> str:
+        out = ""
+        if self.fence is not None:
+            self.fence = None
+            out = "</code></pre>\n"
+        return out + self.close_all()
+
+
+def iter_markdown_html(source: MarkdownSource) -> Iterator[str]:
+    """
+    Render Markdown to HTML, yielding fragments as blocks complete.
+
+    Args:
+        source: Markdown text, or any iterable of lines (e.g., an open file)
+
+    Yields:
+        HTML fragments; concatenated they form the document body
+    """
+    renderer = _Renderer()
+    for line in _lines(source):
+        fragment = renderer.line(line)
+        if fragment:
+            yield fragment
+    fragment = renderer.finish()
+    if fragment:
+        yield fragment
+
+
+def render_markdown_html(source: MarkdownSource) -> str:
+    """Render Markdown to an HTML string."""
+    return "".join(iter_markdown_html(source))
+
+
+def write_markdown_html(source: MarkdownSource, output: TextIO) -> int:
+    """
+    Stream rendered HTML into a text file or response stream.
+
+    Returns:
+        Number of characters written
+    """
+    written = 0
+    for fragment in iter_markdown_html(source):
+        output.write(fragment)
+        written += len(fragment)
+    return written
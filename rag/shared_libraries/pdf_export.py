@@ -0,0 +1,324 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Background PDF rendering for report exports.
+
+Export jobs are queued on a worker pool and rendered with wkhtmltopdf (via
+pdfkit): each job first writes the report HTML, then converts it to PDF.
+Submitting returns a job handle at once, so an agent turn never waits on
+rendering. wkhtmltopdf runs as a separate process per job, so a thread per
+CPU keeps every core busy without pickling jobs across processes.
+
+Job status is kept in memory and mirrored to ``<job_id>.json`` in the
+export directory, so any process sharing the directory can report it.
+
+Finished PDFs move into the content-addressed artifact store. A job
+submitted with a cache key that is already stored (or already rendering)
+reuses that PDF instead of rendering again, and working files older than
+the store's maximum age are pruned from the export directory.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime
+import json
+import os
+from pathlib import Path
+import re
+import tempfile
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, Optional, TextIO
+
+from rag.shared_libraries.artifact_store import ArtifactStore, get_artifact_store
+
+DEFAULT_EXPORT_DIR = os.environ.get(
+    "PDF_EXPORT_DIR",
+    str(Path(tempfile.gettempdir()) / "report-card-exports"),
+)
+
+PDF_OPTIONS = {
+    "encoding": "UTF-8",
+    "page-size": "Letter",
+    "margin-top": "15mm",
+    "margin-bottom": "15mm",
+    "enable-local-file-access": None,
+    "quiet": None,
+}
+
+# File name of a rendered PDF inside its artifact store entry
+ARTIFACT_NAME = "report.pdf"
+
+# Minimum seconds between prunes of the export directory
+PRUNE_INTERVAL_SECONDS = 3600
+
+# Progress reported for each stage of a job
+STAGES = {"queued": 0, "rendering_html": 20, "rendering_pdf": 50, "done": 100, "failed": 100}
+
+HtmlWriter = Callable[[TextIO], None]
+
+
+def format_size(size: int) -> str:
+    """Human-readable file size."""
+    if size < 1024:
+        return f"{size} bytes"
+    if size < 1024 * 1024:
+        return f"{size / 1024:.1f} KB"
+    return f"{size / (1024 * 1024):.1f} MB"
+
+
+def _timestamp(value: str) -> float:
+    """Epoch seconds of a str(datetime) value; 0 if it is empty or malformed."""
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        return 0.0
+
+
+@dataclass
+class ExportJob:
+    """State of one PDF export."""
+
+    job_id: str
+    title: str
+    filename: str
+    html_path: str
+    pdf_path: str
+    status: str = "queued"
+    submitted_at: str = ""
+    started_at: str = ""
+    finished_at: str = ""
+    file_size: int = 0
+    error: str = ""
+    cache_key: str = ""
+    cached: bool = False
+
+    @property
+    def progress(self) -> int:
+        return STAGES.get(self.status, 0)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {**asdict(self), "progress": self.progress}
+
+
+class PdfExportService:
+    """Queue of PDF export jobs rendered on a worker pool."""
+
+    def __init__(
+        self,
+        export_dir: str = DEFAULT_EXPORT_DIR,
+        max_workers: Optional[int] = None,
+        store: Optional[ArtifactStore] = None,
+    ):
+        self.export_dir = Path(export_dir)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.store = store or get_artifact_store()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._jobs: Dict[str, ExportJob] = {}
+        # Unfinished job per cache key, so identical exports render once
+        self._rendering: Dict[str, ExportJob] = {}
+        self._lock = threading.Lock()
+        self._last_prune = 0.0
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="pdf-export")
+            return self._executor
+
+    def _save(self, job: ExportJob) -> None:
+        path = self.export_dir / f"{job.job_id}.json"
+        temporary = path.with_name(f".{path.name}.{threading.get_ident()}.tmp")
+        temporary.write_text(json.dumps(job.to_dict()), encoding="utf-8")
+        os.replace(temporary, path)
+
+    def _update(self, job: ExportJob, **changes: Any) -> None:
+        with self._lock:
+            for name, value in changes.items():
+                setattr(job, name, value)
+        self._save(job)
+
+    def submit(self, title: str, write_html: HtmlWriter, cache_key: str = "") -> ExportJob:
+        """
+        Queue an export and return immediately.
+
+        Args:
+            title: Report title, also used for the file name
+            write_html: Writes the report HTML into an open text file (runs on a worker)
+            cache_key: Artifact key of the report content and template; an
+                export with a stored key is done at once without rendering
+
+        Returns:
+            The queued job (or a finished one on a cache hit); poll
+            ``status(job.job_id)`` for progress
+        """
+        self.export_dir.mkdir(parents=True, exist_ok=True)
+        self._maybe_prune()
+        if cache_key:
+            with self._lock:
+                rendering = self._rendering.get(cache_key)
+            if rendering is not None:
+                return rendering
+
+        job_id = uuid.uuid4().hex[:12]
+        stem = re.sub(r"[^a-z0-9]+", "_", title.lower()).strip("_") or "report"
+        filename = f"{stem}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+        job = ExportJob(
+            job_id=job_id,
+            title=title,
+            filename=filename,
+            html_path=str(self.export_dir / f"{job_id}.html"),
+            pdf_path=str(self.export_dir / f"{job_id}_{filename}"),
+            submitted_at=str(datetime.now()),
+            cache_key=cache_key,
+        )
+
+        stored = self.store.get(cache_key, ARTIFACT_NAME) if cache_key else None
+        if stored is not None:
+            job.status = "done"
+            job.cached = True
+            job.html_path = ""
+            job.pdf_path = str(stored)
+            job.finished_at = job.submitted_at
+            job.file_size = stored.stat().st_size
+            with self._lock:
+                self._jobs[job_id] = job
+            self._save(job)
+            return job
+
+        with self._lock:
+            self._jobs[job_id] = job
+            if cache_key:
+                self._rendering[cache_key] = job
+        self._save(job)
+        self._pool().submit(self._render, job, write_html)
+        return job
+
+    def _render(self, job: ExportJob, write_html: HtmlWriter) -> None:
+        try:
+            self._update(job, status="rendering_html", started_at=str(datetime.now()))
+            with open(job.html_path, "w", encoding="utf-8") as file:
+                write_html(file)
+
+            self._update(job, status="rendering_pdf")
+            import pdfkit
+
+            pdfkit.from_file(job.html_path, job.pdf_path, options=PDF_OPTIONS)
+            file_size = os.path.getsize(job.pdf_path)
+            pdf_path = job.pdf_path
+            if job.cache_key:
+                pdf_path = str(self.store.put(job.cache_key, job.pdf_path, ARTIFACT_NAME))
+                os.remove(job.html_path)
+            self._update(
+                job,
+                status="done",
+                finished_at=str(datetime.now()),
+                file_size=file_size,
+                pdf_path=pdf_path,
+            )
+        except ImportError:
+            self._fail(job, "PDF engine unavailable: install pdfkit and wkhtmltopdf")
+        except Exception as e:
+            message = str(e)
+            if "No wkhtmltopdf executable" in message:
+                message = "PDF engine unavailable: wkhtmltopdf is not installed (apt-get install wkhtmltopdf)"
+            self._fail(job, message)
+        finally:
+            with self._lock:
+                if self._rendering.get(job.cache_key) is job:
+                    del self._rendering[job.cache_key]
+
+    def _fail(self, job: ExportJob, message: str) -> None:
+        self._update(job, status="failed", finished_at=str(datetime.now()), error=message)
+
+    def _maybe_prune(self) -> None:
+        now = time.time()
+        with self._lock:
+            if now - self._last_prune < PRUNE_INTERVAL_SECONDS:
+                return
+            self._last_prune = now
+        self.prune()
+
+    def prune(self, max_age_seconds: Optional[float] = None) -> int:
+        """
+        Delete job files (status, HTML, uncached PDFs) older than the store's maximum age.
+
+        Finished jobs older than that are dropped from memory too; status()
+        still reads any whose status file remains.
+
+        Returns:
+            Number of files removed
+        """
+        if max_age_seconds is None:
+            max_age_seconds = self.store.max_age_seconds
+        cutoff = time.time() - max_age_seconds
+        with self._lock:
+            active = {job.job_id for job in self._jobs.values() if job.status not in ("done", "failed")}
+            for job in list(self._jobs.values()):
+                if job.job_id not in active and _timestamp(job.finished_at) < cutoff:
+                    del self._jobs[job.job_id]
+        removed = 0
+        for path in self.export_dir.glob("*"):
+            if not path.is_file() or path.name.split(".")[0].split("_")[0] in active:
+                continue
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    removed += 1
+            except OSError:
+                continue
+        return removed
+
+    def status(self, job_id: str) -> Optional[ExportJob]:
+        """Return a job by id, from memory or from its status file."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is not None:
+            return job
+        path = self.export_dir / f"{job_id}.json"
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        data.pop("progress", None)
+        return ExportJob(**data)
+
+    def queue_position(self, job_id: str) -> int:
+        """Number of queued jobs submitted before this one (0 once it has started)."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.status != "queued":
+                return 0
+            return sum(
+                1 for other in self._jobs.values()
+                if other.status == "queued" and other.submitted_at < job.submitted_at
+            )
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor:
+            executor.shutdown(wait=wait)
+
+
+_default_service: Optional[PdfExportService] = None
+
+
+def get_export_service() -> PdfExportService:
+    """Return the process-wide export service at DEFAULT_EXPORT_DIR."""
+    global _default_service
+    if _default_service is None:
+        _default_service = PdfExportService()
+    return _default_service
@@ -0,0 +1,266 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Text extraction for report card documents.
+
+Validation, parsing, indexing and the upload preview all need the text of
+the same PDFs, so extracted pages are cached on disk under the SHA-256 of
+the file bytes (and the extraction mode). Large PDFs are split into page
+ranges extracted in parallel across a process pool; ``iter_pages`` yields
+pages in order as they become available, holding at most a few ranges in
+memory and reading the PDF from disk rather than loading it whole.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+import hashlib
+import json
+import os
+from pathlib import Path
+import shutil
+import tempfile
+from typing import BinaryIO, Iterator, List, Optional, Tuple, Union
+
+import pypdf
+from pypdf import PdfReader
+
+DocumentSource = Union[str, bytes, BinaryIO]
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    "PDF_TEXT_CACHE_DIR",
+    str(Path.home() / ".cache" / "report-card-rag" / "pdf_text"),
+)
+
+# Below this many pages a process pool costs more than it saves
+PARALLEL_MIN_PAGES = 16
+PAGES_PER_TASK = 8
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def read_document_bytes(path: str) -> bytes:
+    """
+    Read a document from a local path or a gs:// URI.
+
+    Args:
+        path: Local file path or gs://bucket/object URI
+
+    Returns:
+        The raw document bytes
+    """
+    if path.startswith("gs://"):
+        from google.cloud import storage
+
+        bucket_name, _, blob_name = path[len("gs://"):].partition("/")
+        return storage.Client().bucket(bucket_name).blob(blob_name).download_as_bytes()
+
+    with open(path, "rb") as file:
+        return file.read()
+
+
+def file_digest(path: str) -> str:
+    """SHA-256 of a local file, read in blocks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class PageTextCache:
+    """On-disk cache of per-page text keyed by content hash and extraction mode."""
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR):
+        self.directory = Path(directory)
+
+    def _entry(self, digest: str, mode: str) -> Path:
+        # pypdf's output changes between releases, so it is part of the key
+        return self.directory / digest[:2] / digest / f"{mode}-pypdf{pypdf.__version__}"
+
+    def page_count(self, digest: str, mode: str) -> Optional[int]:
+        """Return the page count of a complete cache entry, or None."""
+        meta = self._entry(digest, mode) / "meta.json"
+        try:
+            return json.loads(meta.read_text(encoding="utf-8"))["pages"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def read_page(self, digest: str, mode: str, page: int) -> str:
+        return (self._entry(digest, mode) / f"{page:05d}.txt").read_text(encoding="utf-8")
+
+    def write_pages(self, digest: str, mode: str, start: int, texts: List[str]) -> None:
+        entry = self._entry(digest, mode)
+        entry.mkdir(parents=True, exist_ok=True)
+        for offset, text in enumerate(texts):
+            _atomic_write(entry / f"{start + offset:05d}.txt", text)
+
+    def complete(self, digest: str, mode: str, pages: int) -> None:
+        """Mark an entry complete once every page has been written."""
+        entry = self._entry(digest, mode)
+        entry.mkdir(parents=True, exist_ok=True)
+        _atomic_write(entry / "meta.json", json.dumps({"pages": pages}))
+
+    def clear(self) -> None:
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+def _atomic_write(path: Path, text: str) -> None:
+    temporary = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    temporary.write_text(text, encoding="utf-8")
+    os.replace(temporary, path)
+
+
+def _extract_range(path: str, start: int, stop: int, layout: bool) -> List[str]:
+    """Extract pages [start, stop) of a PDF on disk (runs in worker processes)."""
+    reader = PdfReader(path)
+    mode = "layout" if layout else "plain"
+    return [reader.pages[page].extract_text(extraction_mode=mode) or "" for page in range(start, stop)]
+
+
+@contextmanager
+def local_copy(source: DocumentSource, suffix: str = ".pdf"):
+    """Yield (path, suffix) of a local file holding the document.
+
+    Local paths are used as they are; gs:// objects, bytes and streams are
+    spooled to a temporary file that is removed afterwards.
+    """
+    if isinstance(source, str) and not source.startswith("gs://"):
+        yield source, os.path.splitext(source)[1] or suffix
+        return
+
+    if isinstance(source, str):
+        suffix = os.path.splitext(source)[1] or suffix
+    handle, temporary = tempfile.mkstemp(suffix=suffix)
+    try:
+        with os.fdopen(handle, "wb") as file:
+            if isinstance(source, str):
+                from google.cloud import storage
+
+                bucket_name, _, blob_name = source[len("gs://"):].partition("/")
+                storage.Client().bucket(bucket_name).blob(blob_name).download_to_file(file)
+            elif isinstance(source, (bytes, bytearray, memoryview)):
+                file.write(source)
+            else:
+                shutil.copyfileobj(source, file, HASH_BLOCK_SIZE)
+        yield temporary, suffix
+    finally:
+        os.unlink(temporary)
+
+
+def iter_pages(
+    source: DocumentSource,
+    suffix: str = ".pdf",
+    layout: bool = False,
+    cache: Optional[PageTextCache] = None,
+    use_cache: bool = True,
+    max_workers: Optional[int] = None,
+) -> Iterator[str]:
+    """
+    Stream the text of each page of a document, in page order.
+
+    Args:
+        source: A file path, gs:// URI, raw bytes, or a binary stream
+        suffix: File extension used when ``source`` is not a path
+        layout: Preserve the horizontal layout of each page, so table columns
+            (e.g., the Q1-Q4 ratings) stay aligned
+        cache: Page cache to use (defaults to one at DEFAULT_CACHE_DIR)
+        use_cache: Read and fill the on-disk page cache
+        max_workers: Process pool size for large PDFs; 1 extracts in-process
+
+    Yields:
+        One string per page (a single entry for plain-text documents)
+    """
+    mode = "layout" if layout else "plain"
+    with local_copy(source, suffix) as (path, suffix):
+        if suffix.lower() == ".txt":
+            with open(path, "rb") as file:
+                yield file.read().decode("utf-8", errors="replace")
+            return
+        if suffix.lower() != ".pdf":
+            raise ValueError(f"Unsupported document type for text extraction: {suffix}")
+
+        cache = (cache or PageTextCache()) if use_cache else None
+        digest = file_digest(path) if cache else ""
+        cached_pages = cache.page_count(digest, mode) if cache else None
+        if cached_pages is not None:
+            for page in range(cached_pages):
+                yield cache.read_page(digest, mode, page)
+            return
+
+        page_count = len(PdfReader(path).pages)
+        ranges = [(start, min(start + PAGES_PER_TASK, page_count)) for start in range(0, page_count, PAGES_PER_TASK)]
+        for start, texts in _extract_ranges(path, ranges, layout, page_count, max_workers):
+            if cache:
+                cache.write_pages(digest, mode, start, texts)
+            yield from texts
+
+        if cache:
+            cache.complete(digest, mode, page_count)
+
+
+def _extract_ranges(
+    path: str,
+    ranges: List[Tuple[int, int]],
+    layout: bool,
+    page_count: int,
+    max_workers: Optional[int],
+) -> Iterator[Tuple[int, List[str]]]:
+    """Extract page ranges in order, in parallel when the PDF is large enough."""
+    if max_workers == 1 or page_count < PARALLEL_MIN_PAGES:
+        for start, stop in ranges:
+            yield start, _extract_range(path, start, stop, layout)
+        return
+
+    workers = max_workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Bound the ranges in flight so memory stays flat for huge PDFs
+        remaining = iter(ranges)
+        pending = [
+            (start, executor.submit(_extract_range, path, start, stop, layout))
+            for start, stop in (next(remaining) for _ in range(min(2 * workers, len(ranges))))
+        ]
+        while pending:
+            start, future = pending.pop(0)
+            yield start, future.result()
+            following = next(remaining, None)
+            if following is not None:
+                pending.append((following[0], executor.submit(_extract_range, path, *following, layout)))
+
+
+def extract_pages(
+    source: DocumentSource,
+    suffix: str = ".pdf",
+    layout: bool = False,
+    use_cache: bool = True,
+    max_workers: Optional[int] = None,
+) -> List[str]:
+    """
+    Extract the text of each page of a document.
+
+    Args:
+        source: A file path, gs:// URI, raw bytes, or a binary stream
+        suffix: File extension used when ``source`` is not a path
+        layout: Preserve the horizontal layout of each page, so table columns
+            (e.g., the Q1-Q4 ratings) stay aligned
+        use_cache: Read and fill the on-disk page cache
+        max_workers: Process pool size for large PDFs; 1 extracts in-process
+
+    Returns:
+        One string per page (a single entry for plain-text documents)
+    """
+    return list(iter_pages(source, suffix, layout, use_cache=use_cache, max_workers=max_workers))
+
+
+def extract_text(source: DocumentSource, suffix: str = ".pdf", layout: bool = False) -> str:
+    """Extract the full text of a document, pages separated by form feeds."""
+    return "\f".join(iter_pages(source, suffix, layout))
@@ -0,0 +1,486 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Local SQLite index of parsed report card ratings.
+
+Report cards are parsed at ingest time (``corpus-setup/add_documents.py
+--index``) and one row per student, subject, standard and rated quarter is
+written here. Structured questions ("What was Benjamin's Q2 math rating?")
+are then answered with an indexed SQL lookup instead of a RAG retrieval and
+model calls; free-text questions still go through RAG.
+"""
+
+from datetime import datetime
+import os
+from pathlib import Path
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from rag.shared_libraries.grid_extractor import parse_report_card_grid
+from rag.shared_libraries.pdf_text import file_digest, local_copy
+from rag.shared_libraries.report_card_parser import (
+    QUARTERS,
+    RATING_CODES,
+    ReportCard,
+    StandardsTable,
+)
+
+DEFAULT_INDEX_PATH = os.environ.get(
+    "STUDENT_RECORDS_DB",
+    str(Path.home() / ".cache" / "report-card-rag" / "student_records.db"),
+)
+
+# Everyday names for report card sections
+SUBJECT_ALIASES = {
+    "reading": "LITERACY",
+    "writing": "LITERACY",
+    "ela": "LITERACY",
+    "english": "LITERACY",
+    "language arts": "LITERACY",
+    "mathematics": "MATH",
+    "maths": "MATH",
+    "social": "SOCIAL STUDIES",
+    "art": "SPECIALTY AREAS",
+    "music": "SPECIALTY AREAS",
+    "pe": "SPECIALTY AREAS",
+    "physical education": "SPECIALTY AREAS",
+    "specials": "SPECIALTY AREAS",
+    "behavior": "PERSONAL AND SOCIAL GROWTH",
+    "work habits": "PERSONAL AND SOCIAL GROWTH",
+}
+
+# Students are matched on a normalized key (casefolded, single-spaced), so
+# name lookups are indexed equality and range scans.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL UNIQUE,
+    digest TEXT NOT NULL,
+    student TEXT NOT NULL,
+    student_key TEXT NOT NULL DEFAULT '',
+    grade TEXT,
+    school TEXT,
+    teacher TEXT,
+    school_year TEXT,
+    indexed_at TEXT
+);
+CREATE TABLE IF NOT EXISTS ratings (
+    document_id INTEGER NOT NULL REFERENCES documents(id) ON DELETE CASCADE,
+    student TEXT NOT NULL COLLATE NOCASE,
+    student_key TEXT NOT NULL DEFAULT '',
+    subject TEXT NOT NULL COLLATE NOCASE,
+    standard TEXT NOT NULL,
+    quarter INTEGER NOT NULL,
+    rating TEXT NOT NULL
+);
+"""
+
+INDEXES = """
+CREATE INDEX IF NOT EXISTS documents_student ON documents (student_key);
+CREATE INDEX IF NOT EXISTS ratings_student ON ratings (student_key, subject, quarter);
+CREATE INDEX IF NOT EXISTS ratings_document ON ratings (document_id);
+CREATE INDEX IF NOT EXISTS documents_digest ON documents (digest);
+"""
+
+# A student's current report card: the one indexed last. Cards are cumulative
+# (each re-issue repeats earlier quarters), so ratings are only ever read from it.
+LATEST_DOCUMENT = (
+    "SELECT id FROM documents WHERE student_key = ? ORDER BY indexed_at DESC, id DESC LIMIT 1"
+)
+# Columns of export_ratings() rows
+EXPORT_COLUMNS = ("student", "school", "grade", "teacher", "school_year", "subject", "standard", "quarter", "rating")
+
+LATEST_DOCUMENTS = (
+    "SELECT id FROM documents AS d WHERE id = ("
+    "SELECT id FROM documents WHERE student_key = d.student_key ORDER BY indexed_at DESC, id DESC LIMIT 1)"
+)
+
+
+class AmbiguousStudentError(ValueError):
+    """A partial name matches more than one indexed student."""
+
+    def __init__(self, name: str, candidates: List[str]):
+        self.candidates = candidates
+        super().__init__(f"'{name}' matches several students ({', '.join(candidates)}); use the full name")
+
+
+def normalize_student(name: str) -> str:
+    """Key a student name is matched on: casefolded with single spaces."""
+    return " ".join((name or "").casefold().split())
+
+
+def _prefix_end(prefix: str) -> str:
+    # Smallest string greater than every string starting with prefix
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def normalize_subject(subject: str) -> str:
+    """Map a subject as a user would say it to its report card section name."""
+    cleaned = subject.strip().lower()
+    return SUBJECT_ALIASES.get(cleaned, cleaned.upper())
+
+
+def normalize_quarter(quarter: Any) -> Optional[int]:
+    """Accept 2, "2", "Q2" or "quarter 2" and return 1-4, or None for any quarter."""
+    if quarter in (None, ""):
+        return None
+    digits = "".join(ch for ch in str(quarter) if ch.isdigit())
+    if not digits or not 1 <= int(digits) <= 4:
+        raise ValueError(f"Unknown quarter: {quarter}")
+    return int(digits)
+
+
+class StudentRecordsIndex:
+    """SQLite-backed index of student, subject, standard, quarter and rating."""
+
+    def __init__(self, path: str = DEFAULT_INDEX_PATH):
+        self.path = path
+        self._local = threading.local()
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with self._connection() as connection:
+            connection.executescript(SCHEMA)
+            self._migrate(connection)
+            connection.executescript(INDEXES)
+
+    def _migrate(self, connection: sqlite3.Connection) -> None:
+        # Indexes built before names were normalized: add and fill the keys
+        for table in ("documents", "ratings"):
+            columns = {row["name"] for row in connection.execute(f"PRAGMA table_info({table})")}
+            if "student_key" not in columns:
+                connection.execute(f"ALTER TABLE {table} ADD COLUMN student_key TEXT NOT NULL DEFAULT ''")
+        stale = connection.execute("SELECT id, student FROM documents WHERE student_key = ''").fetchall()
+        for row in stale:
+            key = normalize_student(row["student"])
+            connection.execute("UPDATE documents SET student_key = ? WHERE id = ?", (key, row["id"]))
+            connection.execute("UPDATE ratings SET student_key = ? WHERE document_id = ?", (key, row["id"]))
+        connection.execute("DROP INDEX IF EXISTS ratings_lookup")
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite3 connections are not shareable across threads
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path)
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA foreign_keys = ON")
+            self._local.connection = connection
+        return connection
+
+    def close(self) -> None:
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def document_digest(self, source: str) -> Optional[str]:
+        """Return the digest recorded for a source, or None if it is not indexed."""
+        row = self._connection().execute(
+            "SELECT digest FROM documents WHERE source = ?", (source,)
+        ).fetchone()
+        return row["digest"] if row else None
+
+    def source_with_digest(self, digest: str) -> Optional[str]:
+        """Return an indexed source with this content digest, or None."""
+        row = self._connection().execute(
+            "SELECT source FROM documents WHERE digest = ? LIMIT 1", (digest,)
+        ).fetchone()
+        return row["source"] if row else None
+
+    def ingest(self, card: ReportCard, source: str, digest: str = "") -> int:
+        """
+        Index a parsed report card, replacing any earlier version of the source.
+
+        Args:
+            card: The parsed report card
+            source: Path or URI identifying the document
+            digest: Content digest used to skip unchanged documents on re-ingest
+
+        Returns:
+            Number of rating rows written
+        """
+        table = card.standards
+        key = normalize_student(card.student_name)
+        with self._connection() as connection:
+            connection.execute("DELETE FROM documents WHERE source = ?", (source,))
+            cursor = connection.execute(
+                "INSERT INTO documents (source, digest, student, student_key, grade, school, teacher, school_year, indexed_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (source, digest, card.student_name, key, card.grade, card.school,
+                 card.teacher, card.school_year, str(datetime.now())),
+            )
+            document_id = cursor.lastrowid
+            rows = [
+                (document_id, card.student_name, key, table.subject(row), table.texts[row], quarter + 1, label)
+                for row in table.rows()
+                for quarter, label in enumerate(table.quarter_ratings(row))
+                if label
+            ]
+            connection.executemany(
+                "INSERT INTO ratings (document_id, student, student_key, subject, standard, quarter, rating)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+        return len(rows)
+
+    def ingest_document(self, path: str, force: bool = False) -> Dict[str, Any]:
+        """
+        Parse and index one report card document, skipping it if unchanged.
+
+        A document whose content is already indexed under another source (a
+        copy of the same card) is skipped too.
+
+        Args:
+            path: Local path or gs:// URI of the report card
+            force: Re-index even if the content digest is unchanged
+
+        Returns:
+            Summary with the student name, row count and whether it was
+            skipped; a skipped copy names the indexed source as ``duplicate_of``
+        """
+        with local_copy(path) as (local_path, suffix):
+            digest = file_digest(local_path)
+            if not force and self.document_digest(path) == digest:
+                return {"path": path, "skipped": True, "rows": 0, "student": ""}
+            duplicate = None if force else self.source_with_digest(digest)
+            if duplicate is not None:
+                return {"path": path, "skipped": True, "rows": 0, "student": "", "duplicate_of": duplicate}
+            # Standards come from the position-based grid, one row per standard
+            card = parse_report_card_grid(local_path, suffix)
+        if not card.student_name:
+            raise ValueError(f"No student name found in {path}")
+        rows = self.ingest(card, path, digest)
+        return {"path": path, "skipped": False, "rows": rows, "student": card.student_name}
+
+    def remove_document(self, source: str) -> bool:
+        """Drop a document and its ratings from the index."""
+        with self._connection() as connection:
+            cursor = connection.execute("DELETE FROM documents WHERE source = ?", (source,))
+        return cursor.rowcount > 0
+
+    def students(self) -> List[Dict[str, Any]]:
+        """List indexed students with their grade, school and teacher."""
+        rows = self._connection().execute(
+            "SELECT student, grade, school, teacher, school_year, source FROM documents ORDER BY student"
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def export_ratings(self) -> Iterator[Tuple[Any, ...]]:
+        """
+        Every rating on each student's latest report card, ordered by student.
+
+        Yields:
+            Tuples of EXPORT_COLUMNS (student, school, grade, teacher,
+            school_year, subject, standard, quarter, rating)
+        """
+        yield from self._connection().execute(
+            "SELECT d.student, d.school, d.grade, d.teacher, d.school_year,"
+            " r.subject, r.standard, r.quarter, r.rating"
+            " FROM ratings r JOIN documents d ON d.id = r.document_id"
+            f" WHERE r.document_id IN ({LATEST_DOCUMENTS})"
+            " ORDER BY d.student, r.rowid"
+        )
+
+    def resolve_student(self, student: str) -> Optional[str]:
+        """
+        Find the one indexed student a name refers to.
+
+        Args:
+            student: Full name, or the start of it (e.g., "Benjamin" or "Benj"); case-insensitive
+
+        Returns:
+            The student's normalized key, or None if no student matches
+
+        Raises:
+            AmbiguousStudentError: The name is the start of several students' names
+        """
+        key = normalize_student(student)
+        if not key:
+            return None
+        matches = {
+            row["student_key"]: row["student"]
+            for row in self._connection().execute(
+                "SELECT student_key, student FROM documents WHERE student_key >= ? AND student_key < ?"
+                " ORDER BY student_key",
+                (key, _prefix_end(key)),
+            )
+        }
+        if key in matches or not matches:
+            return key if matches else None
+        # Whole leading words ("Ann" -> "Ann Lee") win over partial ones ("Anna Smith")
+        candidates = [name for name in matches if name.startswith(key + " ")] or list(matches)
+        if len(candidates) > 1:
+            raise AmbiguousStudentError(student, [matches[name] for name in candidates])
+        return candidates[0]
+
+    def standards_table(self, student: str) -> Optional[StandardsTable]:
+        """
+        Rebuild the standards table of a student's most recently indexed report card.
+
+        Args:
+            student: Full name or the start of it (case-insensitive)
+
+        Returns:
+            The student's StandardsTable, or None if the student is not indexed
+
+        Raises:
+            AmbiguousStudentError: The name matches several students
+        """
+        key = self.resolve_student(student)
+        if key is None:
+            return None
+        connection = self._connection()
+        document = connection.execute(LATEST_DOCUMENT, (key,)).fetchone()
+        if document is None:
+            return None
+
+        table = StandardsTable()
+        rows: Dict[tuple, int] = {}
+        for rating in connection.execute(
+            "SELECT subject, standard, quarter, rating FROM ratings WHERE document_id = ? ORDER BY rowid",
+            (document["id"],),
+        ):
+            # The same standard can appear twice in a section (e.g., retaught
+            # later in the year); ratings for one row are written consecutively.
+            key = (rating["subject"], rating["standard"])
+            row = rows.get(key)
+            if row is None or table.ratings[row * 4 + rating["quarter"] - 1]:
+                row = rows[key] = table.append(rating["subject"], rating["standard"], (0, 0, 0, 0))
+            table.ratings[row * 4 + rating["quarter"] - 1] = RATING_CODES[rating["rating"]]
+        return table
+
+    def lookup(
+        self,
+        student: str = "",
+        subject: str = "",
+        quarter: Any = None,
+        standard: str = "",
+        limit: int = 200,
+    ) -> List[Dict[str, Any]]:
+        """
+        Find ratings on each student's latest report card matching the given filters.
+
+        Args:
+            student: Full name or the start of it (case-insensitive)
+            subject: Subject or report card section, e.g. "math" or "Literacy"
+            quarter: Quarter as 1-4 or "Q1"-"Q4"; empty for all quarters
+            standard: Words that must appear in the standard's text
+            limit: Maximum number of rows returned
+
+        Returns:
+            Matching rows with student, subject, standard, quarter and rating
+
+        Raises:
+            AmbiguousStudentError: The name matches several students
+        """
+        clauses, params = self._student_clause(student)
+        if clauses is None:
+            return []
+        if subject:
+            clauses.append("subject LIKE ?")
+            params.append(f"%{normalize_subject(subject)}%")
+        quarter_number = normalize_quarter(quarter)
+        if quarter_number is not None:
+            clauses.append("quarter = ?")
+            params.append(quarter_number)
+        for word in standard.split():
+            clauses.append("standard LIKE ?")
+            params.append(f"%{word}%")
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._connection().execute(
+            f"SELECT student, subject, standard, quarter, rating FROM ratings {where}"
+            " ORDER BY student, subject, rowid, quarter LIMIT ?",
+            (*params, limit),
+        ).fetchall()
+        return [
+            {**dict(row), "quarter": QUARTERS[row["quarter"] - 1]}
+            for row in rows
+        ]
+
+    def _student_clause(self, student: str):
+        """
+        SQL filter on ratings from the latest report card of one student, or of
+        every student for an empty name; (None, None) if nobody matches.
+        """
+        if not student or not student.strip():
+            return [f"document_id IN ({LATEST_DOCUMENTS})"], []
+        key = self.resolve_student(student)
+        if key is None:
+            return None, None
+        return ["student_key = ?", f"document_id = ({LATEST_DOCUMENT})"], [key, key]
+
+    def rating_summary(self, student: str = "", subject: str = "", quarter: Any = None) -> Dict[str, Dict[str, Dict[str, int]]]:
+        """
+        Count ratings per subject and quarter on each student's latest report card.
+
+        Returns:
+            {subject: {"Q1": {"3": 11, "2": 8}, ...}}
+
+        Raises:
+            AmbiguousStudentError: The name matches several students
+        """
+        clauses, params = self._student_clause(student)
+        if clauses is None:
+            return {}
+        if subject:
+            clauses.append("subject LIKE ?")
+            params.append(f"%{normalize_subject(subject)}%")
+        quarter_number = normalize_quarter(quarter)
+        if quarter_number is not None:
+            clauses.append("quarter = ?")
+            params.append(quarter_number)
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        summary: Dict[str, Dict[str, Dict[str, int]]] = {}
+        for row in self._connection().execute(
+            f"SELECT subject, quarter, rating, COUNT(*) AS n FROM ratings {where}"
+            " GROUP BY subject, quarter, rating ORDER BY subject, quarter, rating",
+            params,
+        ):
+            quarters = summary.setdefault(row["subject"], {})
+            quarters.setdefault(QUARTERS[row["quarter"] - 1], {})[row["rating"]] = row["n"]
+        return summary
+
+
+_default_index: Optional[StudentRecordsIndex] = None
+
+
+def get_records_index() -> StudentRecordsIndex:
+    """Return the process-wide index at DEFAULT_INDEX_PATH."""
+    global _default_index
+    if _default_index is None:
+        _default_index = StudentRecordsIndex()
+    return _default_index
+
+
+def ingest_documents(paths: Iterable[str], index: Optional[StudentRecordsIndex] = None) -> List[Dict[str, Any]]:
+    """
+    Parse and index report cards, reporting failures per document.
+
+    Args:
+        paths: Local paths or gs:// URIs
+        index: Target index (defaults to the shared one)
+
+    Returns:
+        One summary per document; failures carry an ``error`` entry
+    """
+    index = index or get_records_index()
+    results = []
+    for path in paths:
+        try:
+            results.append(index.ingest_document(path))
+        except Exception as e:
+            results.append({"path": path, "skipped": False, "rows": 0, "student": "", "error": str(e)})
+    return results
@@ -0,0 +1,559 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Parser for the Williamson County Schools Standards Report Card.
+
+A report card is parsed once into a ``ReportCard``: header fields (student,
+grade, school, teacher, ...), attendance, teacher comments and a
+``StandardsTable`` holding every standard with its per-quarter ratings.
+
+The table is column-oriented and array-backed: one ``array('B')`` of subject
+indices, one list of standard texts and one flat ``array('B')`` of rating
+codes (four quarters per standard), so a whole report card is a few compact
+buffers rather than thousands of small dicts.
+
+The parser expects layout-preserving text (``extract_pages(..., layout=True)``),
+where ratings line up under the "Q1 Q2 Q3 Q4" column header. Packed plain
+text ("332Read words ...") is also understood, with two limits:
+
+* It carries no column positions, so a standard's ratings are placed in
+  consecutive quarters ending at the latest quarter rated in its table.
+* Section titles are often printed after their tables, several at a time.
+  Tables are named once the whole text is read, matching titles to tables
+  by position and rating scale. When the text does not show which of two
+  tables a title belongs to, the tables are filed under the combined name
+  ("SCIENCE / SOCIAL STUDIES") and the card gets a warning, rather than a
+  guessed subject.
+"""
+
+from array import array
+from dataclasses import dataclass, field
+import re
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from rag.shared_libraries.pdf_text import DocumentSource, extract_pages
+
+QUARTERS = ("Q1", "Q2", "Q3", "Q4")
+
+# Rating codes stored in the ratings array; 0 means "awaiting assessment"
+RATING_LABELS = ("", "1", "2", "3", "P", "S")
+RATING_CODES = {label: code for code, label in enumerate(RATING_LABELS) if label}
+
+RATING_MEANINGS = {
+    "1": "not making progress toward the standard",
+    "2": "making progress toward the standard",
+    "3": "consistently demonstrates understanding",
+    "P": "in progress",
+    "S": "satisfactory",
+}
+
+HEADER_FIELDS = {
+    "student name": "student_name",
+    "student": "student_name",
+    "name": "student_name",
+    "grade": "grade",
+    "school": "school",
+    "homeroom teacher": "teacher",
+    "teacher": "teacher",
+    "principal": "principal",
+    "school year": "school_year",
+}
+
+ATTENDANCE_ROWS = ("present", "absent", "other", "tardy")
+COMMENTS_SECTION = "TEACHER COMMENTS"
+SCHOOL_SUFFIXES = ("Elementary", "Middle", "High", "School", "Academy")
+
+# Sections rated on the 1-3 standards scale and on the S/P proficiency scale
+STANDARDS_SUBJECTS = ("LITERACY", "MATH", "SCIENCE", "SOCIAL STUDIES")
+PROFICIENCY_SUBJECTS = ("SPECIALTY AREAS", "PERSONAL AND SOCIAL GROWTH")
+FALLBACK_SUBJECT = "STANDARDS"
+
+# Comment key when the text does not show which quarter a comment belongs to
+UNKNOWN_QUARTER = "Q?"
+
+# Words that leave a wrapped standard unfinished at the end of a line
+CONTINUES_AFTER = {"a", "an", "and", "as", "at", "by", "for", "from", "in", "of", "on", "or", "the", "to", "with"}
+
+_CELL_SPLIT = re.compile(r"\s{2,}")
+_QUARTER_HEADER = re.compile(r"\bQ([1-4])\b")
+_PACKED_HEADER = re.compile(r"^\s*Q4Q3Q2Q1\s*$")
+_RATED_ROW = re.compile(r"^(?P<text>.*?\S)(?P<ratings>(?:\s{2,}[123SP])+)\s*$")
+_PACKED_ROW = re.compile(r"^(?P<ratings>[123]{1,4}|[SP]{1,4})(?P<text>[A-Z].*)$")
+_RATING_TOKEN = re.compile(r"[123SP]")
+_QUARTER_COMMENT = re.compile(r"^Quarter\s+([1-4])$", re.IGNORECASE)
+# Captions printed under every standards section title
+_CAPTION = re.compile(r"^(Shaded scores reflect|There is no need for reassessment)", re.IGNORECASE)
+
+
+class StandardsTable:
+    """Column-oriented standards and ratings for one report card."""
+
+    def __init__(self):
+        self.subjects: List[str] = []
+        self.subject_index = array("B")
+        self.texts: List[str] = []
+        self.ratings = array("B")
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def subject_id(self, subject: str) -> int:
+        """Return the index of a subject, registering it if new."""
+        if subject not in self.subjects:
+            self.subjects.append(subject)
+        return self.subjects.index(subject)
+
+    def append(self, subject: str, text: str, codes: Tuple[int, int, int, int]) -> int:
+        """Add a standard and return its row index."""
+        self.subject_index.append(self.subject_id(subject))
+        self.texts.append(text)
+        self.ratings.extend(codes)
+        return len(self.texts) - 1
+
+    def extend_text(self, row: int, text: str) -> None:
+        """Append a wrapped continuation line to a standard."""
+        self.texts[row] = f"{self.texts[row]} {text}"
+
+    def subject(self, row: int) -> str:
+        return self.subjects[self.subject_index[row]]
+
+    def quarter_ratings(self, row: int) -> List[str]:
+        """Rating labels for Q1-Q4 of a standard ('' when not yet assessed)."""
+        return [RATING_LABELS[code] for code in self.ratings[row * 4:row * 4 + 4]]
+
+    def latest(self, row: int) -> Tuple[Optional[int], str]:
+        """Return (quarter index, label) of the most recent rating, or (None, '')."""
+        for quarter in range(3, -1, -1):
+            code = self.ratings[row * 4 + quarter]
+            if code:
+                return quarter, RATING_LABELS[code]
+        return None, ""
+
+    def rows(self, subject: Optional[str] = None) -> Iterator[int]:
+        """Iterate over row indices, optionally restricted to one subject."""
+        if subject is None:
+            yield from range(len(self.texts))
+            return
+        wanted = next((i for i, name in enumerate(self.subjects) if name.lower() == subject.lower()), None)
+        if wanted is None:
+            return
+        for row, index in enumerate(self.subject_index):
+            if index == wanted:
+                yield row
+
+    def rating_counts(self, subject: str, quarter: int) -> Dict[str, int]:
+        """Count ratings by label for one subject and quarter (0-based)."""
+        counts: Dict[str, int] = {}
+        for row in self.rows(subject):
+            label = RATING_LABELS[self.ratings[row * 4 + quarter]]
+            if label:
+                counts[label] = counts.get(label, 0) + 1
+        return counts
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "subjects": list(self.subjects),
+            "subject_index": self.subject_index.tolist(),
+            "texts": list(self.texts),
+            "ratings": self.ratings.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, raw: Dict[str, Any]) -> "StandardsTable":
+        table = cls()
+        table.subjects = list(raw.get("subjects", []))
+        table.subject_index = array("B", raw.get("subject_index", []))
+        table.texts = list(raw.get("texts", []))
+        table.ratings = array("B", raw.get("ratings", []))
+        return table
+
+
+@dataclass
+class ReportCard:
+    """A parsed Standards Report Card."""
+
+    student_name: str = ""
+    grade: str = ""
+    school: str = ""
+    teacher: str = ""
+    principal: str = ""
+    school_year: str = ""
+    attendance: Dict[str, List[int]] = field(default_factory=dict)
+    attendance_to_date: Dict[str, int] = field(default_factory=dict)
+    comments: Dict[str, str] = field(default_factory=dict)
+    standards: StandardsTable = field(default_factory=StandardsTable)
+    warnings: List[str] = field(default_factory=list)
+
+    @property
+    def confident(self) -> bool:
+        """Whether every standard and comment could be placed without guessing."""
+        return not self.warnings
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Compact, JSON-serialisable form suitable for session state."""
+        return {
+            "student_name": self.student_name,
+            "grade": self.grade,
+            "school": self.school,
+            "teacher": self.teacher,
+            "principal": self.principal,
+            "school_year": self.school_year,
+            "attendance": self.attendance,
+            "attendance_to_date": self.attendance_to_date,
+            "comments": self.comments,
+            "standards": self.standards.to_dict(),
+            "warnings": list(self.warnings),
+        }
+
+    @classmethod
+    def from_dict(cls, raw: Dict[str, Any]) -> "ReportCard":
+        values = {key: raw.get(key, "") for key in ("student_name", "grade", "school", "teacher", "principal", "school_year")}
+        return cls(
+            **values,
+            attendance=dict(raw.get("attendance", {})),
+            attendance_to_date=dict(raw.get("attendance_to_date", {})),
+            comments=dict(raw.get("comments", {})),
+            standards=StandardsTable.from_dict(raw.get("standards", {})),
+            warnings=list(raw.get("warnings", [])),
+        )
+
+    def subject_summary(self) -> Dict[str, Dict[str, Any]]:
+        """Per-subject standard counts and rating distribution for each quarter."""
+        summary = {}
+        table = self.standards
+        for subject in table.subjects:
+            rows = list(table.rows(subject))
+            summary[subject] = {
+                "standards": len(rows),
+                "quarters": {
+                    QUARTERS[quarter]: counts
+                    for quarter in range(4)
+                    if (counts := table.rating_counts(subject, quarter))
+                },
+            }
+        return summary
+
+    def below_standard(self, threshold: str = "2") -> List[Dict[str, str]]:
+        """
+        Standards whose most recent rating is at or below a standards rating.
+
+        Args:
+            threshold: Highest standards rating to include ("1", "2" or "3");
+                proficiency areas are included when their latest rating is P
+
+        Returns:
+            One entry per flagged standard with subject, text, quarter and rating
+        """
+        table = self.standards
+        flagged = []
+        for row in table.rows():
+            quarter, label = table.latest(row)
+            if label == "P" or (label in ("1", "2", "3") and label <= threshold):
+                flagged.append({
+                    "subject": table.subject(row),
+                    "standard": table.texts[row],
+                    "quarter": QUARTERS[quarter],
+                    "rating": label,
+                })
+        return flagged
+
+
+def _cells(line: str) -> List[Tuple[int, str]]:
+    """Split a layout line into (start column, text) cells separated by 2+ spaces."""
+    cells = []
+    position = 0
+    for part in _CELL_SPLIT.split(line):
+        start = line.index(part, position) if part else position
+        if part.strip():
+            cells.append((start, part.strip()))
+        position = start + len(part)
+    return cells
+
+
+def _parse_header_cell(card: ReportCard, cell: str) -> None:
+    label, sep, value = cell.partition(":")
+    if sep:
+        attribute = HEADER_FIELDS.get(label.strip().lower())
+        if attribute and value.strip() and not getattr(card, attribute):
+            setattr(card, attribute, value.strip())
+    elif not card.school and cell.split()[-1] in SCHOOL_SUFFIXES:
+        card.school = cell
+
+
+def _is_section_title(stripped: str) -> bool:
+    return (
+        stripped.isupper()
+        and not any(ch.isdigit() for ch in stripped)
+        and len(stripped.split()) <= 5
+        and len(stripped) > 2
+    )
+
+
+def _continues(previous: str, line: str) -> bool:
+    """Whether a line without ratings continues the previous standard's text."""
+    if not line[0].isupper():
+        return True
+    last_word = previous.rstrip().rsplit(" ", 1)[-1].lower()
+    return previous.rstrip().endswith((",", "-")) or last_word in CONTINUES_AFTER
+
+
+def _scale_of(subject: str) -> Optional[str]:
+    if subject in STANDARDS_SUBJECTS:
+        return "standards"
+    if subject in PROFICIENCY_SUBJECTS:
+        return "proficiency"
+    return None
+
+
+def _fits(subject: str, scale: Optional[str]) -> bool:
+    """Whether a section title can name a table rated on ``scale``."""
+    return scale is None or _scale_of(subject) in (None, scale)
+
+
+def _nearest_quarter(position: int, columns: List[int]) -> int:
+    return min(range(len(columns)), key=lambda quarter: abs(columns[quarter] - position))
+
+
+class _Parser:
+    """Single-pass line parser building a ReportCard."""
+
+    def __init__(self):
+        self.card = ReportCard()
+        self.section = ""
+        self.columns: List[int] = []
+        self.packed_width = 0
+        self.last_row: Optional[int] = None
+        self.comment_quarter: Optional[str] = None
+        # Plain text: rating scale of each packed table, titles and tables in
+        # the order they appear, and text seen outside any table
+        self.packed_scales: List[Optional[str]] = []
+        self.packed_open = False
+        self.events: List[Tuple[str, Any]] = []
+        self.stray: List[str] = []
+        self.unplaced_comment: List[str] = []
+
+    def feed(self, raw_line: str) -> None:
+        line = raw_line.rstrip()
+        stripped = line.strip()
+        if not stripped:
+            return
+
+        if self.section == COMMENTS_SECTION:
+            self._comment_line(stripped)
+            return
+
+        if _CAPTION.match(stripped):
+            return
+
+        if _is_section_title(stripped):
+            self.section = stripped
+            self.columns = []
+            self.last_row = None
+            self.packed_open = False
+            self.events.append(("title", stripped))
+            if stripped == COMMENTS_SECTION:
+                self.comment_quarter = None
+                # Plain text prints the comment text before the quarter labels
+                self.unplaced_comment = self.stray
+            self.stray = []
+            return
+
+        quarter_headers = _QUARTER_HEADER.findall(stripped)
+        if len(quarter_headers) == 4 and _PACKED_HEADER.match(stripped) is None:
+            self.columns = [match.start() + 1 for match in _QUARTER_HEADER.finditer(line)]
+            self.last_row = None
+            return
+        if _PACKED_HEADER.match(stripped):
+            self._open_packed_table()
+            return
+
+        if not self.columns and not self.packed_scales and self._header_line(line, stripped):
+            return
+
+        if self.columns:
+            self._layout_row(line, stripped)
+        elif self.packed_open or (self.section and _PACKED_ROW.match(stripped)):
+            if not self.packed_open:
+                self._open_packed_table()
+            self._packed_row(stripped)
+        elif self.packed_scales:
+            self.stray.append(stripped)
+
+    def _open_packed_table(self) -> None:
+        """Start a plain-text table; it is named after its section title in finish()."""
+        self.columns = []
+        self.packed_width = 0
+        self.last_row = None
+        self.packed_open = True
+        self.stray = []
+        self.events.append(("table", len(self.packed_scales)))
+        self.section = f"#{len(self.packed_scales)}"
+        self.packed_scales.append(None)
+
+    def _header_line(self, line: str, stripped: str) -> bool:
+        """Header fields and attendance before any standards table."""
+        first = stripped.split()[0].lower()
+        if first in ATTENDANCE_ROWS:
+            numbers = [int(token) for token in re.findall(r"\b\d+\b", stripped)]
+            if not numbers:
+                return False
+            # Quarterly counts come first; the "Year to Date" column repeats
+            # the label with the total, on the same line in layout text and
+            # on a line of its own in plain text.
+            if len(numbers) >= 4:
+                self.card.attendance[first] = numbers[:4]
+            if len(numbers) != 4:
+                self.card.attendance_to_date[first] = numbers[-1]
+            return True
+
+        if ":" not in stripped and stripped.split()[-1] not in SCHOOL_SUFFIXES:
+            return False
+        for _, cell in _cells(line):
+            # Plain text can glue two fields together ("Teacher: Jane DoeSchool Year: 2024-25")
+            for part in re.split(r"(?<=[a-z])(?=[A-Z][A-Za-z ]+:)", cell):
+                _parse_header_cell(self.card, part)
+        return True
+
+    def _layout_row(self, line: str, stripped: str) -> None:
+        table = self.card.standards
+        match = _RATED_ROW.match(line)
+        if match:
+            text = match.group("text").strip()
+            offset = match.start("ratings")
+            codes = [0, 0, 0, 0]
+            for token in _RATING_TOKEN.finditer(match.group("ratings")):
+                quarter = _nearest_quarter(offset + token.start(), self.columns)
+                codes[quarter] = RATING_CODES[token.group()]
+            self.last_row = table.append(self.section, text, tuple(codes))
+            return
+
+        if self.last_row is not None and _continues(table.texts[self.last_row], stripped):
+            table.extend_text(self.last_row, stripped)
+        else:
+            self.last_row = table.append(self.section, stripped, (0, 0, 0, 0))
+
+    def _packed_row(self, stripped: str) -> None:
+        table = self.card.standards
+        match = _PACKED_ROW.match(stripped)
+        if match:
+            # Ratings are printed latest quarter first and right-aligned to the
+            # most recent quarter assessed in this table.
+            labels = match.group("ratings")[::-1]
+            self.packed_scales[-1] = "standards" if labels[0] in "123" else "proficiency"
+            self.packed_width = max(self.packed_width, len(labels))
+            codes = [0, 0, 0, 0]
+            start = self.packed_width - len(labels)
+            for quarter, label in enumerate(labels, start=start):
+                codes[quarter] = RATING_CODES[label]
+            self.last_row = table.append(self.section, match.group("text").strip(), tuple(codes))
+            return
+
+        if self.last_row is not None and _continues(table.texts[self.last_row], stripped):
+            table.extend_text(self.last_row, stripped)
+        else:
+            self.last_row = table.append(self.section, stripped, (0, 0, 0, 0))
+
+    def _comment_line(self, stripped: str) -> None:
+        quarter = _QUARTER_COMMENT.match(stripped)
+        if quarter:
+            self.comment_quarter = f"Q{quarter.group(1)}"
+            return
+        if self.comment_quarter is None or stripped.lower().startswith("parent signature"):
+            return
+        comments = self.card.comments
+        existing = comments.get(self.comment_quarter)
+        comments[self.comment_quarter] = f"{existing} {stripped}" if existing else stripped
+
+    def finish(self) -> ReportCard:
+        """Name the plain-text tables and place leftover comments; return the card."""
+        if self.packed_scales:
+            self._name_packed_tables()
+        if self.unplaced_comment:
+            self.card.comments[UNKNOWN_QUARTER] = " ".join(self.unplaced_comment)
+            self.card.warnings.append("A teacher comment was printed apart from its quarter label; its quarter is unknown.")
+        return self.card
+
+    def _name_packed_tables(self) -> None:
+        scales = self.packed_scales
+        names: Dict[int, str] = {}
+        unnamed: List[int] = []
+        waiting: List[str] = []
+        ambiguous: List[str] = []
+        for kind, value in self.events:
+            if kind == "table":
+                # A title printed just before a table names it
+                title = next((title for title in waiting if _fits(title, scales[value])), None)
+                if title:
+                    names[value] = title
+                    waiting.remove(title)
+                else:
+                    unnamed.append(value)
+            elif value != COMMENTS_SECTION:
+                # A title printed after a table names it if no other table could be meant
+                candidates = [table for table in unnamed if _fits(value, scales[table])]
+                if len(candidates) == 1:
+                    names[candidates[0]] = value
+                    unnamed.remove(candidates[0])
+                elif candidates:
+                    ambiguous.append(value)
+                else:
+                    waiting.append(value)
+
+        for scale in dict.fromkeys(scales[table] for table in unnamed):
+            tables = [table for table in unnamed if scales[table] == scale]
+            titles = [title for title in ambiguous if _fits(title, scale)]
+            name = " / ".join(titles) or FALLBACK_SUBJECT
+            if not titles:
+                self.card.warnings.append(f"{len(tables)} plain-text table(s) have no section title; filed under {name}.")
+            elif len(tables) != 1 or len(titles) != 1:
+                self.card.warnings.append(
+                    f"Plain text does not show which table belongs to {' or '.join(titles)}; "
+                    f"the standards of {len(tables)} tables are filed under {name}."
+                )
+            names.update((table, name) for table in tables)
+
+        table = self.card.standards
+        subjects = [names.get(int(subject[1:]), subject) if subject.startswith("#") else subject for subject in table.subjects]
+        table.subjects = list(dict.fromkeys(subjects))
+        table.subject_index = array("B", (table.subjects.index(subjects[index]) for index in table.subject_index))
+
+
+def parse_report_card(text: str) -> ReportCard:
+    """
+    Parse report card text into a structured ReportCard.
+
+    Args:
+        text: Extracted report card text; pages may be separated by form feeds
+
+    Returns:
+        The parsed report card
+    """
+    parser = _Parser()
+    for line in text.replace("\f", "\n").splitlines():
+        parser.feed(line)
+    return parser.finish()
+
+
+def parse_report_card_document(source: DocumentSource, suffix: str = ".pdf") -> ReportCard:
+    """
+    Extract a report card document with layout preserved and parse it.
+
+    Args:
+        source: A file path, gs:// URI, raw bytes, or a binary stream
+        suffix: File extension used when ``source`` is not a path
+
+    Returns:
+        The parsed report card
+    """
+    return parse_report_card("\f".join(extract_pages(source, suffix, layout=True)))
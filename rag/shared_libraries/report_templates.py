@@ -0,0 +1,333 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Compiled report templates and pluggable output formats.
+
+Reports render from a ``ReportContext`` (title, profile and the stored
+analysis records) into any registered output format. Built-in formats are
+``markdown``, ``html``, ``text`` and ``json`` (compact, for downstream
+systems); ``register_format`` adds more. Every format streams: it yields
+fragments, so a report can go straight to a file or response.
+
+Templates use ``{{ name }}`` placeholders (escaped for the template's
+format) and ``{{ name|raw }}`` (inserted as is). Each template is compiled
+once per process into literal chunks and slots, so rendering is a join.
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime
+import functools
+import html
+import json
+import re
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from rag.shared_libraries.analysis_store import AnalysisRecord, list_analyses
+from rag.shared_libraries.markdown_html import iter_markdown_html
+from rag.shared_libraries.section_cache import Section, section_key
+
+# Bump whenever a built-in template or format changes its output
+TEMPLATE_VERSION = "2"
+
+# Analysis sections in report order, with their headings
+SECTION_TITLES = {
+    "weakness_analysis": "## Identified Weaknesses",
+    "solution_research": "## Research Findings & Solutions",
+    "study_plan": "## Personalized Study Plan",
+    "data_retrieval": "## Supporting Data",
+}
+
+REPORT_FOOTER = "---\n*Report generated by Student Educational Analysis System*"
+
+HTML_HEAD = """
+        <!DOCTYPE html>
+        <html>
+        <head>
+            <meta charset="UTF-8">
+            <title>{{ title }}</title>
+            <style>
+                body { font-family: Arial, sans-serif; margin: 40px; line-height: 1.6; }
+                h1 { color: #2c3e50; border-bottom: 2px solid #3498db; padding-bottom: 10px; }
+                h2 { color: #34495e; margin-top: 30px; }
+                h3 { color: #7f8c8d; }
+                strong { color: #2c3e50; }
+                ul, ol { margin-left: 20px; }
+                .header { text-align: center; margin-bottom: 30px; }
+                .footer { text-align: center; margin-top: 30px; font-size: 0.9em; color: #7f8c8d; }
+            </style>
+        </head>
+        <body>
+            <div class="header">
+                <h1>{{ title }}</h1>
+                <p><strong>Generated:</strong> {{ exported_at }}</p>
+            </div>
+            <div class="content">
+        """
+
+HTML_FOOT = """
+            </div>
+            <div class="footer">
+                <hr>
+                <p><em>Generated by Student Educational Analysis System</em></p>
+            </div>
+        </body>
+        </html>
+        """
+
+_PLACEHOLDER = re.compile(r"\{\{\s*(\w+)\s*(\|\s*raw\s*)?\}\}")
+
+
+class CompiledTemplate:
+    """A template split once into literal text and placeholder slots."""
+
+    def __init__(self, source: str, escape: Optional[Callable[[str], str]] = None):
+        self.source = source
+        self.escape = escape
+        self._parts: List[str] = []
+        # (index in _parts, value name, escaped)
+        self._slots: List[Tuple[int, str, bool]] = []
+        position = 0
+        for match in _PLACEHOLDER.finditer(source):
+            self._parts.append(source[position:match.start()])
+            self._slots.append((len(self._parts), match.group(1), escape is not None and not match.group(2)))
+            self._parts.append("")
+            position = match.end()
+        self._parts.append(source[position:])
+        self.fields = sorted({name for _, name, _ in self._slots})
+
+    def render(self, **values: Any) -> str:
+        """Fill the template; missing values render as empty strings."""
+        parts = self._parts.copy()
+        escaped_values: Dict[str, str] = {}
+        for index, name, escaped in self._slots:
+            if escaped:
+                value = escaped_values.get(name)
+                if value is None:
+                    value = escaped_values[name] = self.escape(str(values.get(name, "")))
+            else:
+                value = str(values.get(name, ""))
+            parts[index] = value
+        return "".join(parts)
+
+
+def _escape_html(text: str) -> str:
+    return html.escape(text, quote=True)
+
+
+@functools.lru_cache(maxsize=128)
+def compile_template(source: str, output_format: str = "html") -> CompiledTemplate:
+    """Compile a template once per process (``html`` templates escape their values)."""
+    return CompiledTemplate(source, _escape_html if output_format == "html" else None)
+
+
+@dataclass
+class ReportContext:
+    """Everything a report renders from."""
+
+    title: str
+    generated: str
+    profile: Dict[str, Any] = field(default_factory=dict)
+    records: List[AnalysisRecord] = field(default_factory=list)
+    # Pre-assembled Markdown document (e.g., from the section cache)
+    markdown: str = ""
+
+    @classmethod
+    def from_state(cls, state: Any, title: str = "Educational Analysis Report") -> "ReportContext":
+        """
+        Build a context from session state, with analyses in report order.
+
+        The generated time is the analysis timestamp or, without one, the newest
+        analysis record's, so unchanged state renders (and caches) the same report.
+        """
+        records = {record.analysis_type: record for record in list_analyses(state)}
+        ordered = [key for key in SECTION_TITLES if key in records]
+        ordered += [key for key in records if key not in SECTION_TITLES]
+        newest = max((record.timestamp for record in records.values() if record.timestamp), default="")
+        return cls(
+            title=title,
+            generated=state.get("analysis_timestamp") or newest,
+            profile=state.get("student_profile", {}),
+            records=[records[key] for key in ordered],
+        )
+
+
+def _header_section(context: ReportContext) -> str:
+    if not context.generated:
+        return f"# {context.title}\n"
+    return f"# {context.title}\n**Generated:** {context.generated}\n"
+
+
+def _profile_section(profile: Dict[str, Any]) -> str:
+    lines = ["## Student Profile"]
+    if profile.get("name"):
+        lines.append(f"**Student:** {profile['name']}")
+    if profile.get("grade"):
+        lines.append(f"**Grade:** {profile['grade']}")
+    if profile.get("school"):
+        lines.append(f"**School:** {profile['school']}")
+    return "\n".join(lines) + "\n"
+
+
+def _analysis_section(record: AnalysisRecord) -> str:
+    title = SECTION_TITLES.get(record.analysis_type, f"## {record.analysis_type.replace('_', ' ').title()}")
+    return f"{title}\n{record.content}\n"
+
+
+def _summary_section(analysis_types: List[str]) -> str:
+    lines = ["## Analysis Summary", f"This comprehensive report contains {len(analysis_types)} analysis components:"]
+    lines.extend(f"- {analysis_type.replace('_', ' ').title()}" for analysis_type in analysis_types)
+    return "\n".join(lines) + "\n"
+
+
+def markdown_sections(context: ReportContext) -> List[Section]:
+    """The Markdown report as cacheable (key, render) sections, joined by newlines."""
+    sections = [(
+        section_key("header", context.title, context.generated),
+        lambda: _header_section(context),
+    )]
+    if context.profile:
+        sections.append((section_key("profile", context.profile), lambda: _profile_section(context.profile)))
+    for record in context.records:
+        if record.content:
+            sections.append((
+                section_key("analysis", record.analysis_type, record.digest),
+                lambda record=record: _analysis_section(record),
+            ))
+    if context.records:
+        analysis_types = [record.analysis_type for record in context.records]
+        sections.append((section_key("summary", analysis_types), lambda: _summary_section(analysis_types)))
+    sections.append((section_key("footer", REPORT_FOOTER), lambda: REPORT_FOOTER))
+    return sections
+
+
+def _markdown_lines(context: ReportContext) -> Iterator[str]:
+    if context.markdown:
+        yield from context.markdown.split("\n")
+        return
+    # Joining sections with "\n" puts each boundary on a line break
+    for _, render in markdown_sections(context):
+        yield from render().split("\n")
+
+
+@dataclass(frozen=True)
+class OutputFormat:
+    """A registered output format."""
+
+    name: str
+    extension: str
+    media_type: str
+    render: Callable[[ReportContext], Iterable[str]]
+
+
+FORMATS: Dict[str, OutputFormat] = {}
+
+
+def register_format(name: str, extension: str, media_type: str):
+    """Decorator registering ``render(context) -> iterable of fragments`` as a format."""
+
+    def decorator(render: Callable[[ReportContext], Iterable[str]]):
+        FORMATS[name] = OutputFormat(name, extension, media_type, render)
+        return render
+
+    return decorator
+
+
+@register_format("markdown", "md", "text/markdown")
+def _render_markdown(context: ReportContext) -> Iterator[str]:
+    if context.markdown:
+        yield context.markdown
+        return
+    for number, (_, render) in enumerate(markdown_sections(context)):
+        yield ("\n" if number else "") + render()
+
+
+@register_format("html", "html", "text/html")
+def _render_html(context: ReportContext) -> Iterator[str]:
+    values = {"title": context.title, "exported_at": datetime.now().strftime("%B %d, %Y at %I:%M %p")}
+    yield compile_template(HTML_HEAD, "html").render(**values)
+    yield from iter_markdown_html(_markdown_lines(context))
+    yield compile_template(HTML_FOOT, "html").render(**values)
+
+
+_TEXT_HEADING = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+_TEXT_MARKUP = re.compile(r"\*\*|__|`|(?<![\w*])\*(?=\S)|(?<=\S)\*(?![\w*])")
+
+
+@register_format("text", "txt", "text/plain")
+def _render_text(context: ReportContext) -> Iterator[str]:
+    for line in _markdown_lines(context):
+        heading = _TEXT_HEADING.match(line)
+        if heading:
+            text = _TEXT_MARKUP.sub("", heading.group(2))
+            underline = "=" if len(heading.group(1)) == 1 else "-"
+            yield f"{text}\n{underline * len(text)}\n"
+        elif line.strip() in ("---", "***", "___"):
+            yield "-" * 40 + "\n"
+        else:
+            yield _TEXT_MARKUP.sub("", line.lstrip("> ") if line.startswith(">") else line) + "\n"
+
+
+@register_format("json", "json", "application/json")
+def _render_json(context: ReportContext) -> Iterator[str]:
+    payload = {
+        "title": context.title,
+        "generated": context.generated,
+        "template_version": TEMPLATE_VERSION,
+        "profile": context.profile,
+        "analyses": [
+            {
+                "type": record.analysis_type,
+                "version": record.version,
+                "digest": record.digest,
+                "timestamp": record.timestamp,
+                "content": record.content,
+                "data": record.data,
+            }
+            for record in context.records
+        ],
+    }
+    encoder = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False, default=str)
+    yield from encoder.iterencode(payload)
+
+
+def get_format(name: str) -> OutputFormat:
+    """Return a registered format, raising ValueError for unknown names."""
+    try:
+        return FORMATS[name.lower()]
+    except KeyError:
+        raise ValueError(f"Unknown output format '{name}'. Available: {', '.join(sorted(FORMATS))}") from None
+
+
+def iter_report(context: ReportContext, output_format: str) -> Iterator[str]:
+    """Render a report, yielding fragments as they are produced."""
+    return iter(get_format(output_format).render(context))
+
+
+def render_report(context: ReportContext, output_format: str) -> str:
+    """Render a report to a string."""
+    return "".join(iter_report(context, output_format))
+
+
+def write_report(context: ReportContext, output_format: str, output: TextIO) -> int:
+    """
+    Stream a rendered report into a text file or response stream.
+
+    Returns:
+        Number of characters written
+    """
+    written = 0
+    for fragment in iter_report(context, output_format):
+        output.write(fragment)
+        written += len(fragment)
+    return written
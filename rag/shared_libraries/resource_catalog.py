@@ -0,0 +1,229 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Educational resource catalog loaded from a JSON data file.
+
+The catalog file lists grade bands, subject aliases and resources; adding
+subjects, resource types or entries needs no code change. On load it is
+indexed into dictionaries keyed by (subject, grade band, resource type), by
+tag and by grade, so lookups are O(1). ``ResourceCatalog`` swaps in a fresh
+index whenever the file's modification time changes.
+"""
+
+from dataclasses import dataclass, field
+import json
+import os
+from pathlib import Path
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+DEFAULT_CATALOG_PATH = os.environ.get(
+    "RESOURCE_CATALOG_PATH",
+    str(Path(__file__).resolve().parents[1] / "data" / "resource_catalog.json"),
+)
+
+_GRADE_WORDS = {"kindergarten": "K", "kg": "K", "k": "K"}
+
+
+@dataclass(frozen=True)
+class Resource:
+    """One catalog entry."""
+
+    id: str
+    title: str
+    subject: str
+    resource_type: str
+    grade_bands: Tuple[str, ...]
+    tags: Tuple[str, ...] = ()
+    url: str = ""
+    minutes: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        entry = {
+            "id": self.id,
+            "title": self.title,
+            "subject": self.subject,
+            "resource_type": self.resource_type,
+            "grade_bands": list(self.grade_bands),
+            "tags": list(self.tags),
+        }
+        if self.url:
+            entry["url"] = self.url
+        if self.minutes:
+            entry["minutes"] = self.minutes
+        return entry
+
+
+def normalize_grade(grade: str) -> str:
+    """Normalize report card grades ("01", "1st", "Kindergarten") to "K", "1".."12"."""
+    text = str(grade).strip().lower()
+    if text in _GRADE_WORDS:
+        return _GRADE_WORDS[text]
+    digits = "".join(ch for ch in text if ch.isdigit())
+    return str(int(digits)) if digits else text.upper()
+
+
+@dataclass
+class CatalogIndex:
+    """Immutable lookup tables built from one version of the catalog file."""
+
+    resources: Dict[str, Resource] = field(default_factory=dict)
+    by_title: Dict[str, Resource] = field(default_factory=dict)
+    by_key: Dict[Tuple[str, str, str], Tuple[Resource, ...]] = field(default_factory=dict)
+    by_tag: Dict[str, Tuple[Resource, ...]] = field(default_factory=dict)
+    band_of_grade: Dict[str, str] = field(default_factory=dict)
+    band_notes: Dict[str, str] = field(default_factory=dict)
+    subject_of_alias: Dict[str, str] = field(default_factory=dict)
+    resource_types: Tuple[str, ...] = ()
+
+    @classmethod
+    def from_data(cls, data: Dict[str, Any]) -> "CatalogIndex":
+        index = cls()
+        for band, details in data.get("grade_bands", {}).items():
+            index.band_notes[band] = details.get("notes", "")
+            for grade in details.get("grades", []):
+                index.band_of_grade[normalize_grade(grade)] = band
+        for subject, aliases in data.get("subject_aliases", {}).items():
+            index.subject_of_alias[subject.lower()] = subject
+            for alias in aliases:
+                index.subject_of_alias[alias.lower()] = subject
+
+        default_minutes = data.get("default_minutes", {})
+        by_key: Dict[Tuple[str, str, str], List[Resource]] = {}
+        by_tag: Dict[str, List[Resource]] = {}
+        types = []
+        for entry in data.get("resources", []):
+            resource = Resource(
+                id=entry["id"],
+                title=entry["title"],
+                subject=entry["subject"].lower(),
+                resource_type=entry["resource_type"],
+                grade_bands=tuple(entry.get("grade_bands") or index.band_notes),
+                tags=tuple(tag.lower() for tag in entry.get("tags", [])),
+                url=entry.get("url", ""),
+                minutes=int(entry.get("minutes") or default_minutes.get(entry["resource_type"], 0)),
+            )
+            if resource.id in index.resources:
+                raise ValueError(f"Duplicate resource id in catalog: {resource.id}")
+            index.resources[resource.id] = resource
+            index.by_title.setdefault(resource.title.lower(), resource)
+            index.subject_of_alias.setdefault(resource.subject, resource.subject)
+            if resource.resource_type not in types:
+                types.append(resource.resource_type)
+            for band in resource.grade_bands:
+                by_key.setdefault((resource.subject, band, resource.resource_type), []).append(resource)
+            for tag in resource.tags:
+                by_tag.setdefault(tag, []).append(resource)
+
+        index.by_key = {key: tuple(entries) for key, entries in by_key.items()}
+        index.by_tag = {tag: tuple(entries) for tag, entries in by_tag.items()}
+        index.resource_types = tuple(types)
+        return index
+
+
+class ResourceCatalog:
+    """Indexed resource catalog, reloaded when the data file changes."""
+
+    def __init__(self, path: str = DEFAULT_CATALOG_PATH):
+        self.path = path
+        self._index: Optional[CatalogIndex] = None
+        self._mtime: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def index(self) -> CatalogIndex:
+        mtime = os.path.getmtime(self.path) if os.path.exists(self.path) else None
+        if self._index is not None and mtime == self._mtime:
+            return self._index
+        with self._lock:
+            if self._index is None or mtime != self._mtime:
+                if mtime is None:
+                    self._index = CatalogIndex()
+                else:
+                    with open(self.path, encoding="utf-8") as file:
+                        self._index = CatalogIndex.from_data(json.load(file))
+                self._mtime = mtime
+            return self._index
+
+    def grade_band(self, grade_level: str) -> str:
+        """Return the grade band ("elementary", "middle", ...) for a grade, or ""."""
+        return self.index.band_of_grade.get(normalize_grade(grade_level), "")
+
+    def band_notes(self, band: str) -> str:
+        return self.index.band_notes.get(band, "")
+
+    def canonical_subject(self, subject: str) -> str:
+        """Map everyday subject names ("literacy", "ELA") to catalog subjects."""
+        key = subject.strip().lower()
+        return self.index.subject_of_alias.get(key, key)
+
+    def find(self, subject: str, grade_level: str, resource_type: str) -> Tuple[Resource, ...]:
+        """
+        Look up resources for a subject, grade and resource type.
+
+        Args:
+            subject: Subject name or alias
+            grade_level: Grade as written on the report card ("01", "K", "7")
+            resource_type: Resource type (e.g., "practice_worksheets")
+
+        Returns:
+            Matching resources in catalog order (empty if none)
+        """
+        index = self.index
+        subject = self.canonical_subject(subject)
+        resource_type = resource_type.strip().lower()
+        band = self.grade_band(grade_level)
+        if band:
+            return index.by_key.get((subject, band, resource_type), ())
+        # Unrecognized grade: resources of every band, without duplicates
+        merged = {}
+        for band in index.band_notes:
+            for resource in index.by_key.get((subject, band, resource_type), ()):
+                merged.setdefault(resource.id, resource)
+        return tuple(merged.values())
+
+    def with_tag(self, tag: str, subject: str = "", grade_level: str = "") -> Tuple[Resource, ...]:
+        """Resources carrying a tag, optionally narrowed to a subject and grade."""
+        resources = self.index.by_tag.get(tag.strip().lower(), ())
+        if subject:
+            canonical = self.canonical_subject(subject)
+            resources = tuple(r for r in resources if r.subject == canonical)
+        if grade_level:
+            band = self.grade_band(grade_level)
+            resources = tuple(r for r in resources if band in r.grade_bands)
+        return resources
+
+    def get(self, resource_id: str) -> Optional[Resource]:
+        return self.index.resources.get(resource_id)
+
+    def by_title(self, title: str) -> Optional[Resource]:
+        """Look up a resource by its title (case-insensitive)."""
+        return self.index.by_title.get(title.strip().lower())
+
+    def resource_types(self) -> Tuple[str, ...]:
+        return self.index.resource_types
+
+    def __len__(self) -> int:
+        return len(self.index.resources)
+
+
+_default_catalog: Optional[ResourceCatalog] = None
+
+
+def get_resource_catalog() -> ResourceCatalog:
+    """Return the process-wide catalog at DEFAULT_CATALOG_PATH."""
+    global _default_catalog
+    if _default_catalog is None:
+        _default_catalog = ResourceCatalog()
+    return _default_catalog
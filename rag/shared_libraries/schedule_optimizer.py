@@ -0,0 +1,239 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Study schedule optimization under weekly time budgets.
+
+Each study item has an estimated duration and a priority (derived from how
+weak the student is in its subject). Scheduling is a multiple-knapsack
+problem: pick the items and the week for each so that the total priority
+scheduled is as high as possible without exceeding any week's minutes.
+
+The solver is a greedy heuristic: items are taken in order of priority per
+minute and placed first-fit into the earliest week with room, then weeks are
+reordered so the highest-priority work comes first. Quality is reported
+against the fractional-knapsack upper bound, so a schedule can be judged
+without an exact solver. Many students are scheduled in batch across a
+process pool.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+DEFAULT_WEEKLY_MINUTES = 90
+DEFAULT_ITEM_MINUTES = 20
+
+Budget = Union[int, Sequence[int]]
+
+
+@dataclass(frozen=True)
+class StudyItem:
+    """A resource or activity to schedule."""
+
+    id: str
+    title: str
+    minutes: int
+    priority: float
+    subject: str = ""
+    resource_type: str = ""
+
+
+@dataclass
+class Schedule:
+    """An optimized multi-week schedule and its quality metrics."""
+
+    weeks: List[List[StudyItem]]
+    budgets: List[int]
+    unscheduled: List[Tuple[StudyItem, str]] = field(default_factory=list)
+    solve_ms: float = 0.0
+
+    def minutes_used(self, week: int) -> int:
+        return sum(item.minutes for item in self.weeks[week])
+
+    @property
+    def scheduled_priority(self) -> float:
+        return sum(item.priority for week in self.weeks for item in week)
+
+    @property
+    def utilization(self) -> float:
+        capacity = sum(self.budgets)
+        used = sum(self.minutes_used(week) for week in range(len(self.weeks)))
+        return used / capacity if capacity else 0.0
+
+    def metrics(self, items: Sequence[StudyItem]) -> Dict[str, Any]:
+        """Quality metrics relative to the fractional-knapsack upper bound."""
+        bound = priority_upper_bound(items, self.budgets)
+        scheduled = self.scheduled_priority
+        return {
+            "items": len(items),
+            "scheduled": sum(len(week) for week in self.weeks),
+            "unscheduled": len(self.unscheduled),
+            "scheduled_priority": round(scheduled, 3),
+            "priority_bound": round(bound, 3),
+            "quality": round(scheduled / bound, 4) if bound else 1.0,
+            "utilization": round(self.utilization, 4),
+            "solve_ms": round(self.solve_ms, 3),
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "weeks": [
+                {
+                    "week": number + 1,
+                    "minutes_budget": self.budgets[number],
+                    "minutes_used": self.minutes_used(number),
+                    "items": [item.__dict__ for item in week],
+                }
+                for number, week in enumerate(self.weeks)
+            ],
+            "unscheduled": [{"item": item.__dict__, "reason": reason} for item, reason in self.unscheduled],
+        }
+
+
+def _budgets(weeks: int, weekly_minutes: Budget) -> List[int]:
+    if isinstance(weekly_minutes, int):
+        return [weekly_minutes] * weeks
+    budgets = [int(minutes) for minutes in weekly_minutes]
+    if len(budgets) != weeks:
+        raise ValueError(f"Expected {weeks} weekly budgets, got {len(budgets)}")
+    return budgets
+
+
+def _density_order(items: Sequence[StudyItem]) -> List[StudyItem]:
+    # Priority per minute first; ties go to higher priority, then shorter items
+    return sorted(items, key=lambda item: (-item.priority / max(item.minutes, 1), -item.priority, item.minutes))
+
+
+def priority_upper_bound(items: Sequence[StudyItem], budgets: Sequence[int]) -> float:
+    """
+    Fractional-knapsack bound on the priority any schedule can reach.
+
+    Pools every week's minutes and allows a fraction of one item, so no
+    feasible schedule can beat it; items longer than the largest week are
+    excluded because they never fit.
+    """
+    capacity = sum(budgets)
+    largest = max(budgets, default=0)
+    bound = 0.0
+    for item in _density_order(items):
+        if item.minutes > largest:
+            continue
+        if item.minutes <= capacity:
+            bound += item.priority
+            capacity -= item.minutes
+        else:
+            bound += item.priority * capacity / item.minutes
+            break
+    return bound
+
+
+def optimize_schedule(items: Sequence[StudyItem], weeks: int, weekly_minutes: Budget = DEFAULT_WEEKLY_MINUTES) -> Schedule:
+    """
+    Pack study items into weeks under per-week minute budgets.
+
+    Args:
+        items: Items with durations and priorities
+        weeks: Number of weeks to schedule
+        weekly_minutes: Minutes available each week, or one budget per week
+
+    Returns:
+        The schedule, with items that did not fit and why
+    """
+    started = time.perf_counter()
+    budgets = _budgets(weeks, weekly_minutes)
+    remaining = list(budgets)
+    assigned: List[List[StudyItem]] = [[] for _ in budgets]
+    unscheduled: List[Tuple[StudyItem, str]] = []
+    largest = max(budgets, default=0)
+    # Earliest week with room for any item; skips weeks that are full
+    first_open = 0
+
+    for item in _density_order(items):
+        if item.minutes > largest:
+            unscheduled.append((item, "longer than any week's budget"))
+            continue
+        for week in range(first_open, len(remaining)):
+            if remaining[week] >= item.minutes:
+                remaining[week] -= item.minutes
+                assigned[week].append(item)
+                break
+        else:
+            unscheduled.append((item, "weekly budgets are full"))
+        while first_open < len(remaining) and remaining[first_open] == 0:
+            first_open += 1
+
+    # Weeks are interchangeable when budgets are equal: put the most
+    # important week first, and order each week by priority
+    if len(set(budgets)) <= 1:
+        assigned.sort(key=lambda week: -sum(item.priority for item in week))
+    for week in assigned:
+        week.sort(key=lambda item: (-item.priority, item.subject))
+
+    return Schedule(
+        weeks=assigned,
+        budgets=budgets,
+        unscheduled=unscheduled,
+        solve_ms=(time.perf_counter() - started) * 1000,
+    )
+
+
+def _solve(problem: Tuple[Any, Sequence[StudyItem], int, Budget]) -> Tuple[Any, Schedule]:
+    key, items, weeks, weekly_minutes = problem
+    return key, optimize_schedule(items, weeks, weekly_minutes)
+
+
+def optimize_schedules(
+    problems: Iterable[Tuple[Any, Sequence[StudyItem]]],
+    weeks: int,
+    weekly_minutes: Budget = DEFAULT_WEEKLY_MINUTES,
+    max_workers: Optional[int] = None,
+    chunksize: int = 64,
+) -> Iterator[Tuple[Any, Schedule]]:
+    """
+    Schedule many students, in parallel across a process pool.
+
+    Args:
+        problems: (key, items) pairs, e.g. one per student
+        weeks: Number of weeks to schedule
+        weekly_minutes: Minutes available each week, or one budget per week
+        max_workers: Process pool size; 1 solves in-process
+        chunksize: Problems sent to a worker at a time
+
+    Yields:
+        (key, schedule) pairs in input order
+    """
+    tasks = ((key, items, weeks, weekly_minutes) for key, items in problems)
+    if max_workers == 1:
+        yield from map(_solve, tasks)
+        return
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        yield from executor.map(_solve, tasks, chunksize=chunksize)
+
+
+def subject_severity(rating_trends: Optional[Dict[str, Any]]) -> Dict[str, float]:
+    """
+    Priority weight per subject from an analyze_rating_trends summary.
+
+    Lower latest ratings and more low, declining or stuck standards raise the
+    weight; subjects without ratings are absent (callers default them to 1).
+    """
+    severity = {}
+    for subject, stats in ((rating_trends or {}).get("subjects") or {}).items():
+        rated = stats.get("standards_rated") or 0
+        if not rated:
+            continue
+        concerns = stats.get("low_latest", 0) + stats.get("declining", 0) + stats.get("stuck_low", 0)
+        severity[subject.lower()] = round(1.0 + (3.0 - stats.get("mean_latest", 3.0)) + concerns / rated, 3)
+    return severity
@@ -0,0 +1,128 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Per-section caching for documents assembled from independent sections.
+
+A document is a sequence of sections, each identified by a key derived
+from its inputs (e.g., an analysis record's content digest). A section is
+rendered only the first time its key is seen; after that its fragment comes
+from the cache. The assembled document is cached under a digest of its
+section keys, so formatting an unchanged report again costs one lookup per
+section and no string building.
+"""
+
+from collections import OrderedDict
+import hashlib
+import json
+import threading
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+# A section: (cache key, function rendering its Markdown)
+Section = Tuple[str, Callable[[], str]]
+
+
+def section_key(kind: str, *inputs: Any) -> str:
+    """Cache key for a section of the given kind rendered from ``inputs``."""
+    payload = json.dumps([kind, *inputs], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:24]
+
+
+class _LRU:
+    """Small thread-safe LRU mapping of key to string."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._items: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            value = self._items.get(key)
+            if value is not None:
+                self._items.move_to_end(key)
+            return value
+
+    def put(self, key: str, value: str) -> None:
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_entries:
+                self._items.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class SectionCache:
+    """Rendered section fragments and assembled documents, keyed by content."""
+
+    def __init__(self, max_sections: int = 512, max_documents: int = 32):
+        self._sections = _LRU(max_sections)
+        self._documents = _LRU(max_documents)
+        self.hits = 0
+        self.misses = 0
+
+    def fragment(self, key: str, render: Callable[[], str]) -> str:
+        """Return the cached fragment for ``key``, rendering it on a miss."""
+        fragment = self._sections.get(key)
+        if fragment is None:
+            self.misses += 1
+            fragment = render()
+            self._sections.put(key, fragment)
+        else:
+            self.hits += 1
+        return fragment
+
+    def assemble(self, sections: Iterable[Section], separator: str = "\n") -> Tuple[str, str]:
+        """
+        Build a document from its sections, re-rendering only unseen ones.
+
+        Args:
+            sections: (key, render) pairs in document order; sections that
+                render to an empty string are left out
+            separator: Text placed between sections
+
+        Returns:
+            The document and its digest (derived from the section keys)
+        """
+        sections = list(sections)
+        digest = section_key("document", separator, [key for key, _ in sections])
+        document = self._documents.get(digest)
+        if document is not None:
+            self.hits += len(sections)
+            return document, digest
+
+        fragments = [self.fragment(key, render) for key, render in sections]
+        document = separator.join(fragment for fragment in fragments if fragment)
+        self._documents.put(digest, document)
+        return document, digest
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "sections": len(self._sections),
+            "documents": len(self._documents),
+        }
+
+
+_default_cache: Optional[SectionCache] = None
+
+
+def get_section_cache() -> SectionCache:
+    """Return the process-wide section cache."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = SectionCache()
+    return _default_cache
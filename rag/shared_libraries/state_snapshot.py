@@ -0,0 +1,426 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Binary snapshot and restore of session state.
+
+A snapshot is a small fixed header followed by a zstd-compressed msgpack
+payload. Full snapshots carry the whole state; incremental snapshots carry
+only the paths that changed since their parent, so a session can be handed
+to another worker or recovered after a crash by replaying a short chain.
+
+Usage:
+    python -m rag.shared_libraries.state_snapshot inspect snapshots/*.snap
+    python -m rag.shared_libraries.state_snapshot restore snapshots/ --output state.json
+"""
+
+import argparse
+import copy
+import glob
+import hashlib
+import json
+import os
+import struct
+import sys
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+import msgpack
+import zstandard
+
+from google.adk.sessions.state import State
+
+MAGIC = b"RGSS"
+FORMAT_VERSION = 1
+KIND_FULL = 0
+KIND_DELTA = 1
+KIND_NAMES = {KIND_FULL: "full", KIND_DELTA: "delta"}
+
+# magic, format version, kind, sequence number, uncompressed payload size
+_HEADER = struct.Struct(">4sBBQI")
+
+SNAPSHOT_SUFFIX = ".snap"
+DEFAULT_COMPRESSION_LEVEL = 3
+
+
+class SnapshotError(ValueError):
+    """Raised when a snapshot blob or snapshot chain is invalid."""
+
+
+@dataclass
+class Snapshot:
+    """A decoded session state snapshot."""
+
+    kind: int
+    sequence: int
+    created_at: str
+    parent: Optional[str]
+    digest: str
+    compressed_size: int
+    raw_size: int
+    state: Dict[str, Any] = field(default_factory=dict)
+    sets: List[List[Any]] = field(default_factory=list)
+    unsets: List[List[Any]] = field(default_factory=list)
+
+    @property
+    def kind_name(self) -> str:
+        return KIND_NAMES.get(self.kind, "unknown")
+
+
+def _encode_default(value: Any) -> Any:
+    """Fallback encoder for values msgpack does not handle natively."""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    if hasattr(value, "to_dict"):
+        return value.to_dict()
+    return str(value)
+
+
+def _state_dict(state: State | dict[str, Any]) -> Dict[str, Any]:
+    """Return a plain dict view of an ADK State or mapping."""
+    if hasattr(state, "to_dict"):
+        return state.to_dict()
+    return dict(state)
+
+
+def snapshot_digest(blob: bytes) -> str:
+    """Return the short content digest used to link snapshots in a chain."""
+    return hashlib.sha256(blob).hexdigest()[:16]
+
+
+def _diff(old: Dict[str, Any], new: Dict[str, Any], path: List[Any], sets: List, unsets: List):
+    """Collect the paths that turn ``old`` into ``new``, recursing into dicts."""
+    for key, value in new.items():
+        if key not in old:
+            sets.append([path + [key], value])
+            continue
+        previous = old[key]
+        if isinstance(previous, dict) and isinstance(value, dict):
+            _diff(previous, value, path + [key], sets, unsets)
+        elif previous != value:
+            sets.append([path + [key], value])
+
+    for key in old:
+        if key not in new:
+            unsets.append(path + [key])
+
+
+def _pack(kind: int, sequence: int, payload: Dict[str, Any], level: int) -> bytes:
+    raw = msgpack.packb(payload, default=_encode_default, use_bin_type=True)
+    compressed = zstandard.ZstdCompressor(level=level).compress(raw)
+    return _HEADER.pack(MAGIC, FORMAT_VERSION, kind, sequence, len(raw)) + compressed
+
+
+def snapshot_state(
+    state: State | dict[str, Any],
+    base: Optional[Dict[str, Any]] = None,
+    sequence: int = 0,
+    parent: Optional[str] = None,
+    level: int = DEFAULT_COMPRESSION_LEVEL,
+) -> bytes:
+    """
+    Encode session state as a binary snapshot.
+
+    Args:
+        state: The session state (ADK State or plain dict) to capture
+        base: State captured by the parent snapshot; when given an incremental
+            snapshot holding only the changes since ``base`` is produced
+        sequence: Position of this snapshot in its chain
+        parent: Digest of the parent snapshot blob (required with ``base``)
+        level: zstd compression level
+
+    Returns:
+        The encoded snapshot bytes
+    """
+    current = _state_dict(state)
+    created_at = str(datetime.now())
+
+    if base is None:
+        payload = {"created_at": created_at, "parent": None, "state": current}
+        return _pack(KIND_FULL, sequence, payload, level)
+
+    if parent is None:
+        raise SnapshotError("Incremental snapshots need the parent snapshot digest")
+
+    sets, unsets = [], []
+    _diff(base, current, [], sets, unsets)
+    payload = {"created_at": created_at, "parent": parent, "set": sets, "unset": unsets}
+    return _pack(KIND_DELTA, sequence, payload, level)
+
+
+def load_snapshot(blob: bytes) -> Snapshot:
+    """
+    Decode a snapshot blob.
+
+    Args:
+        blob: Bytes produced by snapshot_state
+
+    Returns:
+        The decoded Snapshot
+    """
+    if len(blob) < _HEADER.size:
+        raise SnapshotError("Snapshot is truncated")
+
+    magic, version, kind, sequence, raw_size = _HEADER.unpack_from(blob)
+    if magic != MAGIC:
+        raise SnapshotError("Not a session state snapshot")
+    if version != FORMAT_VERSION:
+        raise SnapshotError(f"Unsupported snapshot format version {version}")
+
+    raw = zstandard.ZstdDecompressor().decompress(blob[_HEADER.size:], max_output_size=raw_size)
+    payload = msgpack.unpackb(raw, raw=False, strict_map_key=False)
+
+    return Snapshot(
+        kind=kind,
+        sequence=sequence,
+        created_at=payload.get("created_at", ""),
+        parent=payload.get("parent"),
+        digest=snapshot_digest(blob),
+        compressed_size=len(blob),
+        raw_size=raw_size,
+        state=payload.get("state", {}),
+        sets=payload.get("set", []),
+        unsets=payload.get("unset", []),
+    )
+
+
+def apply_snapshot(state: Dict[str, Any], snapshot: Snapshot) -> Dict[str, Any]:
+    """
+    Apply a decoded snapshot on top of a plain state dict.
+
+    Args:
+        state: State rebuilt from the snapshot's ancestors (mutated in place)
+        snapshot: The snapshot to apply
+
+    Returns:
+        The updated state dict
+    """
+    if snapshot.kind == KIND_FULL:
+        state.clear()
+        state.update(snapshot.state)
+        return state
+
+    for path, value in snapshot.sets:
+        node = state
+        for key in path[:-1]:
+            node = node.setdefault(key, {})
+        node[path[-1]] = value
+
+    for path in snapshot.unsets:
+        node = state
+        for key in path[:-1]:
+            node = node.get(key)
+            if not isinstance(node, dict):
+                break
+        else:
+            node.pop(path[-1], None)
+
+    return state
+
+
+def restore_state(blobs: Iterable[bytes], target: State | dict[str, Any] | None = None) -> Dict[str, Any]:
+    """
+    Rebuild session state from a snapshot chain.
+
+    Args:
+        blobs: Snapshot blobs in chain order, starting with a full snapshot
+        target: Optional session state to populate with the restored values
+
+    Returns:
+        The restored state as a plain dict
+    """
+    state: Dict[str, Any] = {}
+    previous: Optional[Snapshot] = None
+
+    for blob in blobs:
+        snapshot = load_snapshot(blob)
+        if previous is None and snapshot.kind != KIND_FULL:
+            raise SnapshotError("Snapshot chain must start with a full snapshot")
+        if snapshot.kind == KIND_DELTA and snapshot.parent != previous.digest:
+            raise SnapshotError(
+                f"Snapshot {snapshot.sequence} does not follow snapshot {previous.sequence}"
+            )
+        apply_snapshot(state, snapshot)
+        previous = snapshot
+
+    if previous is None:
+        raise SnapshotError("No snapshots to restore")
+
+    if target is not None:
+        for key, value in state.items():
+            target[key] = value
+
+    return state
+
+
+class SessionSnapshotter:
+    """
+    Writes a chain of snapshots for one session into a directory.
+
+    Every ``full_every``-th capture is a full snapshot; the ones in between
+    only store what changed since the previous capture.
+    """
+
+    def __init__(self, directory: str, full_every: int = 10, level: int = DEFAULT_COMPRESSION_LEVEL):
+        self.directory = directory
+        self.full_every = max(1, full_every)
+        self.level = level
+        self._sequence = 0
+        self._last_state: Optional[Dict[str, Any]] = None
+        self._last_digest: Optional[str] = None
+        os.makedirs(directory, exist_ok=True)
+
+        existing = list_snapshots(directory)
+        if existing:
+            # Continue an existing chain instead of overwriting it
+            self._last_state = restore_state(_read_chain(existing))
+            with open(existing[-1], "rb") as file:
+                last = file.read()
+            self._sequence = load_snapshot(last).sequence + 1
+            self._last_digest = snapshot_digest(last)
+
+    def capture(self, state: State | dict[str, Any]) -> str:
+        """
+        Capture the state and write the snapshot to disk.
+
+        Args:
+            state: The session state to capture
+
+        Returns:
+            Path of the written snapshot file
+        """
+        current = copy.deepcopy(_state_dict(state))
+        if self._last_state is None or self._sequence % self.full_every == 0:
+            blob = snapshot_state(current, sequence=self._sequence, level=self.level)
+        else:
+            blob = snapshot_state(
+                current,
+                base=self._last_state,
+                sequence=self._sequence,
+                parent=self._last_digest,
+                level=self.level,
+            )
+
+        path = os.path.join(self.directory, f"{self._sequence:08d}{SNAPSHOT_SUFFIX}")
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as file:
+            file.write(blob)
+        os.replace(tmp_path, path)
+
+        self._last_state = current
+        self._last_digest = snapshot_digest(blob)
+        self._sequence += 1
+        return path
+
+    def restore(self, target: State | dict[str, Any] | None = None) -> Dict[str, Any]:
+        """
+        Restore the latest captured state from disk.
+
+        Args:
+            target: Optional session state to populate with the restored values
+
+        Returns:
+            The restored state as a plain dict
+        """
+        return restore_state(_read_chain(list_snapshots(self.directory)), target)
+
+
+def list_snapshots(directory: str) -> List[str]:
+    """List snapshot files in a directory in sequence order."""
+    return sorted(glob.glob(os.path.join(directory, f"*{SNAPSHOT_SUFFIX}")))
+
+
+def _read_chain(paths: List[str]) -> List[bytes]:
+    """Read the snapshots needed to restore the last one: latest full onward."""
+    blobs = []
+    for path in reversed(paths):
+        with open(path, "rb") as file:
+            blob = file.read()
+        blobs.append(blob)
+        if _HEADER.unpack_from(blob)[2] == KIND_FULL:
+            break
+    return list(reversed(blobs))
+
+
+def _expand_paths(paths: List[str]) -> List[str]:
+    expanded = []
+    for path in paths:
+        expanded.extend(list_snapshots(path) if os.path.isdir(path) else [path])
+    return expanded
+
+
+def _inspect(paths: List[str]):
+    for path in _expand_paths(paths):
+        with open(path, "rb") as file:
+            snapshot = load_snapshot(file.read())
+
+        ratio = snapshot.raw_size / snapshot.compressed_size if snapshot.compressed_size else 0
+        print(f"{path}")
+        print(f"  kind: {snapshot.kind_name}  sequence: {snapshot.sequence}  digest: {snapshot.digest}")
+        print(f"  parent: {snapshot.parent or '-'}  created: {snapshot.created_at}")
+        print(f"  size: {snapshot.compressed_size:,} bytes ({snapshot.raw_size:,} raw, {ratio:.1f}x)")
+
+        if snapshot.kind == KIND_FULL:
+            for key, value in snapshot.state.items():
+                size = len(msgpack.packb(value, default=_encode_default, use_bin_type=True))
+                print(f"    {key}: {size:,} bytes")
+        else:
+            for path_keys, value in snapshot.sets:
+                print(f"    set {'.'.join(map(str, path_keys))}")
+            for path_keys in snapshot.unsets:
+                print(f"    unset {'.'.join(map(str, path_keys))}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Inspect and restore session state snapshots")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    inspect_parser = subparsers.add_parser("inspect", help="Show snapshot headers and contents")
+    inspect_parser.add_argument("paths", nargs="+", help="Snapshot files or snapshot directories")
+
+    restore_parser = subparsers.add_parser("restore", help="Replay a snapshot chain as JSON")
+    restore_parser.add_argument("paths", nargs="+", help="Snapshot files in chain order, or a snapshot directory")
+    restore_parser.add_argument("--output", help="Write the restored state to this file instead of stdout")
+
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == "inspect":
+            _inspect(args.paths)
+        else:
+            paths = _expand_paths(args.paths)
+            if len(args.paths) == 1 and os.path.isdir(args.paths[0]):
+                blobs = _read_chain(paths)
+            else:
+                blobs = []
+                for path in paths:
+                    with open(path, "rb") as file:
+                        blobs.append(file.read())
+            restored = json.dumps(restore_state(blobs), indent=2, default=_encode_default)
+            if args.output:
+                with open(args.output, "w", encoding="utf-8") as file:
+                    file.write(restored)
+            else:
+                print(restored)
+    except (OSError, SnapshotError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
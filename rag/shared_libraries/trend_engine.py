@@ -0,0 +1,229 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Vectorized quarter-over-quarter trends for standards ratings.
+
+A student's standards become a ``standards x quarters`` float matrix with
+NaN for quarters awaiting assessment. Every metric (latest/previous rating,
+deltas, least-squares slope, trailing run of low ratings, subject
+aggregates) is computed over the whole matrix with NumPy; the only Python
+loops are over the four quarter columns and the handful of subjects.
+
+Proficiency ratings share the scale so they can be compared: P counts as 2
+(in progress) and S as 3 (met expectations).
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List
+
+import numpy as np
+
+from rag.shared_libraries.report_card_parser import QUARTERS, RATING_LABELS, StandardsTable
+
+# Numeric value of each rating code in RATING_LABELS ("", "1", "2", "3", "P", "S")
+CODE_VALUES = np.array([np.nan, 1.0, 2.0, 3.0, 2.0, 3.0])
+
+LOW_RATING = 2.0
+STUCK_QUARTERS = 2
+
+
+@dataclass
+class RatingMatrix:
+    """Ratings for one student as a standards x quarters matrix."""
+
+    values: np.ndarray
+    codes: np.ndarray
+    subject_index: np.ndarray
+    subjects: List[str]
+    texts: List[str]
+
+    @classmethod
+    def from_table(cls, table: StandardsTable) -> "RatingMatrix":
+        codes = np.frombuffer(table.ratings, dtype=np.uint8).reshape(-1, len(QUARTERS))
+        return cls(
+            values=CODE_VALUES[codes],
+            codes=codes,
+            subject_index=np.frombuffer(table.subject_index, dtype=np.uint8).astype(np.intp),
+            subjects=list(table.subjects),
+            texts=list(table.texts),
+        )
+
+
+@dataclass
+class Trends:
+    """Per-standard trend metrics, one entry per row of the matrix."""
+
+    rated: np.ndarray        # number of rated quarters
+    latest: np.ndarray       # most recent rating (NaN if never rated)
+    latest_quarter: np.ndarray
+    previous: np.ndarray     # rating before the most recent one
+    delta: np.ndarray        # latest - previous
+    deltas: np.ndarray       # quarter-over-quarter differences (NaN across gaps)
+    slope: np.ndarray        # least-squares rating change per quarter
+    low_streak: np.ndarray   # consecutive rated quarters <= LOW_RATING ending at the latest
+
+
+def compute_trends(values: np.ndarray) -> Trends:
+    """
+    Compute trend metrics for every standard at once.
+
+    Args:
+        values: Float matrix (standards x quarters), NaN for unrated quarters
+
+    Returns:
+        Per-standard metrics as arrays aligned with the matrix rows
+    """
+    rows, quarters = values.shape
+    mask = ~np.isnan(values)
+    rated = mask.sum(axis=1)
+    row_ids = np.arange(rows)
+
+    # Latest rated quarter: first True scanning from the right
+    has_rating = rated > 0
+    latest_quarter = np.where(has_rating, quarters - 1 - np.argmax(mask[:, ::-1], axis=1), -1)
+    latest = np.full(rows, np.nan)
+    latest[has_rating] = values[row_ids[has_rating], latest_quarter[has_rating]]
+
+    # Previous rating: latest rated quarter strictly before latest_quarter
+    before = mask & (np.arange(quarters) < latest_quarter[:, None])
+    has_previous = before.any(axis=1)
+    previous_quarter = quarters - 1 - np.argmax(before[:, ::-1], axis=1)
+    previous = np.full(rows, np.nan)
+    previous[has_previous] = values[row_ids[has_previous], previous_quarter[has_previous]]
+
+    # Least-squares slope over the rated quarters only
+    x = np.where(mask, np.arange(quarters, dtype=float), 0.0)
+    y = np.where(mask, values, 0.0)
+    n = rated.astype(float)
+    sx, sy = x.sum(axis=1), y.sum(axis=1)
+    sxx, sxy = (x * x).sum(axis=1), (x * y).sum(axis=1)
+    denominator = n * sxx - sx * sx
+    with np.errstate(invalid="ignore", divide="ignore"):
+        slope = np.where((rated >= 2) & (denominator != 0), (n * sxy - sx * sy) / denominator, np.nan)
+
+    # Trailing run of low ratings, skipping unrated quarters after the latest one
+    low_streak = np.zeros(rows, dtype=np.intp)
+    running = np.ones(rows, dtype=bool)
+    for quarter in range(quarters - 1, -1, -1):
+        column_rated = mask[:, quarter]
+        low = column_rated & (values[:, quarter] <= LOW_RATING)
+        low_streak += running & low
+        running &= low | ~column_rated
+
+    return Trends(
+        rated=rated,
+        latest=latest,
+        latest_quarter=latest_quarter,
+        previous=previous,
+        delta=latest - previous,
+        deltas=np.diff(values, axis=1),
+        slope=slope,
+        low_streak=low_streak,
+    )
+
+
+def _standard_entry(matrix: RatingMatrix, trends: Trends, row: int) -> Dict[str, Any]:
+    ratings = [RATING_LABELS[code] for code in matrix.codes[row]]
+    latest_quarter = int(trends.latest_quarter[row])
+    entry = {
+        "subject": matrix.subjects[matrix.subject_index[row]],
+        "standard": matrix.texts[row],
+        "ratings": {quarter: label for quarter, label in zip(QUARTERS, ratings) if label},
+        "latest": ratings[latest_quarter] if latest_quarter >= 0 else "",
+    }
+    if not np.isnan(trends.delta[row]):
+        entry["delta"] = float(trends.delta[row])
+    if not np.isnan(trends.slope[row]):
+        entry["slope"] = round(float(trends.slope[row]), 2)
+    if trends.low_streak[row]:
+        entry["low_quarters"] = int(trends.low_streak[row])
+    return entry
+
+
+def summarize_trends(table: StandardsTable, max_items: int = 15) -> Dict[str, Any]:
+    """
+    Build a compact trend summary for one student's standards.
+
+    Args:
+        table: The student's parsed standards and ratings
+        max_items: Maximum standards listed per category
+
+    Returns:
+        Subject aggregates plus the declining, stuck-low and improving standards
+    """
+    if not len(table):
+        return {"subjects": {}, "declining": [], "stuck_low": [], "improving": [], "standards_rated": 0}
+
+    matrix = RatingMatrix.from_table(table)
+    trends = compute_trends(matrix.values)
+    subject_count = len(matrix.subjects)
+    by_subject = matrix.subject_index
+    rated = trends.rated > 0
+
+    def per_subject(weights: np.ndarray) -> np.ndarray:
+        return np.bincount(by_subject, weights=weights, minlength=subject_count)
+
+    rated_count = per_subject(rated.astype(float))
+    latest_sum = per_subject(np.where(rated, trends.latest, 0.0))
+    # A drop at the latest quarter, or an overall downward fit (3, 2, 2)
+    declining = rated & ((trends.delta < 0) | (trends.slope < 0))
+    improving = rated & (trends.delta > 0)
+    stuck = trends.low_streak >= STUCK_QUARTERS
+    low_latest = rated & (trends.latest <= LOW_RATING)
+    declining_count = per_subject(declining.astype(float))
+    stuck_count = per_subject(stuck.astype(float))
+    low_latest_count = per_subject(low_latest.astype(float))
+    has_slope = ~np.isnan(trends.slope)
+    slope_sum = per_subject(np.where(has_slope, trends.slope, 0.0))
+    slope_count = per_subject(has_slope.astype(float))
+
+    # Mean rating per subject and quarter, over the standards rated that quarter
+    quarter_mask = ~np.isnan(matrix.values)
+    quarter_means = {}
+    for quarter, name in enumerate(QUARTERS):
+        counts = per_subject(quarter_mask[:, quarter].astype(float))
+        sums = per_subject(np.where(quarter_mask[:, quarter], matrix.values[:, quarter], 0.0))
+        quarter_means[name] = (counts, sums)
+
+    subjects = {}
+    for index, subject in enumerate(matrix.subjects):
+        if not rated_count[index]:
+            continue
+        subjects[subject] = {
+            "standards_rated": int(rated_count[index]),
+            "mean_latest": round(float(latest_sum[index] / rated_count[index]), 2),
+            "mean_by_quarter": {
+                name: round(float(sums[index] / counts[index]), 2)
+                for name, (counts, sums) in quarter_means.items()
+                if counts[index]
+            },
+            "mean_slope": round(float(slope_sum[index] / slope_count[index]), 2) if slope_count[index] else None,
+            "low_latest": int(low_latest_count[index]),
+            "declining": int(declining_count[index]),
+            "stuck_low": int(stuck_count[index]),
+        }
+
+    def top(selected: np.ndarray, key: np.ndarray) -> List[Dict[str, Any]]:
+        rows = np.flatnonzero(selected)
+        rows = rows[np.argsort(key[rows], kind="stable")][:max_items]
+        return [_standard_entry(matrix, trends, int(row)) for row in rows]
+
+    return {
+        "standards_rated": int(rated.sum()),
+        "subjects": subjects,
+        # Steepest drops first; longest low runs first; biggest gains first
+        "declining": top(declining, np.fmin(trends.delta, trends.slope)),
+        "stuck_low": top(stuck, -trends.low_streak),
+        "improving": top(improving, -trends.delta),
+    }
@@ -0,0 +1,215 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Single-pass multi-marker validation engine for report card text.
+
+The document is read once, in bounded chunks. Each chunk is lowercased once
+and every marker that has not been seen yet is searched in it with a C-level
+substring scan; markers drop out of the search as soon as they are found and
+the scan stops early once all of them have been. Sources can be str,
+bytes-like buffers or text/binary streams, so large extracted PDFs never need
+a full-document lowercase copy, let alone one per marker.
+
+Python's ``re`` alternation (with or without IGNORECASE) benchmarked slower
+than this on multi-megabyte text, which is why markers are not compiled into
+a single regex.
+"""
+
+from dataclasses import dataclass
+import io
+from typing import Any, Dict, Iterable, List, Sequence, Set, Tuple, Union
+
+TextSource = Union[str, bytes, bytearray, memoryview, io.IOBase]
+
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+# Required elements for Williamson County Schools report cards
+REQUIRED_ELEMENTS = [
+    ("Student Name:", "student identification"),
+    ("Grade:", "grade level"),
+    ("School:", "school identification"),
+    ("Teacher:", "teacher information"),
+]
+
+# Academic subject indicators
+ACADEMIC_SUBJECTS = [
+    "Reading", "Mathematics", "Science", "Social Studies",
+    "Language Arts", "Writing", "Math", "ELA"
+]
+
+
+@dataclass(frozen=True)
+class Marker:
+    """A literal marker to look for, matched case-insensitively."""
+
+    text: str
+    category: str
+    description: str = ""
+
+
+class MarkerSet:
+    """A set of markers scanned together in a single pass over the source."""
+
+    def __init__(self, markers: Sequence[Marker]):
+        self.markers = list(markers)
+        self.max_length = max((len(marker.text) for marker in self.markers), default=0)
+        self._str_needles = [marker.text.lower() for marker in self.markers]
+        self._bytes_needles = [needle.encode("utf-8") for needle in self._str_needles]
+
+        # Finding a marker implies finding every marker it contains
+        # ("Mathematics" implies "Math"), so those never need their own scan.
+        self._implied: List[Set[int]] = [
+            {other for other, inner in enumerate(self._str_needles) if inner in needle}
+            for needle in self._str_needles
+        ]
+        # Longest markers first so contained markers are usually implied
+        self._scan_order = sorted(range(len(self.markers)), key=lambda i: -len(self._str_needles[i]))
+
+    def _scan_buffer(self, buffer: Union[str, bytes, bytearray, memoryview], found: Set[int]) -> bool:
+        """Scan one buffer; returns True once every marker has been found."""
+        if isinstance(buffer, memoryview):
+            buffer = buffer.tobytes()
+        lowered = buffer.lower()
+        needles = self._str_needles if isinstance(buffer, str) else self._bytes_needles
+
+        for index in self._scan_order:
+            if index not in found and needles[index] in lowered:
+                found.update(self._implied[index])
+        return len(found) == len(self.markers)
+
+    def scan(self, source: TextSource) -> Set[int]:
+        """
+        Find which markers occur in the source.
+
+        Args:
+            source: Text, a bytes-like buffer, or a text/binary stream
+
+        Returns:
+            Indices (into ``markers``) of the markers that were found
+        """
+        found: Set[int] = set()
+        if not self.markers:
+            return found
+
+        if not hasattr(source, "read"):
+            # Scan large in-memory sources in chunks too, so the lowercase
+            # copy stays bounded.
+            view = memoryview(source) if isinstance(source, (bytes, bytearray)) else source
+            source = _SliceReader(view)
+
+        # Keep a tail between chunks so markers spanning a boundary are seen
+        overlap = self.max_length - 1
+        tail = None
+        while True:
+            chunk = source.read(STREAM_CHUNK_SIZE)
+            if not chunk:
+                break
+            if isinstance(chunk, memoryview):
+                chunk = chunk.tobytes()
+            buffer = chunk if tail is None else tail + chunk
+            if self._scan_buffer(buffer, found):
+                break
+            tail = buffer[-overlap:] if overlap > 0 else buffer[:0]
+        return found
+
+
+class _SliceReader:
+    """Minimal read() over an in-memory str or memoryview without copying it."""
+
+    def __init__(self, data: Union[str, memoryview]):
+        self._data = data
+        self._position = 0
+
+    def read(self, size: int):
+        chunk = self._data[self._position:self._position + size]
+        self._position += size
+        return chunk
+
+
+class ReportCardValidator:
+    """Validates that text looks like a Williamson County Schools report card."""
+
+    def __init__(
+        self,
+        required_elements: Sequence[Tuple[str, str]] = REQUIRED_ELEMENTS,
+        academic_subjects: Sequence[str] = ACADEMIC_SUBJECTS,
+        expected_subjects: int = 3,
+        threshold: float = 0.7,
+    ):
+        self.required_elements = list(required_elements)
+        self.expected_subjects = expected_subjects
+        self.threshold = threshold
+        self.marker_set = MarkerSet(
+            [Marker(text, "element", description) for text, description in required_elements]
+            + [Marker(subject, "subject") for subject in academic_subjects]
+        )
+
+    def validate(self, source: TextSource) -> Dict[str, Any]:
+        """
+        Validate one report card.
+
+        Args:
+            source: Report card text, bytes-like buffer, or stream
+
+        Returns:
+            Validation results with status and details
+        """
+        found = self.marker_set.scan(source)
+        validation_results = {
+            "is_valid": False,
+            "confidence": 0.0,
+            "issues": [],
+            "strengths": []
+        }
+
+        found_elements = 0
+        found_subjects = 0
+        for index, marker in enumerate(self.marker_set.markers):
+            if marker.category == "element":
+                if index in found:
+                    found_elements += 1
+                    validation_results["strengths"].append(f"Found {marker.description}")
+                else:
+                    validation_results["issues"].append(f"Missing {marker.description}")
+            elif index in found:
+                found_subjects += 1
+
+        if found_subjects > 0:
+            validation_results["strengths"].append(f"Found {found_subjects} academic subjects")
+        else:
+            validation_results["issues"].append("No recognizable academic subjects found")
+
+        element_confidence = found_elements / len(self.required_elements) if self.required_elements else 1.0
+        subject_confidence = min(found_subjects / self.expected_subjects, 1.0)
+        validation_results["confidence"] = (element_confidence + subject_confidence) / 2
+        validation_results["is_valid"] = validation_results["confidence"] >= self.threshold
+
+        return validation_results
+
+    def validate_many(self, sources: Iterable[TextSource]) -> List[Dict[str, Any]]:
+        """Validate many report cards, reusing this validator's marker set (needles and scan order)."""
+        return [self.validate(source) for source in sources]
+
+
+DEFAULT_VALIDATOR = ReportCardValidator()
+
+
+def validate_text(source: TextSource) -> Dict[str, Any]:
+    """Validate one report card with the default Williamson County markers."""
+    return DEFAULT_VALIDATOR.validate(source)
+
+
+def validate_batch(sources: Iterable[TextSource]) -> List[Dict[str, Any]]:
+    """Validate many report cards with the default Williamson County markers."""
+    return DEFAULT_VALIDATOR.validate_many(sources)
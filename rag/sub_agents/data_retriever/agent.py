@@ -16,7 +16,8 @@
 
 from google.adk.agents import Agent
 from rag.sub_agents.data_retriever.prompt import DATA_RETRIEVER_INSTR
-from rag.sub_agents.data_retriever.tools import extract_student_info, store_analysis_results
+from rag.sub_agents.data_retriever.tools import extract_student_info, lookup_student_records, store_analysis_results
+from rag.tools.cohort import query_cohort_ratings
 from rag.tools.rag_retrieval import rag_retrieval_grounding
 
 data_retriever_agent = Agent(
@@ -24,7 +25,7 @@ data_retriever_agent = Agent(
     name="data_retriever_agent",
     description="Retrieves specific, factual data points from student report cards",
     instruction=DATA_RETRIEVER_INSTR,
-    tools=[rag_retrieval_grounding, extract_student_info, store_analysis_results],
+    tools=[lookup_student_records, query_cohort_ratings, rag_retrieval_grounding, extract_student_info, store_analysis_results],
     disallow_transfer_to_parent=True,
     disallow_transfer_to_peers=True,
 ) 
\ No newline at end of file
@@ -22,6 +22,14 @@ Report Card Format (First Grade):
 - Proficiency Key: S (Satisfactory), P (In Progress)
 - Subjects: Literacy, Math, Science, Social Studies, Personal/Social Growth
 
-Use the rag_retrieval_grounding tool to find requested information.
+For factual rating questions (a student's rating for a subject, quarter or standard), call
+lookup_student_records first; it answers from the local records index in milliseconds.
+For class-, grade- or school-level questions (e.g., "which standards are most first graders
+rated 1 on in Q2"), call query_cohort_ratings instead of looking up students one by one.
+Only when lookup_student_records returns "not_indexed", or for free-text questions (teacher comments, explanations),
+use the rag_retrieval_grounding tool to find requested information.
+Pass the retrieved report card text to extract_student_info once; it returns the parsed
+student details, per-subject rating counts by quarter, and the standards that need support.
+Work from those structured records instead of re-reading the raw text.
 Present data clearly and cite your source (e.g., "Source: Benjamin's Q2 Math").
 """ 
\ No newline at end of file
@@ -14,9 +14,11 @@
 
 """Data retriever specific tools."""
 
+from .records_lookup import lookup_student_records
 from .student_data import extract_student_info, store_analysis_results
 
 __all__ = [
     "extract_student_info",
+    "lookup_student_records",
     "store_analysis_results",
 ] 
\ No newline at end of file
@@ -0,0 +1,77 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Structured lookups against the local student records index."""
+
+from typing import Any, Dict
+
+from google.adk.tools import ToolContext
+
+from rag.shared_libraries.records_index import get_records_index
+
+MAX_LOOKUP_ROWS = 60
+
+
+def lookup_student_records(
+    student: str,
+    subject: str,
+    quarter: str,
+    standard: str,
+    tool_context: ToolContext,
+) -> Dict[str, Any]:
+    """
+    Look up indexed report card ratings without searching the corpus.
+
+    Use this for factual questions about ratings (e.g., "What was Benjamin's
+    Q2 math rating?"). Pass an empty string for any filter you do not need.
+
+    Args:
+        student: Student's full name or the start of it (e.g., "Benjamin"); an
+            error lists the students when the name fits more than one
+        subject: Subject such as "math", "literacy", "science", "social studies", "art"
+        quarter: Quarter such as "Q2" or "2"
+        standard: Words from the standard's description (e.g., "subtraction")
+        tool_context: The ADK tool context for state management
+
+    Returns:
+        Matching ratings plus per-subject rating counts; status "not_indexed"
+        when nothing matches, in which case fall back to rag_retrieval_grounding
+    """
+    index = get_records_index()
+    try:
+        rows = index.lookup(student, subject, quarter, standard, limit=MAX_LOOKUP_ROWS + 1)
+        summary = index.rating_summary(student, subject, quarter)
+    except ValueError as e:
+        return {"status": "error", "message": str(e)}
+
+    if not rows:
+        return {
+            "status": "not_indexed",
+            "message": "No indexed ratings match; use rag_retrieval_grounding instead",
+        }
+
+    tool_context.state["last_records_lookup"] = {
+        "student": student,
+        "subject": subject,
+        "quarter": quarter,
+        "standard": standard,
+    }
+
+    return {
+        "status": "success",
+        "ratings": rows[:MAX_LOOKUP_ROWS],
+        "truncated": len(rows) > MAX_LOOKUP_ROWS,
+        "summary": summary,
+        "source": "Student records index (parsed report cards)",
+    }
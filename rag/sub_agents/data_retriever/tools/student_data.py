@@ -15,53 +15,77 @@
 """Student data extraction and storage tools for data retriever."""
 
 from datetime import datetime
+import hashlib
 from typing import Dict, Any
 
 from google.adk.tools import ToolContext
 
+from rag.shared_libraries.analysis_store import ANALYSIS_RESULTS_KEY, put_analysis
+from rag.shared_libraries.report_card_parser import RATING_MEANINGS, ReportCard, parse_report_card
 
-def extract_student_info(report_data: str, tool_context: ToolContext) -> Dict[str, str]:
+REPORT_CARD_KEY = "report_card"
+REPORT_CARD_DIGEST_KEY = "report_card_digest"
+
+
+def extract_student_info(report_data: str, tool_context: ToolContext) -> Dict[str, Any]:
     """
-    Extract and store key student information from report card data.
+    Parse report card data into structured records and store them in session state.
+    
+    The report card is parsed once per document: calling this again with the
+    same text reuses the stored records.
     
     Args:
         report_data: Raw report card text or key information
         tool_context: The ADK tool context for state management
         
     Returns:
-        Status message with extracted information summary
+        Status message with extracted information summary. ``parse_confidence``
+        is "low" when the text (typically plain, non-layout text) did not show
+        where some standards or comments belong; ``parse_warnings`` says which,
+        and those standards are listed under a combined subject name.
     """
-    # Store the original report data
-    tool_context.state["original_report_data"] = report_data
-    tool_context.state["analysis_timestamp"] = str(datetime.now())
+    digest = hashlib.sha256(report_data.encode("utf-8")).hexdigest()[:16]
     
-    # Initialize structured storage for analysis
-    if "student_profile" not in tool_context.state:
-        tool_context.state["student_profile"] = {
-            "name": "",
-            "grade": "",
-            "school": "",
-            "subjects": [],
-            "strengths": [],
-            "weaknesses": [],
-            "recommendations": []
-        }
+    if tool_context.state.get(REPORT_CARD_DIGEST_KEY) == digest and REPORT_CARD_KEY in tool_context.state:
+        card = ReportCard.from_dict(tool_context.state[REPORT_CARD_KEY])
+    else:
+        card = parse_report_card(report_data)
+        
+        # Store the original report data and the parsed records
+        tool_context.state["original_report_data"] = report_data
+        tool_context.state["analysis_timestamp"] = str(datetime.now())
+        tool_context.state[REPORT_CARD_KEY] = card.to_dict()
+        tool_context.state[REPORT_CARD_DIGEST_KEY] = digest
+        
+        # Keep the structured profile used by the other agents in sync
+        profile = dict(tool_context.state.get("student_profile", {}))
+        profile.setdefault("strengths", [])
+        profile.setdefault("weaknesses", [])
+        profile.setdefault("recommendations", [])
+        profile["name"] = card.student_name or profile.get("name", "")
+        profile["grade"] = card.grade or profile.get("grade", "")
+        profile["school"] = card.school or profile.get("school", "")
+        profile["teacher"] = card.teacher or profile.get("teacher", "")
+        profile["subjects"] = card.standards.subjects or profile.get("subjects", [])
+        tool_context.state["student_profile"] = profile
     
-    # Basic extraction of key info (this could be enhanced with NLP)
-    lines = report_data.split('\n')
-    for line in lines:
-        line = line.strip().lower()
-        if 'student:' in line or 'name:' in line:
-            tool_context.state["student_profile"]["name"] = line.split(':')[-1].strip()
-        elif 'grade:' in line and 'grade level' not in line:
-            tool_context.state["student_profile"]["grade"] = line.split(':')[-1].strip()
-        elif 'school:' in line:
-            tool_context.state["student_profile"]["school"] = line.split(':')[-1].strip()
+    status = "Extracted student information and stored in session state"
+    if not card.confident:
+        status += "; some sections could not be told apart, see parse_warnings"
     
     return {
-        "status": f"Extracted student information and stored in session state",
-        "timestamp": tool_context.state["analysis_timestamp"],
-        "student_name": tool_context.state["student_profile"]["name"]
+        "status": status,
+        "parse_confidence": "high" if card.confident else "low",
+        "parse_warnings": card.warnings,
+        "timestamp": tool_context.state.get("analysis_timestamp", ""),
+        "student_name": card.student_name,
+        "grade": card.grade,
+        "school": card.school,
+        "teacher": card.teacher,
+        "standards_count": len(card.standards),
+        "subjects": card.subject_summary(),
+        "needs_support": card.below_standard(),
+        "rating_key": RATING_MEANINGS,
     }
 
 
@@ -77,15 +101,10 @@ def store_analysis_results(analysis_type: str, results: str, tool_context: ToolC
     Returns:
         Status message confirming storage
     """
-    if "analysis_results" not in tool_context.state:
-        tool_context.state["analysis_results"] = {}
-    
-    tool_context.state["analysis_results"][analysis_type] = {
-        "content": results,
-        "timestamp": str(datetime.now())
-    }
+    record = put_analysis(tool_context.state, analysis_type, content=results, source="store_analysis_results")
     
     return {
         "status": f"Stored {analysis_type} results in session state",
-        "analysis_count": len(tool_context.state["analysis_results"])
+        "analysis_count": len(tool_context.state[ANALYSIS_RESULTS_KEY]),
+        "version": record.version
     } 
\ No newline at end of file
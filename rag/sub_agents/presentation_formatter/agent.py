@@ -28,7 +28,9 @@ from rag.sub_agents.presentation_formatter.tools import (
     validate_report_card,
     ensure_data_consistency,
     get_validation_summary,
-    export_to_pdf
+    export_to_pdf,
+    get_pdf_export_status,
+    export_report_as
 )
 
 presentation_formatter_agent = Agent(
@@ -47,7 +49,9 @@ presentation_formatter_agent = Agent(
         validate_report_card,
         ensure_data_consistency,
         get_validation_summary,
-        export_to_pdf
+        export_to_pdf,
+        get_pdf_export_status,
+        export_report_as
     ],
     output_key="formatted_report",
     disallow_transfer_to_parent=True,
@@ -16,11 +16,24 @@
 
 from datetime import datetime
 from typing import Dict, Any
-import os
-import tempfile
 
 from google.adk.tools import ToolContext
 
+from rag.shared_libraries.analysis_store import ANALYSIS_RESULTS_KEY, get_analysis
+from rag.shared_libraries.artifact_store import artifact_key
+from rag.shared_libraries.markdown_html import render_markdown_html
+from rag.shared_libraries.pdf_export import PDF_OPTIONS, format_size, get_export_service
+from rag.shared_libraries.report_templates import (
+    FORMATS,
+    TEMPLATE_VERSION,
+    ReportContext,
+    get_format,
+    markdown_sections,
+    render_report,
+    write_report,
+)
+from rag.shared_libraries.section_cache import get_section_cache
+
 
 def export_to_pdf(tool_context: ToolContext, report_title: str = "Educational Analysis Report") -> Dict[str, str]:
     """
@@ -34,15 +47,9 @@ def export_to_pdf(tool_context: ToolContext, report_title: str = "Educational An
         PDF export status and information
     """
     try:
-        # Get the formatted report from session state
-        formatted_report_data = tool_context.state.get("formatted_comprehensive_report", {})
-        
-        if not formatted_report_data:
-            # Try to format the report first
-            report_result = format_comprehensive_report(tool_context, report_title)
-            formatted_report = report_result.get("formatted_report", "")
-        else:
-            formatted_report = formatted_report_data.get("content", "")
+        # Formatting is served from the section cache when nothing changed,
+        # so the exported report always reflects the current analyses
+        formatted_report = format_comprehensive_report(tool_context, report_title).get("formatted_report", "")
         
         if not formatted_report:
             return {
@@ -50,67 +57,44 @@ def export_to_pdf(tool_context: ToolContext, report_title: str = "Educational An
                 "status": "Please generate a report first before exporting to PDF"
             }
         
-        # Create a temporary directory for PDF generation
-        temp_dir = tempfile.mkdtemp()
-        pdf_filename = f"{report_title.replace(' ', '_').lower()}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-        pdf_path = os.path.join(temp_dir, pdf_filename)
-        
-        # Simple HTML to PDF conversion approach
-        html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="UTF-8">
-            <title>{report_title}</title>
-            <style>
-                body {{ font-family: Arial, sans-serif; margin: 40px; line-height: 1.6; }}
-                h1 {{ color: #2c3e50; border-bottom: 2px solid #3498db; padding-bottom: 10px; }}
-                h2 {{ color: #34495e; margin-top: 30px; }}
-                h3 {{ color: #7f8c8d; }}
-                strong {{ color: #2c3e50; }}
-                ul, ol {{ margin-left: 20px; }}
-                .header {{ text-align: center; margin-bottom: 30px; }}
-                .footer {{ text-align: center; margin-top: 30px; font-size: 0.9em; color: #7f8c8d; }}
-            </style>
-        </head>
-        <body>
-            <div class="header">
-                <h1>{report_title}</h1>
-                <p><strong>Generated:</strong> {datetime.now().strftime('%B %d, %Y at %I:%M %p')}</p>
-            </div>
-            <div class="content">
-                {convert_markdown_to_html(formatted_report)}
-            </div>
-            <div class="footer">
-                <hr>
-                <p><em>Generated by Student Educational Analysis System</em></p>
-            </div>
-        </body>
-        </html>
-        """
-        
-        # Write HTML to temp file
-        html_path = os.path.join(temp_dir, "report.html")
-        with open(html_path, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+        # Render in the background; the agent polls get_pdf_export_status().
+        # Identical reports share one stored PDF instead of rendering again.
+        context = ReportContext(title=report_title, generated="", markdown=formatted_report)
+        job = get_export_service().submit(
+            report_title,
+            lambda f: write_report(context, "html", f),
+            cache_key=artifact_key(TEMPLATE_VERSION, PDF_OPTIONS, report_title, formatted_report),
+        )
         
         # Store PDF info in session state
         tool_context.state["pdf_export"] = {
-            "filename": pdf_filename,
-            "path": pdf_path,
-            "html_path": html_path,
-            "status": "ready_for_download",
-            "generated_at": str(datetime.now()),
-            "file_size": "estimated 1-2MB"
+            "job_id": job.job_id,
+            "filename": job.filename,
+            "path": job.pdf_path,
+            "html_path": job.html_path,
+            "status": job.status,
+            "submitted_at": job.submitted_at,
+            "cached": job.cached,
         }
         
+        if job.cached:
+            return {
+                "status": "PDF ready (identical report already exported)",
+                "job_id": job.job_id,
+                "filename": job.filename,
+                "path": job.pdf_path,
+                "file_size": format_size(job.file_size),
+                "content_preview": formatted_report[:200] + "..." if len(formatted_report) > 200 else formatted_report,
+                "pages_estimated": max(1, len(formatted_report) // 3000),
+            }
+        
         return {
-            "status": "PDF ready for download",
-            "filename": pdf_filename,
-            "download_instructions": "The PDF has been prepared. In a real implementation, this would provide a download link or save to your downloads folder.",
+            "status": "PDF export queued",
+            "job_id": job.job_id,
+            "filename": job.filename,
+            "download_instructions": f"Rendering in the background. Check progress with get_pdf_export_status(job_id='{job.job_id}').",
             "content_preview": formatted_report[:200] + "..." if len(formatted_report) > 200 else formatted_report,
             "pages_estimated": max(1, len(formatted_report) // 3000),
-            "html_preview_available": html_path
         }
         
     except Exception as e:
@@ -120,60 +104,86 @@ def export_to_pdf(tool_context: ToolContext, report_title: str = "Educational An
         }
 
 
-def convert_markdown_to_html(markdown_text: str) -> str:
+def get_pdf_export_status(job_id: str, tool_context: ToolContext) -> Dict[str, Any]:
     """
-    Simple markdown to HTML converter for PDF generation.
+    Report the progress of a PDF export started with export_to_pdf.
     
     Args:
-        markdown_text: Markdown formatted text
+        job_id: The job id returned by export_to_pdf (empty for the latest export)
+        tool_context: The ADK tool context for accessing session state
         
     Returns:
-        HTML formatted text
+        Export status, progress percentage, once done the file path and size,
+        and how often exports are served from the PDF artifact store
     """
-    html = markdown_text
+    if not job_id:
+        job_id = tool_context.state.get("pdf_export", {}).get("job_id", "")
     
-    # Convert headers
-    html = html.replace('### ', '<h3>').replace('\n\n', '</h3>\n\n')
-    html = html.replace('## ', '<h2>').replace('\n\n', '</h2>\n\n') 
-    html = html.replace('# ', '<h1>').replace('\n\n', '</h1>\n\n')
-    
-    # Convert bold text
-    import re
-    html = re.sub(r'\*\*(.*?)\*\*', r'<strong>\1</strong>', html)
+    service = get_export_service()
+    job = service.status(job_id) if job_id else None
+    if job is None:
+        return {
+            "error": f"No PDF export found for job '{job_id}'",
+            "status": "Use export_to_pdf() to start an export"
+        }
     
-    # Convert bullet points
-    lines = html.split('\n')
-    in_list = False
-    result_lines = []
+    result = {
+        "job_id": job.job_id,
+        "status": job.status,
+        "progress": f"{job.progress}%",
+        "filename": job.filename,
+    }
+    if job.status == "queued":
+        result["queue_position"] = service.queue_position(job.job_id)
+    elif job.status == "done":
+        result["path"] = job.pdf_path
+        result["file_size"] = format_size(job.file_size)
+        result["file_size_bytes"] = job.file_size
+        result["cached"] = job.cached
+    elif job.status == "failed":
+        result["error"] = job.error
+        result["html_preview_available"] = job.html_path
     
-    for line in lines:
-        if line.strip().startswith('- '):
-            if not in_list:
-                result_lines.append('<ul>')
-                in_list = True
-            result_lines.append(f'<li>{line.strip()[2:]}</li>')
-        else:
-            if in_list:
-                result_lines.append('</ul>')
-                in_list = False
-            result_lines.append(line)
+    stats = service.store.stats()
+    result["artifact_store"] = {
+        "hits": stats["hits"],
+        "misses": stats["misses"],
+        "hit_rate": stats["hit_rate"],
+        "stored_pdfs": stats["entries"],
+        "size_on_disk": format_size(stats["bytes_on_disk"]),
+        "evictions": stats["evictions"],
+    }
     
-    if in_list:
-        result_lines.append('</ul>')
+    # Keep the session's export record in step
+    export = dict(tool_context.state.get("pdf_export", {}))
+    if export.get("job_id") == job.job_id:
+        export.update(status=job.status, file_size=job.file_size, finished_at=job.finished_at, path=job.pdf_path)
+        tool_context.state["pdf_export"] = export
     
-    # Convert line breaks to paragraphs
-    html = '\n'.join(result_lines)
-    html = re.sub(r'\n\n+', '</p><p>', html)
-    html = f'<p>{html}</p>'
-    html = html.replace('<p></p>', '')
+    return result
+
+
+def convert_markdown_to_html(markdown_text: str) -> str:
+    """
+    Markdown to HTML converter for PDF generation.
     
-    return html
+    Args:
+        markdown_text: Markdown formatted text
+        
+    Returns:
+        HTML formatted text
+    """
+    return render_markdown_html(markdown_text)
 
 
 def format_comprehensive_report(tool_context: ToolContext, report_title: str = "Educational Analysis Report") -> Dict[str, str]:
     """
     Format a comprehensive report from all stored session analysis data.
     
+    Each section is cached under a digest of its inputs (analysis sections
+    use the record digest), so only sections whose analyses changed are
+    rendered again, and an unchanged report is returned from the cache.
+    
     Args:
         tool_context: The ADK tool context for accessing session state
         report_title: Title for the comprehensive report
@@ -181,112 +191,61 @@ def format_comprehensive_report(tool_context: ToolContext, report_title: str = "
     Returns:
         Formatted comprehensive report
     """
-    # Get all stored data
-    student_profile = tool_context.state.get("student_profile", {})
-    analysis_results = tool_context.state.get("analysis_results", {})
-    timestamp = tool_context.state.get("analysis_timestamp", str(datetime.now()))
+    context = ReportContext.from_state(tool_context.state, report_title)
+    formatted_report, digest = get_section_cache().assemble(markdown_sections(context))
     
-    # Also check for data stored directly in state (from the logs, we see identified_weaknesses, personalized_plan, etc.)
-    direct_state_data = {
-        "weakness_analysis": tool_context.state.get("identified_weaknesses", ""),
-        "solution_research": tool_context.state.get("research_findings", ""),
-        "study_plan": tool_context.state.get("personalized_plan", ""),
-        "data_retrieval": tool_context.state.get("retrieved_data", "")
-    }
-    
-    # Build comprehensive report
-    report_sections = []
-    
-    # Header
-    report_sections.append(f"# {report_title}")
-    report_sections.append(f"**Generated:** {timestamp}")
-    report_sections.append("")
-    
-    # Student Profile Section
-    if student_profile:
-        report_sections.append("## Student Profile")
-        if student_profile.get("name"):
-            report_sections.append(f"**Student:** {student_profile['name']}")
-        if student_profile.get("grade"):
-            report_sections.append(f"**Grade:** {student_profile['grade']}")
-        if student_profile.get("school"):
-            report_sections.append(f"**School:** {student_profile['school']}")
-        report_sections.append("")
+    # Store the formatted report in session state, only when it changed
+    stored = tool_context.state.get("formatted_comprehensive_report", {})
+    if stored.get("digest") == digest and "word_count" in stored:
+        word_count = stored["word_count"]
+    else:
+        word_count = len(formatted_report.split())
+        tool_context.state["formatted_comprehensive_report"] = {
+            "content": formatted_report,
+            "title": report_title,
+            "generated_at": str(datetime.now()),
+            "digest": digest,
+            "word_count": word_count,
+        }
     
-    # Analysis Results Sections
-    section_order = ["weakness_analysis", "solution_research", "study_plan", "data_retrieval"]
-    section_titles = {
-        "weakness_analysis": "## Identified Weaknesses",
-        "solution_research": "## Research Findings & Solutions", 
-        "study_plan": "## Personalized Study Plan",
-        "data_retrieval": "## Supporting Data"
+    return {
+        "formatted_report": formatted_report,
+        "status": "Comprehensive report formatted and stored in session state",
+        "sections_included": len(context.records),
+        "word_count": word_count
     }
+
+
+def export_report_as(output_format: str, tool_context: ToolContext, report_title: str = "Educational Analysis Report") -> Dict[str, Any]:
+    """
+    Render the comprehensive report in another output format.
     
-    for section_key in section_order:
-        content = ""
-        
-        # Try to get content from structured analysis_results first
-        if section_key in analysis_results:
-            data = analysis_results[section_key]
-            if isinstance(data, dict):
-                content = data.get("content", data.get("result", str(data)))
-            else:
-                content = str(data)
-        
-        # If not found, try direct state data
-        if not content and section_key in direct_state_data:
-            content = direct_state_data[section_key]
-        
-        # If we have content, add it to the report
-        if content:
-            report_sections.append(section_titles.get(section_key, f"## {section_key.title()}"))
-            report_sections.append(str(content))
-            report_sections.append("")
-    
-    # Add any additional analysis results not in the standard order
-    for analysis_type, data in analysis_results.items():
-        if analysis_type not in section_order:
-            report_sections.append(f"## {analysis_type.replace('_', ' ').title()}")
-            if isinstance(data, dict):
-                content = data.get("content", data.get("result", str(data)))
-            else:
-                content = str(data)
-            report_sections.append(content)
-            report_sections.append("")
-    
-    # Summary section
-    if analysis_results or any(direct_state_data.values()):
-        report_sections.append("## Analysis Summary")
-        total_sections = len([k for k in analysis_results.keys()]) + len([k for k, v in direct_state_data.items() if v])
-        report_sections.append(f"This comprehensive report contains {total_sections} analysis components:")
-        
-        for analysis_type in analysis_results.keys():
-            report_sections.append(f"- {analysis_type.replace('_', ' ').title()}")
-        
-        for analysis_type, data in direct_state_data.items():
-            if data and analysis_type not in analysis_results:
-                report_sections.append(f"- {analysis_type.replace('_', ' ').title()}")
+    Args:
+        output_format: One of markdown, html, text or json (compact, for downstream systems)
+        tool_context: The ADK tool context for accessing session state
+        report_title: Title for the report
         
-        report_sections.append("")
-    
-    # Footer
-    report_sections.append("---")
-    report_sections.append("*Report generated by Student Educational Analysis System*")
+    Returns:
+        The rendered report with its format details
+    """
+    try:
+        selected = get_format(output_format)
+    except ValueError as e:
+        return {"error": str(e), "available_formats": sorted(FORMATS)}
     
-    formatted_report = "\n".join(report_sections)
-    
-    # Store the formatted report in session state
-    tool_context.state["formatted_comprehensive_report"] = {
-        "content": formatted_report,
-        "title": report_title,
-        "generated_at": str(datetime.now())
-    }
+    context = ReportContext.from_state(tool_context.state, report_title)
+    if selected.name in ("markdown", "html", "text"):
+        # Reuse the cached Markdown document rather than assembling it again
+        context.markdown, _ = get_section_cache().assemble(markdown_sections(context))
+    content = render_report(context, selected.name)
     
     return {
-        "formatted_report": formatted_report,
-        "status": "Comprehensive report formatted and stored in session state",
-        "sections_included": len(analysis_results),
-        "word_count": len(formatted_report.split())
+        "format": selected.name,
+        "media_type": selected.media_type,
+        "extension": selected.extension,
+        "content": content,
+        "size": format_size(len(content.encode("utf-8"))),
+        "status": f"Report rendered as {selected.name}",
     }
 
 
@@ -301,18 +260,17 @@ def export_report_sections(section_type: str, tool_context: ToolContext) -> Dict
     Returns:
         Specific section content formatted for export
     """
-    analysis_results = tool_context.state.get("analysis_results", {})
+    record = get_analysis(tool_context.state, section_type)
     
-    if section_type not in analysis_results:
+    if record is None:
         return {
             "error": f"Section '{section_type}' not found in analysis results",
-            "available_sections": list(analysis_results.keys())
+            "available_sections": list(tool_context.state.get(ANALYSIS_RESULTS_KEY, {}).keys())
         }
     
-    section_data = analysis_results[section_type]
     formatted_section = f"# {section_type.replace('_', ' ').title()}\n\n"
-    formatted_section += section_data["content"]
-    formatted_section += f"\n\n*Generated: {section_data['timestamp']}*"
+    formatted_section += record.content
+    formatted_section += f"\n\n*Generated: {record.timestamp}*"
     
     return {
         "section_content": formatted_section,
@@ -18,6 +18,7 @@ from google.adk.agents import Agent
 from google.adk.tools import google_search
 
 from rag.sub_agents.solution_researcher.prompt import SOLUTION_RESEARCHER_INSTR
+from rag.shared_libraries.analysis_store import output_key_recorder
 
 solution_researcher_agent = Agent(
     model="gemini-2.0-flash",
@@ -26,6 +27,7 @@ solution_researcher_agent = Agent(
     instruction=SOLUTION_RESEARCHER_INSTR,
     tools=[google_search],
     output_key="research_findings",
+    after_agent_callback=output_key_recorder("research_findings"),
     disallow_transfer_to_parent=True,
     disallow_transfer_to_peers=True,
 ) 
\ No newline at end of file
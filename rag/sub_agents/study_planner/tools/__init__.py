@@ -14,10 +14,16 @@
 
 """Study planner specific tools."""
 
-from .study_resources import find_educational_resources, organize_study_schedule, store_study_plan
+from .study_resources import (
+    find_educational_resources,
+    find_educational_resources_batch,
+    organize_study_schedule,
+    store_study_plan,
+)
 
 __all__ = [
     "find_educational_resources",
+    "find_educational_resources_batch",
     "organize_study_schedule",
     "store_study_plan",
 ] 
\ No newline at end of file
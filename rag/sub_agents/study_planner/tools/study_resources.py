@@ -14,10 +14,51 @@
 
 """Educational resource discovery and organization tools for study planner."""
 
-from datetime import datetime
 from typing import Dict, Any, List
 from google.adk.tools import ToolContext
 
+from rag.shared_libraries.analysis_store import ANALYSIS_RESULTS_KEY, put_analysis
+from rag.shared_libraries.resource_catalog import get_resource_catalog
+from rag.shared_libraries.schedule_optimizer import (
+    DEFAULT_ITEM_MINUTES,
+    DEFAULT_WEEKLY_MINUTES,
+    StudyItem,
+    optimize_schedule,
+    subject_severity,
+)
+
+
+def _lookup_resources(subject: str, grade_level: str, resource_type: str) -> Dict[str, Any]:
+    """Look up one (subject, grade, type) combination in the resource catalog."""
+    # Resources come from the indexed catalog file (rag/data/resource_catalog.json)
+    catalog = get_resource_catalog()
+    matches = catalog.find(subject, grade_level, resource_type)
+    return {
+        "subject": subject,
+        "grade_level": grade_level,
+        "resource_type": resource_type,
+        "resources": [resource.title for resource in matches],
+        "resource_ids": [resource.id for resource in matches],
+        "resource_details": [resource.to_dict() for resource in matches],
+        "grade_notes": catalog.band_notes(catalog.grade_band(grade_level)),
+    }
+
+
+def _store_resources(entries: Dict[str, Dict[str, Any]], tool_context: ToolContext) -> None:
+    """Merge lookups into educational_resources with a single state assignment."""
+    stored = dict(tool_context.state.get("educational_resources", {}))
+    for resource_key, entry in entries.items():
+        stored[resource_key] = {
+            "subject": entry["subject"],
+            "grade_level": entry["grade_level"],
+            "resource_type": entry["resource_type"],
+            "resources": entry["resources"],
+            "resource_ids": entry["resource_ids"],
+            "grade_notes": entry["grade_notes"],
+            "recommended_count": len(entry["resources"])
+        }
+    tool_context.state["educational_resources"] = stored
+
 
 def find_educational_resources(subject: str, grade_level: str, resource_type: str, tool_context: ToolContext) -> Dict[str, Any]:
     """
@@ -32,121 +73,102 @@ def find_educational_resources(subject: str, grade_level: str, resource_type: st
     Returns:
         Organized educational resources with recommendations
     """
-    # Initialize resources storage if not exists
-    if "educational_resources" not in tool_context.state:
-        tool_context.state["educational_resources"] = {}
-    
     resource_key = f"{subject}_{grade_level}_{resource_type}"
-    
-    # Predefined educational resource templates (in a real system, this would query external APIs)
-    resource_templates = {
-        "math": {
-            "practice_worksheets": [
-                "Khan Academy Math Practice Worksheets",
-                "IXL Math Skills Practice",
-                "Math-Drills.com Worksheets",
-                "Education.com Math Practice Sheets"
-            ],
-            "video_tutorials": [
-                "Khan Academy Math Videos",
-                "Professor Leonard Math Tutorials", 
-                "Math Antics Video Series",
-                "Numberphile Educational Videos"
-            ],
-            "interactive_games": [
-                "Prodigy Math Game",
-                "Sumdog Math Games",
-                "Math Playground Interactive Activities",
-                "Cool Math Games Educational Section"
-            ]
-        },
-        "reading": {
-            "practice_worksheets": [
-                "Reading Comprehension Worksheets by grade",
-                "Scholastic Reading Practice Sheets",
-                "K5 Learning Reading Worksheets",
-                "Super Teacher Worksheets Reading"
-            ],
-            "video_tutorials": [
-                "Reading Strategies Video Lessons",
-                "Phonics and Decoding Video Tutorials",
-                "Comprehension Strategy Videos",
-                "Guided Reading Video Sessions"
-            ],
-            "interactive_games": [
-                "Epic! Digital Library Games",
-                "Reading Eggs Interactive Activities",
-                "Starfall Reading Games",
-                "ABCmouse Reading Activities"
-            ]
-        },
-        "science": {
-            "practice_worksheets": [
-                "Science experiment worksheets",
-                "Bill Nye Science Worksheets",
-                "NASA Educational Activity Sheets",
-                "National Geographic Kids Science Worksheets"
-            ],
-            "video_tutorials": [
-                "Crash Course Science Videos",
-                "Bill Nye the Science Guy Episodes",
-                "SciShow Kids Educational Videos",
-                "NASA STEM Video Series"
-            ],
-            "interactive_games": [
-                "BrainPOP Science Games",
-                "NASA Kids Club Interactive Activities",
-                "Science4Us Digital Activities",
-                "Mystery Science Interactive Lessons"
-            ]
-        }
-    }
-    
-    # Get resources for the specified subject and type
-    subject_lower = subject.lower()
-    resources = []
-    
-    if subject_lower in resource_templates and resource_type in resource_templates[subject_lower]:
-        resources = resource_templates[subject_lower][resource_type]
-    
-    # Add grade-specific customization
-    grade_specific_notes = {
-        "elementary": "Focus on foundational skills and visual learning",
-        "middle": "Include analytical thinking and problem-solving approaches",
-        "high": "Emphasize critical thinking and advanced concepts"
-    }
-    
-    grade_category = "elementary" if grade_level in ["K", "1", "2", "3", "4", "5"] else \
-                    "middle" if grade_level in ["6", "7", "8"] else "high"
+    entry = _lookup_resources(subject, grade_level, resource_type)
     
     # Store resources in session state
-    tool_context.state["educational_resources"][resource_key] = {
-        "subject": subject,
-        "grade_level": grade_level,
-        "resource_type": resource_type,
-        "resources": resources,
-        "grade_notes": grade_specific_notes.get(grade_category, ""),
-        "recommended_count": len(resources)
-    }
+    _store_resources({resource_key: entry}, tool_context)
     
+    resources = entry["resources"]
     return {
         "subject": subject,
         "grade_level": grade_level,
         "resource_type": resource_type,
         "found_resources": resources,
-        "grade_specific_guidance": grade_specific_notes.get(grade_category, ""),
+        "resource_details": entry["resource_details"],
+        "grade_specific_guidance": entry["grade_notes"],
         "status": f"Found {len(resources)} {resource_type} resources for {subject} at grade {grade_level}",
         "storage_key": resource_key
     }
 
 
-def organize_study_schedule(resources_list: List[str], study_duration_weeks: int, tool_context: ToolContext) -> Dict[str, Any]:
+def find_educational_resources_batch(subjects: List[str], grade_level: str, resource_types: List[str], tool_context: ToolContext) -> Dict[str, Any]:
+    """
+    Find educational resources for several subjects and resource types in one call.
+    
+    Looks up every subject x resource type combination for the student's grade,
+    so a plan covering several weak subjects needs a single tool call.
+    
+    Args:
+        subjects: Subject areas to cover (e.g., ["math", "reading", "science"])
+        grade_level: Student's grade level
+        resource_types: Types of resource to find (practice_worksheets, video_tutorials, interactive_games, etc.)
+        tool_context: The ADK tool context for state management
+        
+    Returns:
+        Resources grouped by subject and resource type, with grade guidance
+    """
+    entries = {}
+    for subject in dict.fromkeys(subjects):
+        for resource_type in dict.fromkeys(resource_types):
+            entries[f"{subject}_{grade_level}_{resource_type}"] = _lookup_resources(subject, grade_level, resource_type)
+    
+    # One state update for the whole batch
+    _store_resources(entries, tool_context)
+    
+    found = {}
+    for entry in entries.values():
+        found.setdefault(entry["subject"], {})[entry["resource_type"]] = entry["resources"]
+    total = sum(len(entry["resources"]) for entry in entries.values())
+    grade_notes = next((entry["grade_notes"] for entry in entries.values() if entry["grade_notes"]), "")
+    
+    return {
+        "grade_level": grade_level,
+        "found_resources": found,
+        "grade_specific_guidance": grade_notes,
+        "status": f"Found {total} resources across {len(entries)} subject and resource type combinations",
+        "storage_keys": list(entries)
+    }
+
+
+def _study_items(resources_list: List[str], tool_context: ToolContext) -> List[StudyItem]:
+    """Turn resource titles into study items with durations and priorities."""
+    catalog = get_resource_catalog()
+    # Weaker subjects (from analyze_rating_trends) get higher priority
+    severity = {
+        catalog.canonical_subject(subject): weight
+        for subject, weight in subject_severity(tool_context.state.get("rating_trends")).items()
+    }
+    count = len(resources_list)
+    items = []
+    for position, title in enumerate(resources_list):
+        resource = catalog.by_title(title)
+        subject = resource.subject if resource else ""
+        # Resources listed first are the planner's top picks
+        order_weight = 1.0 + 0.5 * (count - position) / count
+        items.append(StudyItem(
+            id=resource.id if resource else f"item-{position + 1}",
+            title=title,
+            minutes=(resource.minutes if resource and resource.minutes else DEFAULT_ITEM_MINUTES),
+            priority=round(severity.get(subject, 1.0) * order_weight, 3),
+            subject=subject,
+            resource_type=resource.resource_type if resource else "",
+        ))
+    return items
+
+
+def organize_study_schedule(resources_list: List[str], study_duration_weeks: int, weekly_minutes: int, tool_context: ToolContext) -> Dict[str, Any]:
     """
     Organize educational resources into a structured study schedule.
     
+    Resources are packed into weeks within the weekly time budget, highest
+    priority first (resources for the student's weakest subjects, then those
+    listed first). Resources that do not fit are reported as unscheduled.
+    
     Args:
-        resources_list: List of educational resources to organize
+        resources_list: List of educational resources to organize, most important first
         study_duration_weeks: Number of weeks for the study schedule
+        weekly_minutes: Study minutes available per week (0 for the default of 90)
         tool_context: The ADK tool context for state management
         
     Returns:
@@ -154,46 +176,42 @@ def organize_study_schedule(resources_list: List[str], study_duration_weeks: int
     """
     if study_duration_weeks < 1:
         study_duration_weeks = 4  # Default to 4 weeks
+    if weekly_minutes < 1:
+        weekly_minutes = DEFAULT_WEEKLY_MINUTES
     
-    # Calculate resources per week
-    resources_per_week = max(1, len(resources_list) // study_duration_weeks)
+    items = _study_items(resources_list, tool_context)
+    schedule = optimize_schedule(items, study_duration_weeks, weekly_minutes)
     
     # Create weekly schedule
     weekly_schedule = {}
-    resource_index = 0
-    
-    for week in range(1, study_duration_weeks + 1):
-        week_resources = []
-        for i in range(resources_per_week):
-            if resource_index < len(resources_list):
-                week_resources.append(resources_list[resource_index])
-                resource_index += 1
-        
-        # Add any remaining resources to the last week
-        if week == study_duration_weeks:
-            while resource_index < len(resources_list):
-                week_resources.append(resources_list[resource_index])
-                resource_index += 1
-        
-        weekly_schedule[f"Week {week}"] = {
-            "resources": week_resources,
-            "focus_areas": f"Complete {len(week_resources)} learning activities",
-            "time_allocation": "15-30 minutes per resource"
+    for week, week_items in enumerate(schedule.weeks):
+        weekly_schedule[f"Week {week + 1}"] = {
+            "resources": [item.title for item in week_items],
+            "focus_areas": f"Complete {len(week_items)} learning activities",
+            "time_allocation": f"{schedule.minutes_used(week)} of {weekly_minutes} minutes",
+            "minutes_per_resource": {item.title: item.minutes for item in week_items}
         }
+    unscheduled = [{"resource": item.title, "reason": reason} for item, reason in schedule.unscheduled]
+    metrics = schedule.metrics(items)
     
     # Store schedule in session state
     tool_context.state["study_schedule"] = {
         "total_weeks": study_duration_weeks,
         "total_resources": len(resources_list),
+        "weekly_minutes": weekly_minutes,
         "weekly_breakdown": weekly_schedule,
+        "unscheduled": unscheduled,
+        "metrics": metrics,
         "created_at": str(dict(tool_context.state).get("analysis_timestamp", ""))
     }
     
     return {
         "study_schedule": weekly_schedule,
         "total_duration": f"{study_duration_weeks} weeks",
-        "resources_organized": len(resources_list),
-        "status": f"Created {study_duration_weeks}-week study schedule with {len(resources_list)} resources"
+        "resources_organized": metrics["scheduled"],
+        "unscheduled": unscheduled,
+        "time_budget_used": f"{metrics['utilization']:.0%}",
+        "status": f"Created {study_duration_weeks}-week study schedule with {metrics['scheduled']} of {len(resources_list)} resources"
     }
 
 
@@ -208,15 +226,10 @@ def store_study_plan(plan_content: str, tool_context: ToolContext) -> Dict[str,
     Returns:
         Status message confirming storage
     """
-    if "analysis_results" not in tool_context.state:
-        tool_context.state["analysis_results"] = {}
-    
-    tool_context.state["analysis_results"]["study_plan"] = {
-        "content": plan_content,
-        "timestamp": str(datetime.now())
-    }
+    record = put_analysis(tool_context.state, "study_plan", content=plan_content, source="store_study_plan")
     
     return {
         "status": "Study plan stored in session state",
-        "analysis_count": len(tool_context.state["analysis_results"])
+        "analysis_count": len(tool_context.state[ANALYSIS_RESULTS_KEY]),
+        "version": record.version
     } 
\ No newline at end of file
@@ -16,15 +16,18 @@
 
 from google.adk.agents import Agent
 from rag.sub_agents.weakness_analyzer.prompt import WEAKNESS_ANALYZER_INSTR
+from rag.sub_agents.weakness_analyzer.tools import analyze_rating_trends
 from rag.tools.rag_retrieval import rag_retrieval_grounding
+from rag.shared_libraries.analysis_store import output_key_recorder
 
 weakness_analyzer_agent = Agent(
     model="gemini-2.0-flash",
     name="weakness_analyzer_agent",
     description="Analyzes report card data to identify academic weaknesses and areas needing improvement",
     instruction=WEAKNESS_ANALYZER_INSTR,
-    tools=[rag_retrieval_grounding],
+    tools=[analyze_rating_trends, rag_retrieval_grounding],
     output_key="identified_weaknesses",
+    after_agent_callback=output_key_recorder("identified_weaknesses"),
     disallow_transfer_to_parent=True,
     disallow_transfer_to_peers=True,
 ) 
\ No newline at end of file
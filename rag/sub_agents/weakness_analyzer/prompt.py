@@ -20,8 +20,12 @@ WEAKNESS_ANALYZER_INSTR = """
 **IMPORTANT: You MUST use the rag_retrieval_grounding tool to get actual student data from the report card corpus.**
 
 Process:
-1. Call rag_retrieval_grounding with the student's name and subject area
-2. Analyze the retrieved data for:
+1. Call analyze_rating_trends with the student's name. It returns precomputed per-subject
+   aggregates and the declining, stuck-low (rated 2 or lower for consecutive quarters) and
+   improving standards. Base severity and trend statements on these numbers.
+   Call rag_retrieval_grounding with the student's name and subject area for teacher comments,
+   context, or when analyze_rating_trends returns "not_found"
+2. Analyze the data for:
    - Skills rated 1 or 2 (below proficiency)
    - Declining performance trends
    - Areas marked as "Developing" or "Needs Improvement"
@@ -0,0 +1,81 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Precomputed standards-rating trends for the weakness analyzer."""
+
+from typing import Any, Dict
+
+from google.adk.tools import ToolContext
+
+from rag.shared_libraries.records_index import get_records_index
+from rag.shared_libraries.report_card_parser import ReportCard
+from rag.shared_libraries.trend_engine import LOW_RATING, STUCK_QUARTERS, summarize_trends
+
+REPORT_CARD_KEY = "report_card"
+
+
+def analyze_rating_trends(student_name: str, tool_context: ToolContext) -> Dict[str, Any]:
+    """
+    Compute quarter-over-quarter trends for a student's standards ratings.
+    
+    Uses the report card parsed in this session when it belongs to the student,
+    otherwise the local student records index.
+    
+    Args:
+        student_name: The student's name (e.g., "Benjamin")
+        tool_context: The ADK tool context for state management
+        
+    Returns:
+        Per-subject aggregates (mean rating by quarter, mean slope, counts of
+        declining and stuck-low standards) and the declining, stuck-low and
+        improving standards with their ratings
+    """
+    table = None
+    source = ""
+    
+    stored = tool_context.state.get(REPORT_CARD_KEY)
+    if stored:
+        card = ReportCard.from_dict(stored)
+        if not student_name or student_name.strip().lower() in card.student_name.lower():
+            table = card.standards
+            source = "Parsed report card in this session"
+    
+    if table is None and student_name:
+        try:
+            table = get_records_index().standards_table(student_name)
+        except ValueError as e:
+            return {"status": "error", "message": str(e)}
+        source = "Student records index"
+    
+    if table is None or not len(table):
+        return {
+            "status": "not_found",
+            "message": f"No parsed ratings for '{student_name}'; use rag_retrieval_grounding instead",
+        }
+    
+    summary = summarize_trends(table)
+    tool_context.state["rating_trends"] = summary
+    
+    return {
+        "status": "success",
+        "student": student_name,
+        "source": source,
+        "definitions": {
+            "delta": "latest rating minus the previous rated quarter",
+            "slope": "least-squares rating change per quarter",
+            "stuck_low": f"rated {LOW_RATING:g} or lower for at least {STUCK_QUARTERS} consecutive rated quarters",
+            "scale": "1-3 standards ratings; P counts as 2 and S as 3",
+        },
+        **summary,
+    }
@@ -14,6 +14,7 @@
 
 """Global tools for the RAG system."""
 
+from .cohort import query_cohort_ratings
 from .memory import memorize_analysis, forget_analysis, load_sample_profile
 from .validation import validate_report_card, ensure_data_consistency
 
@@ -23,4 +24,5 @@ __all__ = [
     "load_sample_profile",
     "validate_report_card",
     "ensure_data_consistency",
+    "query_cohort_ratings",
 ] 
\ No newline at end of file
@@ -0,0 +1,90 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Cohort analytics tools for class- and school-level questions."""
+
+from typing import Dict, Any
+
+from google.adk.tools import ToolContext
+
+from rag.shared_libraries.cohort_store import get_cohort_store
+
+COHORT_QUERIES = ("top_standards", "distribution", "group_by", "percentiles", "overview")
+
+
+def query_cohort_ratings(
+    query_type: str,
+    rating: str,
+    grade: str,
+    subject: str,
+    quarter: str,
+    school: str,
+    tool_context: ToolContext,
+) -> Dict[str, Any]:
+    """
+    Answer class- and school-level questions over every parsed report card.
+
+    Use this instead of analyzing students one by one, e.g. "which standards are
+    most first graders rated 1 on in Q2" is query_type "top_standards" with
+    rating "1", grade "1" and quarter "Q2". Pass an empty string for unused filters.
+
+    Args:
+        query_type: One of "top_standards" (standards with the most students at a rating),
+            "distribution" (share of each rating per subject), "group_by" (rating counts
+            and mean score per subject and quarter), "percentiles" (spread of student
+            mean scores) or "overview" (store size)
+        rating: Rating for top_standards ("1", "2", "3", "P" or "S"); defaults to "1"
+        grade: Grade level (e.g., "1" or "01")
+        subject: Subject such as "math", "literacy", "science"
+        quarter: Quarter such as "Q2"
+        school: School name or part of it
+        tool_context: The ADK tool context
+
+    Returns:
+        Aggregated results for the requested query
+    """
+    store = get_cohort_store()
+    filters = {"grade": grade, "subject": subject, "quarter": quarter, "school": school}
+    
+    try:
+        if query_type == "top_standards":
+            results = store.top_standards(rating or "1", **filters)
+        elif query_type == "distribution":
+            results = store.distribution(["subject"], **filters)
+        elif query_type == "group_by":
+            results = store.group_by(["subject", "quarter"], **filters)
+        elif query_type == "percentiles":
+            results = store.percentiles("student", **filters)
+        elif query_type == "overview":
+            results = store.overview()
+        else:
+            return {
+                "status": "error",
+                "message": f"Unknown query_type '{query_type}'. Use one of: {', '.join(COHORT_QUERIES)}",
+            }
+    except ValueError as e:
+        return {"status": "error", "message": str(e)}
+    
+    if not results:
+        return {
+            "status": "no_data",
+            "message": "No cohort ratings match; the cohort store may not be built yet",
+        }
+    
+    return {
+        "status": "success",
+        "query_type": query_type,
+        "filters": {key: value for key, value in filters.items() if value},
+        "results": results,
+    }
@@ -23,9 +23,14 @@ from google.adk.agents.callback_context import CallbackContext
 from google.adk.sessions.state import State
 from google.adk.tools import ToolContext
 
+from rag.shared_libraries.analysis_store import (
+    ANALYSIS_RESULTS_KEY,
+    put_analysis,
+    remove_analysis,
+)
+
 # Constants for session state keys
 STUDENT_PROFILE_KEY = "student_profile"
-ANALYSIS_RESULTS_KEY = "analysis_results"
 ANALYSIS_TIMESTAMP_KEY = "analysis_timestamp"
 RAG_INITIALIZED_KEY = "rag_initialized"
 SYSTEM_TIME_KEY = "system_time"
@@ -47,16 +52,16 @@ def memorize_analysis(analysis_type: str, analysis_data: Dict[str, Any], tool_co
     Returns:
         A status message
     """
-    if ANALYSIS_RESULTS_KEY not in tool_context.state:
-        tool_context.state[ANALYSIS_RESULTS_KEY] = {}
+    content = analysis_data.get("content") or analysis_data.get("result") or ""
+    data = {k: v for k, v in analysis_data.items() if k not in ("content", "result")}
+    record = put_analysis(
+        tool_context.state, analysis_type, content=content, data=data, source="memorize_analysis"
+    )
     
-    tool_context.state[ANALYSIS_RESULTS_KEY][analysis_type] = {
-        **analysis_data,
-        "timestamp": str(datetime.now()),
-        "type": analysis_type
+    return {
+        "status": f'Stored analysis "{analysis_type}" with {len(analysis_data)} data points',
+        "version": record.version
     }
-    
-    return {"status": f'Stored analysis "{analysis_type}" with {len(analysis_data)} data points'}
 
 
 def forget_analysis(analysis_type: str, tool_context: ToolContext):
@@ -70,8 +75,7 @@ def forget_analysis(analysis_type: str, tool_context: ToolContext):
     Returns:
         A status message
     """
-    if ANALYSIS_RESULTS_KEY in tool_context.state and analysis_type in tool_context.state[ANALYSIS_RESULTS_KEY]:
-        del tool_context.state[ANALYSIS_RESULTS_KEY][analysis_type]
+    if remove_analysis(tool_context.state, analysis_type):
         return {"status": f'Removed analysis "{analysis_type}"'}
     
     return {"status": f'Analysis "{analysis_type}" not found in memory'}
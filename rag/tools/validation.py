@@ -17,6 +17,8 @@
 from typing import Dict, Any, List
 from google.adk.tools import ToolContext
 
+from rag.shared_libraries.validation_engine import validate_text
+
 
 def validate_report_card(report_text: str, tool_context: ToolContext):
     """
@@ -29,54 +31,8 @@ def validate_report_card(report_text: str, tool_context: ToolContext):
     Returns:
         Validation results with status and details
     """
-    validation_results = {
-        "is_valid": False,
-        "confidence": 0.0,
-        "issues": [],
-        "strengths": []
-    }
-    
-    # Required elements for Williamson County Schools report cards
-    required_elements = [
-        ("Student Name:", "student identification"),
-        ("Grade:", "grade level"),
-        ("School:", "school identification"),
-        ("Teacher:", "teacher information"),
-    ]
-    
-    # Academic subject indicators
-    academic_subjects = [
-        "Reading", "Mathematics", "Science", "Social Studies", 
-        "Language Arts", "Writing", "Math", "ELA"
-    ]
-    
-    # Check for required elements
-    found_elements = 0
-    for element, description in required_elements:
-        if element.lower() in report_text.lower():
-            found_elements += 1
-            validation_results["strengths"].append(f"Found {description}")
-        else:
-            validation_results["issues"].append(f"Missing {description}")
-    
-    # Check for academic subjects
-    found_subjects = 0
-    for subject in academic_subjects:
-        if subject.lower() in report_text.lower():
-            found_subjects += 1
-    
-    if found_subjects > 0:
-        validation_results["strengths"].append(f"Found {found_subjects} academic subjects")
-    else:
-        validation_results["issues"].append("No recognizable academic subjects found")
-    
-    # Calculate confidence
-    element_confidence = found_elements / len(required_elements)
-    subject_confidence = min(found_subjects / 3, 1.0)  # Expect at least 3 subjects
-    validation_results["confidence"] = (element_confidence + subject_confidence) / 2
-    
-    # Determine if valid (at least 70% confidence)
-    validation_results["is_valid"] = validation_results["confidence"] >= 0.7
+    # One pass over the text for all markers (no per-marker lowercase copies)
+    validation_results = validate_text(report_text)
     
     # Store validation results in session
     tool_context.state["report_validation"] = validation_results
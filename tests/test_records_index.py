@@ -0,0 +1,61 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pathlib
+import shutil
+
+import pytest
+
+pytest.importorskip("pypdf")
+
+from rag.shared_libraries.grid_extractor import parse_report_card_grid
+from rag.shared_libraries.records_index import StudentRecordsIndex
+
+SAMPLE = pathlib.Path(__file__).parent.parent / "sample/StandardsRptCard369401_2025321.pdf"
+
+
+@pytest.fixture
+def index():
+    index = StudentRecordsIndex(":memory:")
+    yield index
+    index.close()
+
+
+def counts(index):
+    return index.rating_summary("Benjamin"), len(index.lookup("Benjamin", limit=10000))
+
+
+def test_ingesting_a_copy_of_a_card_is_skipped(index, tmp_path):
+    index.ingest_document(str(SAMPLE))
+    before = counts(index)
+    copy = tmp_path / "copy.pdf"
+    shutil.copy(SAMPLE, copy)
+
+    result = index.ingest_document(str(copy))
+
+    assert result["skipped"] and result["duplicate_of"] == str(SAMPLE)
+    assert counts(index) == before
+
+
+def test_ratings_come_from_the_latest_card_only(index):
+    card = parse_report_card_grid(str(SAMPLE), ".pdf")
+    index.ingest(card, "q2.pdf")
+    before = counts(index)
+    assert before[0]["MATH"]["Q1"]
+
+    # A re-issued (cumulative) card of the same student under another source
+    index.ingest(card, "q3.pdf")
+
+    assert counts(index) == before
+    assert index.rating_summary() == before[0]
@@ -0,0 +1,100 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pathlib
+
+import pytest
+
+pytest.importorskip("pypdf")
+
+from rag.shared_libraries.pdf_text import extract_pages
+from rag.shared_libraries.report_card_parser import UNKNOWN_QUARTER, parse_report_card
+
+SAMPLE = pathlib.Path(__file__).parent.parent / "sample/StandardsRptCard369401_2025321.pdf"
+
+SUBJECTS = ["LITERACY", "MATH", "SCIENCE", "SOCIAL STUDIES", "SPECIALTY AREAS", "PERSONAL AND SOCIAL GROWTH"]
+
+EXPECTED_SUBJECTS = {
+    "Read words with ee, a_e": "LITERACY",
+    "Use personal, possessive, and indefinite pronouns": "LITERACY",
+    "Count to 120, starting at any number.": "MATH",
+    "Count backward from 20.": "MATH",
+    "Illustrate and summarize the life cycle of plants": "SCIENCE",
+    "Interpret information from simple timelines": "SOCIAL STUDIES",
+    "Art": "SPECIALTY AREAS",
+    "Self-Control: shows self-control in class": "PERSONAL AND SOCIAL GROWTH",
+}
+
+
+def parse_sample(layout):
+    return parse_report_card("\f".join(extract_pages(str(SAMPLE), ".pdf", layout=layout)))
+
+
+def subjects_by_text(card):
+    table = card.standards
+    found = {}
+    for row in table.rows():
+        found.setdefault(table.texts[row], set()).add(table.subject(row))
+    return found
+
+
+@pytest.fixture(scope="module")
+def layout_card():
+    return parse_sample(layout=True)
+
+
+@pytest.fixture(scope="module")
+def plain_card():
+    return parse_sample(layout=False)
+
+
+def test_layout_assigns_every_subject(layout_card):
+    found = subjects_by_text(layout_card)
+    assert layout_card.standards.subjects == SUBJECTS
+    for text, subject in EXPECTED_SUBJECTS.items():
+        assert found[text] == {subject}, text
+    assert layout_card.comments == {"Q1": "Keep up the great work!"}
+    assert layout_card.confident
+
+
+def test_captions_are_not_standards(layout_card, plain_card):
+    for card in (layout_card, plain_card):
+        assert not any(text.startswith(("Shaded scores", "There is no need")) for text in card.standards.texts)
+
+
+def test_plain_text_never_misfiles_a_standard(layout_card, plain_card):
+    expected = subjects_by_text(layout_card)
+    found = subjects_by_text(plain_card)
+    assert found.keys() == expected.keys()
+    for text, subjects in found.items():
+        for subject in subjects:
+            # Either the right subject or a combined name that includes it
+            assert expected[text] & set(subject.split(" / ")), (text, subject)
+
+
+def test_plain_text_names_unambiguous_tables(plain_card):
+    found = subjects_by_text(plain_card)
+    assert found["Read words with ee, a_e"] == {"LITERACY"}
+    assert found["Count backward from 20."] == {"MATH"}
+    assert len(list(plain_card.standards.rows("LITERACY"))) == 52
+    assert len(list(plain_card.standards.rows("MATH"))) == 27
+
+
+def test_plain_text_reports_what_it_cannot_place(plain_card):
+    found = subjects_by_text(plain_card)
+    assert found["Interpret information from simple timelines"] == {"SCIENCE / SOCIAL STUDIES"}
+    assert found["Art"] == {"SPECIALTY AREAS / PERSONAL AND SOCIAL GROWTH"}
+    assert plain_card.comments == {UNKNOWN_QUARTER: "Keep up the great work!"}
+    assert not plain_card.confident
+    assert len(plain_card.warnings) == 3